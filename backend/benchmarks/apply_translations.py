@@ -0,0 +1,60 @@
+"""
+Benchmark for TranslationService._apply_translations().
+Shows that re-assembling translated fields scales linearly with form size.
+
+Usage (from backend/):
+    python -m benchmarks.apply_translations
+"""
+
+import timeit
+
+from services.translation_service import TranslationService
+
+FORM_SIZES = [10, 100, 1000]
+
+
+def make_form(size: int) -> tuple[list[dict], list[dict]]:
+    """Build a form with `size` fields and a matching translation reply."""
+    fields = [
+        {
+            "id": f"field_{i}",
+            "label": f"Question {i}",
+            "type": "radio",
+            "placeholder": f"Answer {i}",
+            "options": ["Yes", "No"],
+        }
+        for i in range(size)
+    ]
+    translations = [
+        {
+            "index": i,
+            "label": f"Pregunta {i}",
+            "placeholder": f"Respuesta {i}",
+            "options": ["Sí", "No"],
+        }
+        for i in range(size)
+    ]
+    return fields, translations
+
+
+def main():
+    # __new__: the benchmark doesn't need an OpenAI client
+    translator = TranslationService.__new__(TranslationService)
+
+    print(f"{'fields':>8} {'total (ms)':>12} {'per field (us)':>16}")
+    for size in FORM_SIZES:
+        fields, translations = make_form(size)
+        number = max(1, 10_000 // size)
+        seconds = min(
+            timeit.repeat(
+                lambda: translator._apply_translations(fields, translations),
+                number=number,
+                repeat=5,
+            )
+        )
+        per_call = seconds / number
+        print(f"{size:>8} {per_call * 1000:>12.3f} {per_call / size * 1e6:>16.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""
+Benchmark for building JSON response bodies from stored JSON text.
+Compares the generic path (json.loads, then FastAPI's jsonable_encoder and
+JSONResponse) with splicing the stored text into an orjson-encoded envelope.
+
+Usage (from backend/):
+    python -m benchmarks.json_responses
+"""
+
+import json
+import timeit
+from datetime import datetime
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+from services.json_body import RawJSON, json_array, json_object
+
+FORM_SIZES = [10, 100, 1000]
+PAGE_SIZE = 500
+
+
+def make_fields(size: int) -> str:
+    """Stored Form.fields text for a form with `size` fields."""
+    return json.dumps(
+        [
+            {
+                "id": f"field_{i}",
+                "label": f"Question {i}",
+                "type": "radio",
+                "placeholder": f"Answer {i}",
+                "required": i % 2 == 0,
+                "options": ["Yes", "No", "Not sure"],
+            }
+            for i in range(size)
+        ]
+    )
+
+
+def generic_form(form_name: str, stored_fields: str) -> bytes:
+    content = {"id": "form-1", "form_name": form_name, "fields": json.loads(stored_fields)}
+    return JSONResponse(jsonable_encoder(content)).body
+
+
+def raw_form(form_name: str, stored_fields: str) -> bytes:
+    return json_object(
+        {"id": "form-1", "form_name": form_name, "fields": RawJSON(stored_fields)}
+    )
+
+
+def make_page() -> list[dict]:
+    """One page of submissions, as read from the database."""
+    return [
+        {
+            "id": i,
+            "form_id": "form-1",
+            "submission_data": json.dumps({f"field_{j}_{j}": f"Answer {j}" for j in range(20)}),
+            "submitted_at": datetime(2025, 1, 1, 12, 0, i % 60),
+            "language": "en",
+            "translation_status": "complete",
+        }
+        for i in range(PAGE_SIZE)
+    ]
+
+
+def generic_page(rows: list[dict]) -> bytes:
+    content = {
+        "submissions": [
+            {**row, "submission_data": json.loads(row["submission_data"])} for row in rows
+        ],
+        "next_cursor": None,
+    }
+    return JSONResponse(jsonable_encoder(content)).body
+
+
+def raw_page(rows: list[dict]) -> bytes:
+    submissions = json_array(
+        json_object({**row, "submission_data": RawJSON(row["submission_data"])})
+        for row in rows
+    )
+    return json_object({"submissions": submissions, "next_cursor": None})
+
+
+def best_ms(fn, number: int) -> float:
+    return min(timeit.repeat(fn, number=number, repeat=5)) / number * 1000
+
+
+def main():
+    print(f"{'body':>22} {'generic (ms)':>14} {'raw (ms)':>10} {'speedup':>9}")
+    for size in FORM_SIZES:
+        stored_fields = make_fields(size)
+        assert json.loads(raw_form("Intake", stored_fields)) == json.loads(
+            generic_form("Intake", stored_fields)
+        )
+        number = max(1, 10_000 // size)
+        generic = best_ms(lambda: generic_form("Intake", stored_fields), number)
+        raw = best_ms(lambda: raw_form("Intake", stored_fields), number)
+        print(f"{f'form, {size} fields':>22} {generic:>14.3f} {raw:>10.3f} {generic / raw:>8.1f}x")
+
+    rows = make_page()
+    generic = best_ms(lambda: generic_page(rows), 10)
+    raw = best_ms(lambda: raw_page(rows), 10)
+    label = f"submissions, {PAGE_SIZE} rows"
+    print(f"{label:>22} {generic:>14.3f} {raw:>10.3f} {generic / raw:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
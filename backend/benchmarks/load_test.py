@@ -0,0 +1,356 @@
+"""
+Load test for the API with a mixed workload.
+Runs the app in-process (httpx.ASGITransport, so no network in the numbers)
+against a temporary database, with the local stub translator, and reports
+p50/p95/p99 latency and requests/sec per endpoint. On top of the steady mix,
+a check-in burst (many patients submitting at the same moment) is sent at a
+fixed interval and reported as its own endpoint.
+
+Usage (from backend/):
+    python -m benchmarks.load_test                  # run and compare with the baseline
+    python -m benchmarks.load_test --save-baseline  # run and store the new baseline
+
+Comparing exits with status 1 if any endpoint's p95 latency is worse than the
+baseline by more than --max-regression (numbers from different machines
+aren't comparable; record a baseline on the machine that runs the check).
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+import uuid
+from collections import defaultdict
+from pathlib import Path
+
+import httpx
+from sqlalchemy.ext.asyncio import async_sessionmaker
+from sqlmodel import SQLModel
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from database import create_database_engine
+from main import (
+    app,
+    get_session,
+    get_session_factory,
+    get_translator,
+    get_job_workers,
+    get_submission_writer,
+    latest_form_cache,
+    _job_handlers,
+)
+from models import Form, FormSubmission
+from services.job_queue import JobWorkers, BACK_TRANSLATE_SUBMISSION
+from services.submission_writer import SubmissionWriter
+from services.translation_memory import TranslationMemoryStore
+from services.translation_providers import StubTranslationProvider
+from services.translation_service import TranslationService
+from config.constants import (
+    TRANSLATION_JOB_WORKERS,
+    BACK_TRANSLATION_JOB_WORKERS,
+    SQLITE_STORAGE_PROFILE,
+)
+
+BASELINE_PATH = Path(__file__).parent / "baselines" / "load_test.json"
+
+# form size and how many submissions exist before the run
+FORM_FIELDS = 30
+SEED_SUBMISSIONS = 2000
+
+# stub translator latency per model call (seconds)
+STUB_LATENCY_SECONDS = 0.05
+STUB_JITTER_SECONDS = 0.02
+
+# (endpoint name, relative weight) of each kind of request in the mix
+WORKLOAD = [
+    ("GET /api/forms/latest?lang=en", 25),
+    ("GET /api/forms/latest?lang=es", 25),
+    ("GET /api/forms/latest/bundle", 10),
+    ("GET /api/forms/{form_id}", 5),
+    ("POST /api/submissions (en)", 10),
+    ("POST /api/submissions (es)", 10),
+    ("GET /api/submissions", 10),
+    ("POST /api/forms", 1),
+]
+
+# check-in bursts: this many submissions (half of them in Spanish) sent at once,
+# every BURST_INTERVAL_SECONDS, on top of the steady mix above
+BURST_ENDPOINT = "POST /api/submissions (burst)"
+BURST_SUBMISSIONS = 50
+BURST_INTERVAL_SECONDS = 2.0
+
+
+def make_fields(size: int) -> list[dict]:
+    """Fields for a realistic intake form."""
+    fields = []
+    for i in range(size):
+        if i % 3 == 0:
+            fields.append(
+                {"id": f"q{i}", "label": f"Question {i}", "type": "radio", "options": ["Yes", "No"]}
+            )
+        else:
+            fields.append(
+                {"id": f"q{i}", "label": f"Question {i}", "type": "text", "placeholder": f"Answer {i}"}
+            )
+    return fields
+
+
+def make_answers(fields: list[dict], language: str) -> dict:
+    """Submission data the way the patient page sends it (keys are `${field.id}_${index}`)."""
+    return {
+        f"{field['id']}_{index}": "Yes" if field["type"] == "radio" else f"{language} answer {index}"
+        for index, field in enumerate(fields)
+    }
+
+
+class Workload:
+    """Sends the mixed requests and records each one's latency."""
+
+    def __init__(self, client: httpx.AsyncClient, rng: random.Random):
+        self.client = client
+        self.rng = rng
+        self.fields = make_fields(FORM_FIELDS)
+        self.form_id = None
+        self.latencies = defaultdict(list)
+        self.errors = defaultdict(int)
+
+    async def request(self, name: str):
+        if name.startswith("GET /api/forms/latest?lang="):
+            call = self.client.get(f"/api/forms/latest?lang={name[-2:]}")
+        elif name == "GET /api/forms/latest/bundle":
+            call = self.client.get("/api/forms/latest/bundle")
+        elif name == "GET /api/forms/{form_id}":
+            call = self.client.get(f"/api/forms/{self.form_id}")
+        elif name.startswith("POST /api/submissions"):
+            language = "es" if "(es)" in name else "en"
+            if name == BURST_ENDPOINT:
+                language = self.rng.choice(["en", "es"])
+            call = self.client.post(
+                "/api/submissions",
+                json={
+                    "form_id": self.form_id,
+                    "submission_data": make_answers(self.fields, language),
+                    "language": language,
+                },
+            )
+        elif name == "GET /api/submissions":
+            call = self.client.get("/api/submissions")
+        else:
+            call = self.client.post(
+                "/api/forms",
+                json={"form_name": f"Intake {self.rng.random():.6f}", "fields": self.fields},
+            )
+
+        start = time.perf_counter()
+        response = await call
+        self.latencies[name].append(time.perf_counter() - start)
+        if response.status_code >= 400:
+            self.errors[name] += 1
+        elif name == "POST /api/forms":
+            self.form_id = response.json()["form_id"]
+
+    async def user(self, deadline: float):
+        """One virtual user sending weighted random requests back to back."""
+        names = [name for name, _ in WORKLOAD]
+        weights = [weight for _, weight in WORKLOAD]
+        while time.perf_counter() < deadline:
+            await self.request(self.rng.choices(names, weights)[0])
+
+    async def bursts(self, deadline: float):
+        """Check-in waves: BURST_SUBMISSIONS submissions at once, every BURST_INTERVAL_SECONDS."""
+        while time.perf_counter() + BURST_INTERVAL_SECONDS < deadline:
+            await asyncio.sleep(BURST_INTERVAL_SECONDS)
+            await asyncio.gather(
+                *(self.request(BURST_ENDPOINT) for _ in range(BURST_SUBMISSIONS))
+            )
+
+
+async def seed_database(session_factory, fields: list[dict]) -> str:
+    """Create the form patients load and the submissions admins list."""
+    form = Form(id=str(uuid.uuid4()), form_name="Patient Intake", fields=json.dumps(fields))
+    async with session_factory() as session:
+        session.add(form)
+        for i in range(SEED_SUBMISSIONS):
+            session.add(
+                FormSubmission(
+                    form_id=form.id,
+                    submission_data=json.dumps(make_answers(fields, "en")),
+                )
+            )
+        await session.commit()
+    return form.id
+
+
+async def run(duration: float, concurrency: int, seed: int, storage_profile: str) -> dict:
+    """Run the workload against a temporary database and summarize the latencies."""
+    database_path = os.path.join(tempfile.mkdtemp(), "load_test.db")
+    engine = create_database_engine(f"sqlite+aiosqlite:///{database_path}", storage_profile)
+    session_factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    async with engine.begin() as conn:
+        await conn.run_sync(SQLModel.metadata.create_all)
+
+    translator = TranslationService(
+        StubTranslationProvider(STUB_LATENCY_SECONDS, STUB_JITTER_SECONDS, seed=seed),
+        memory=TranslationMemoryStore(session_factory),
+    )
+    workers = JobWorkers(
+        session_factory,
+        _job_handlers(translator, session_factory),
+        TRANSLATION_JOB_WORKERS,
+        kind_workers={BACK_TRANSLATE_SUBMISSION: BACK_TRANSLATION_JOB_WORKERS},
+    )
+    writer = SubmissionWriter(session_factory)
+
+    async def get_load_test_session():
+        async with session_factory() as session:
+            yield session
+
+    app.dependency_overrides.update(
+        {
+            get_session: get_load_test_session,
+            get_session_factory: lambda: session_factory,
+            get_translator: lambda: translator,
+            get_job_workers: lambda: workers,
+            get_submission_writer: lambda: writer,
+        }
+    )
+    latest_form_cache.invalidate()
+    await workers.start()
+
+    try:
+        async with httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=app), base_url="http://load-test"
+        ) as client:
+            workload = Workload(client, random.Random(seed))
+            workload.form_id = await seed_database(session_factory, workload.fields)
+
+            start = time.perf_counter()
+            await asyncio.gather(
+                workload.bursts(start + duration),
+                *(workload.user(start + duration) for _ in range(concurrency)),
+            )
+            elapsed = time.perf_counter() - start
+    finally:
+        await writer.aclose()
+        await workers.stop()
+        app.dependency_overrides.clear()
+        latest_form_cache.invalidate()
+        await engine.dispose()
+
+    return summarize(workload, elapsed, duration, concurrency, seed, storage_profile)
+
+
+def summarize(
+    workload: Workload,
+    elapsed: float,
+    duration: float,
+    concurrency: int,
+    seed: int,
+    storage_profile: str,
+) -> dict:
+    endpoints = {}
+    for name in [name for name, _ in WORKLOAD] + [BURST_ENDPOINT]:
+        latencies = workload.latencies.get(name, [])
+        if len(latencies) < 2:
+            continue
+        percentiles = statistics.quantiles(latencies, n=100, method="inclusive")
+        endpoints[name] = {
+            "requests": len(latencies),
+            "errors": workload.errors.get(name, 0),
+            "requests_per_second": round(len(latencies) / elapsed, 1),
+            "p50_ms": round(percentiles[49] * 1000, 2),
+            "p95_ms": round(percentiles[94] * 1000, 2),
+            "p99_ms": round(percentiles[98] * 1000, 2),
+        }
+    total = sum(len(latencies) for latencies in workload.latencies.values())
+    return {
+        "settings": {
+            "duration_seconds": duration,
+            "concurrency": concurrency,
+            "seed": seed,
+            "form_fields": FORM_FIELDS,
+            "seed_submissions": SEED_SUBMISSIONS,
+            "stub_latency_seconds": STUB_LATENCY_SECONDS,
+            "burst_submissions": BURST_SUBMISSIONS,
+            "burst_interval_seconds": BURST_INTERVAL_SECONDS,
+            "storage_profile": storage_profile,
+        },
+        "total_requests_per_second": round(total / elapsed, 1),
+        "endpoints": endpoints,
+    }
+
+
+def print_report(results: dict, baseline: dict = None):
+    print(
+        f"{'endpoint':<32} {'reqs':>6} {'err':>4} {'req/s':>8} "
+        f"{'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'p95 vs base':>12}"
+    )
+    for name, stats in results["endpoints"].items():
+        change = ""
+        base = (baseline or {}).get("endpoints", {}).get(name)
+        if base:
+            change = f"{(stats['p95_ms'] / base['p95_ms'] - 1) * 100:+.0f}%"
+        print(
+            f"{name:<32} {stats['requests']:>6} {stats['errors']:>4} "
+            f"{stats['requests_per_second']:>8} {stats['p50_ms']:>8} "
+            f"{stats['p95_ms']:>8} {stats['p99_ms']:>8} {change:>12}"
+        )
+    print(f"total: {results['total_requests_per_second']} req/s")
+
+
+def regressions(results: dict, baseline: dict, max_regression: float) -> list[str]:
+    """Endpoints whose p95 latency got worse than the baseline by more than max_regression."""
+    worse = []
+    for name, stats in results["endpoints"].items():
+        base = baseline["endpoints"].get(name)
+        if base and stats["p95_ms"] > base["p95_ms"] * (1 + max_regression):
+            worse.append(f"{name}: p95 {base['p95_ms']} ms -> {stats['p95_ms']} ms")
+    return worse
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds to run")
+    parser.add_argument("--concurrency", type=int, default=20, help="virtual users")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--storage-profile",
+        default=SQLITE_STORAGE_PROFILE,
+        help="SQLite storage profile (see SQLITE_STORAGE_PROFILES)",
+    )
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument(
+        "--max-regression",
+        type=float,
+        default=0.25,
+        help="allowed p95 increase over the baseline (0.25 = 25%%)",
+    )
+    args = parser.parse_args()
+
+    results = asyncio.run(
+        run(args.duration, args.concurrency, args.seed, args.storage_profile)
+    )
+
+    if args.save_baseline:
+        BASELINE_PATH.parent.mkdir(exist_ok=True)
+        BASELINE_PATH.write_text(json.dumps(results, indent=2) + "\n")
+        print_report(results)
+        print(f"Saved baseline to {BASELINE_PATH}")
+        return
+
+    baseline = json.loads(BASELINE_PATH.read_text()) if BASELINE_PATH.exists() else None
+    print_report(results, baseline)
+    if baseline:
+        worse = regressions(results, baseline, args.max_regression)
+        if worse:
+            print("Regressions:\n  " + "\n  ".join(worse))
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+"""
+Benchmark for the SQLite storage profiles under concurrent reads and writes.
+Readers page through submissions while writers insert them (each insert its
+own transaction, like POST /api/submissions), against a temporary database
+per profile. Reports operations/sec, p95 latency and "database is locked"
+errors for each side.
+
+Usage (from backend/):
+    python -m benchmarks.sqlite_profiles
+    python -m benchmarks.sqlite_profiles --readers 32 --writers 32 --duration 10
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import tempfile
+import time
+from collections import defaultdict
+
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import async_sessionmaker
+from sqlmodel import SQLModel, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from database import create_database_engine
+from models import Form, FormSubmission
+from config.constants import SQLITE_STORAGE_PROFILES
+
+SEED_SUBMISSIONS = 2000
+PAGE_SIZE = 50
+ANSWERS = json.dumps({f"q{i}_{i}": f"Answer {i}" for i in range(30)})
+
+
+async def seed(session_factory) -> str:
+    async with session_factory() as session:
+        form = Form(id="form-1", form_name="Intake", fields="[]")
+        session.add(form)
+        for _ in range(SEED_SUBMISSIONS):
+            session.add(FormSubmission(form_id=form.id, submission_data=ANSWERS))
+        await session.commit()
+    return form.id
+
+
+async def reader(session_factory, deadline, stats):
+    while time.perf_counter() < deadline:
+        start = time.perf_counter()
+        try:
+            async with session_factory() as session:
+                statement = (
+                    select(FormSubmission)
+                    .order_by(FormSubmission.submitted_at.desc(), FormSubmission.id.desc())
+                    .limit(PAGE_SIZE)
+                )
+                (await session.exec(statement)).all()
+        except OperationalError:
+            stats["read_errors"] += 1
+            continue
+        stats["read"].append(time.perf_counter() - start)
+
+
+async def writer(session_factory, form_id, deadline, stats):
+    while time.perf_counter() < deadline:
+        start = time.perf_counter()
+        try:
+            async with session_factory() as session:
+                session.add(FormSubmission(form_id=form_id, submission_data=ANSWERS))
+                await session.commit()
+        except OperationalError:
+            stats["write_errors"] += 1
+            continue
+        stats["write"].append(time.perf_counter() - start)
+
+
+async def run_profile(profile: str, readers: int, writers: int, duration: float) -> dict:
+    """Run the mixed workload on a fresh database with one storage profile."""
+    database_path = os.path.join(tempfile.mkdtemp(), "bench.db")
+    engine = create_database_engine(f"sqlite+aiosqlite:///{database_path}", profile)
+    session_factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    async with engine.begin() as conn:
+        await conn.run_sync(SQLModel.metadata.create_all)
+    form_id = await seed(session_factory)
+
+    stats = defaultdict(int, read=[], write=[])
+    start = time.perf_counter()
+    deadline = start + duration
+    await asyncio.gather(
+        *(reader(session_factory, deadline, stats) for _ in range(readers)),
+        *(writer(session_factory, form_id, deadline, stats) for _ in range(writers)),
+    )
+    elapsed = time.perf_counter() - start
+    await engine.dispose()
+
+    def p95_ms(latencies):
+        if len(latencies) < 2:
+            return float("nan")
+        return statistics.quantiles(latencies, n=100, method="inclusive")[94] * 1000
+
+    return {
+        "reads_per_second": len(stats["read"]) / elapsed,
+        "read_p95_ms": p95_ms(stats["read"]),
+        "read_errors": stats["read_errors"],
+        "writes_per_second": len(stats["write"]) / elapsed,
+        "write_p95_ms": p95_ms(stats["write"]),
+        "write_errors": stats["write_errors"],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--readers", type=int, default=16)
+    parser.add_argument("--writers", type=int, default=16)
+    parser.add_argument("--duration", type=float, default=5.0, help="seconds per profile")
+    args = parser.parse_args()
+
+    print(f"{args.readers} readers, {args.writers} writers, {args.duration:g} s per profile\n")
+    print(
+        f"{'profile':<10} {'reads/s':>9} {'read p95 ms':>12} {'read err':>9} "
+        f"{'writes/s':>9} {'write p95 ms':>13} {'write err':>10}"
+    )
+    for profile in SQLITE_STORAGE_PROFILES:
+        result = asyncio.run(run_profile(profile, args.readers, args.writers, args.duration))
+        print(
+            f"{profile:<10} {result['reads_per_second']:>9.0f} {result['read_p95_ms']:>12.1f} "
+            f"{result['read_errors']:>9} {result['writes_per_second']:>9.0f} "
+            f"{result['write_p95_ms']:>13.1f} {result['write_errors']:>10}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""
+Benchmark for saving submission bursts: one commit per submission (the old
+POST /api/submissions path) versus group commit through SubmissionWriter.
+Concurrent "patients" each save submissions back to back against a temporary
+database; half are non-English, so they also queue a back-translation job.
+
+Usage (from backend/):
+    python -m benchmarks.submission_writes
+    python -m benchmarks.submission_writes --concurrency 200 --duration 10
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import tempfile
+import time
+
+from sqlalchemy.ext.asyncio import async_sessionmaker
+from sqlmodel import SQLModel
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from database import create_database_engine
+from models import FormSubmission
+from services.job_queue import enqueue_job, BACK_TRANSLATE_SUBMISSION
+from services.submission_writer import SubmissionWriter
+
+ANSWERS = json.dumps({f"q{i}_{i}": f"Answer {i}" for i in range(30)})
+
+
+def make_submission(i: int) -> FormSubmission:
+    language = "es" if i % 2 else "en"
+    return FormSubmission(
+        form_id="form-1",
+        submission_data=ANSWERS,
+        language=language,
+        translation_status="complete" if language == "en" else "pending",
+    )
+
+
+async def commit_each(session_factory, submission: FormSubmission):
+    """One transaction per submission."""
+    async with session_factory() as session:
+        session.add(submission)
+        if submission.translation_status == "pending":
+            await session.flush()
+            enqueue_job(session, BACK_TRANSLATE_SUBMISSION, {"submission_id": submission.id})
+        await session.commit()
+
+
+async def run(mode: str, concurrency: int, duration: float) -> dict:
+    database_path = os.path.join(tempfile.mkdtemp(), "bench.db")
+    engine = create_database_engine(f"sqlite+aiosqlite:///{database_path}")
+    session_factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    async with engine.begin() as conn:
+        await conn.run_sync(SQLModel.metadata.create_all)
+
+    writer = SubmissionWriter(session_factory)
+    if mode == "group commit":
+        save = writer.add
+    else:
+        save = lambda submission: commit_each(session_factory, submission)
+
+    latencies = []
+
+    async def patient(deadline):
+        i = 0
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            await save(make_submission(i))
+            latencies.append(time.perf_counter() - start)
+            i += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(patient(start + duration) for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    await writer.aclose()
+    await engine.dispose()
+
+    percentiles = statistics.quantiles(latencies, n=100, method="inclusive")
+    return {
+        "inserts_per_second": len(latencies) / elapsed,
+        "p50_ms": percentiles[49] * 1000,
+        "p95_ms": percentiles[94] * 1000,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--concurrency", type=int, default=50, help="patients submitting at once")
+    parser.add_argument("--duration", type=float, default=5.0, help="seconds per mode")
+    args = parser.parse_args()
+
+    print(f"{args.concurrency} concurrent patients, {args.duration:g} s per mode\n")
+    print(f"{'mode':<16} {'inserts/s':>10} {'p50 ms':>9} {'p95 ms':>9}")
+    for mode in ("commit each", "group commit"):
+        result = asyncio.run(run(mode, args.concurrency, args.duration))
+        print(
+            f"{mode:<16} {result['inserts_per_second']:>10.0f} "
+            f"{result['p50_ms']:>9.1f} {result['p95_ms']:>9.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -3,6 +3,8 @@ Shared constants for the application.
 Centralizes configuration values to avoid duplication and make maintenance easier.
 """
 
+import os
+
 # Supported languages mapping: code -> name
 SUPPORTED_LANGUAGES = {
     "en": "English",
@@ -12,3 +14,128 @@ SUPPORTED_LANGUAGES = {
 # Languages to pre-cache when forms are created
 # Add or remove language codes here to control which translations are pre-cached
 PRE_CACHE_LANGUAGES = ["es"]
+
+# Translation backend: "openai" (needs config/api_key.txt) or "stub", a local
+# backend with deterministic pseudo-translations for load tests and CI.
+# The TRANSLATION_PROVIDER environment variable overrides it.
+TRANSLATION_PROVIDER = os.environ.get("TRANSLATION_PROVIDER", "openai")
+
+# Stub backend: simulated latency per call (+/- jitter), share of calls that fail,
+# and the random seed for jitter and failures (each overridable by environment variable)
+STUB_TRANSLATION_LATENCY_SECONDS = float(
+    os.environ.get("STUB_TRANSLATION_LATENCY_SECONDS", "0.5")
+)
+STUB_TRANSLATION_JITTER_SECONDS = float(
+    os.environ.get("STUB_TRANSLATION_JITTER_SECONDS", "0.2")
+)
+STUB_TRANSLATION_FAILURE_RATE = float(
+    os.environ.get("STUB_TRANSLATION_FAILURE_RATE", "0.0")
+)
+STUB_TRANSLATION_SEED = int(os.environ.get("STUB_TRANSLATION_SEED", "0"))
+
+# Shared OpenAI client settings (one client per app, created at startup)
+# Connection pool size and how long idle keep-alive connections are reused
+TRANSLATION_MAX_CONNECTIONS = 20
+TRANSLATION_MAX_KEEPALIVE_CONNECTIONS = 10
+TRANSLATION_KEEPALIVE_EXPIRY_SECONDS = 60.0
+
+# Request timeouts for translation calls
+TRANSLATION_CONNECT_TIMEOUT_SECONDS = 5.0
+TRANSLATION_TIMEOUT_SECONDS = 60.0
+
+# How long a worker serves the latest form from memory before re-reading the database.
+# Creating a form clears the cache in the worker that handled it; this bounds how
+# stale the other uvicorn workers can be.
+LATEST_FORM_CACHE_TTL_SECONDS = 30.0
+
+# HTTP caching of form responses. Forms never change once created, so a form
+# fetched by id can be reused by the browser; /api/forms/latest is revalidated
+# on every use (ETag / If-None-Match) because a newer form can replace it.
+FORM_CACHE_CONTROL = "private, max-age=86400"
+LATEST_FORM_CACHE_CONTROL = "no-cache"
+
+# Large forms are translated in chunks so each prompt (and reply) stays small.
+# A chunk holds at most this many fields / characters of field content.
+TRANSLATION_CHUNK_MAX_FIELDS = 25
+TRANSLATION_CHUNK_MAX_CHARS = 6000
+
+# Chunks of one form translated at once, and attempts per chunk before giving up
+TRANSLATION_CHUNK_CONCURRENCY = 4
+TRANSLATION_CHUNK_ATTEMPTS = 3
+
+# Durable translation job queue (form pre-caching and submission back-translation)
+# Workers per process; also the limit on jobs translating at once in that process
+TRANSLATION_JOB_WORKERS = 4
+# A failed job is retried after JOB_RETRY_BASE_SECONDS, doubling each time, up to JOB_MAX_ATTEMPTS
+JOB_MAX_ATTEMPTS = 5
+JOB_RETRY_BASE_SECONDS = 2.0
+# A running job's lease is renewed while it runs; if its worker dies, another takes over after this
+JOB_LEASE_SECONDS = 60.0
+# Idle workers check for new jobs this often (jobs enqueued in-process wake one idle worker each immediately)
+JOB_POLL_INTERVAL_SECONDS = 1.0
+
+# Group commit of new submissions: rows arriving within the window (or until a
+# batch holds max rows) are inserted in one transaction. The window is the most
+# a lone submission waits for company.
+SUBMISSION_BATCH_MAX_ROWS = 100
+SUBMISSION_BATCH_WINDOW_SECONDS = 0.005
+
+# POST /api/submissions/bulk: most submissions accepted in one upload, and most
+# submissions translated together in one back-translation request (a bigger
+# upload is queued as several grouped jobs, keeping each prompt a sensible size)
+SUBMISSIONS_BULK_MAX_ITEMS = 1000
+BACK_TRANSLATION_GROUP_MAX_SUBMISSIONS = 25
+# Single submissions being back-translated at the same time are sent as one
+# request too: a batch goes out when it holds BACK_TRANSLATION_GROUP_MAX_SUBMISSIONS
+# or this long after its first submission arrived, whichever comes first
+BACK_TRANSLATION_BATCH_WAIT_SECONDS = 0.2
+# Job workers per process that only run single back-translation jobs (on top of
+# TRANSLATION_JOB_WORKERS): they spend most of their time waiting for a batch to
+# go out, and with only the shared workers batches could never grow past a few
+# submissions. More of them also means more claim queries on each new job.
+BACK_TRANSLATION_JOB_WORKERS = 8
+
+# GET /api/submissions page size (default and maximum)
+SUBMISSIONS_PAGE_SIZE = 50
+SUBMISSIONS_MAX_PAGE_SIZE = 500
+
+# Submissions export: rows fetched from the database cursor (and written out) per batch
+SUBMISSIONS_EXPORT_BATCH_SIZE = 500
+
+# SQLite storage profiles: PRAGMAs run on every new connection, and the connection
+# pool. "tuned" uses WAL journaling (readers don't block the writer and vice versa)
+# with synchronous=NORMAL (fsync at checkpoints, not every commit), waits up to
+# busy_timeout ms for a lock instead of failing with "database is locked", and
+# memory-maps / caches the file. "default" is SQLite's and SQLAlchemy's defaults.
+# The SQLITE_STORAGE_PROFILE environment variable picks one.
+SQLITE_STORAGE_PROFILES = {
+    "default": {"pragmas": {}, "pool": {}},
+    "tuned": {
+        "pragmas": {
+            "journal_mode": "WAL",
+            "synchronous": "NORMAL",
+            "busy_timeout": 5000,  # ms
+            "mmap_size": 256 * 1024 * 1024,  # bytes
+            "cache_size": -64 * 1024,  # negative = KiB (64 MiB per connection)
+            "temp_store": "MEMORY",
+        },
+        # connections kept open, extra ones opened under load, and how long a
+        # request waits for one (each aiosqlite connection has its own thread).
+        # Bigger pools let more writers wait in SQLite's busy handler, which
+        # sleeps in growing steps, and cut write throughput; smaller ones queue
+        # reads (see benchmarks/sqlite_profiles.py and benchmarks/load_test.py)
+        "pool": {"pool_size": 8, "max_overflow": 8, "pool_timeout": 30},
+    },
+}
+SQLITE_STORAGE_PROFILE = os.environ.get("SQLITE_STORAGE_PROFILE", "tuned")
+
+# Opt-in request profiling (see services/profiling.py). A request is profiled when
+# it sends PROFILING_TOKEN in the X-Profile header, or at random with probability
+# PROFILING_SAMPLE_RATE. With no token and a rate of 0 the profiler isn't installed.
+PROFILING_TOKEN = os.environ.get("PROFILING_TOKEN", "")
+PROFILING_SAMPLE_RATE = float(os.environ.get("PROFILING_SAMPLE_RATE", "0.0"))
+# Time between stack samples of a profiled request
+PROFILING_INTERVAL_SECONDS = 0.001
+# Where profiles are written (collapsed-stack files) and how many of the newest are kept
+PROFILE_DIR = os.environ.get("PROFILE_DIR", "profiles")
+PROFILE_MAX_FILES = 200
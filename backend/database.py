@@ -0,0 +1,121 @@
+"""
+Async database layer.
+All database work goes through an async engine so queries and commits never
+block the event loop that serves other requests.
+"""
+
+from sqlalchemy import event, text
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine, async_sessionmaker
+from sqlmodel.ext.asyncio.session import AsyncSession
+from services.metrics import instrument_engine
+from config.constants import SQLITE_STORAGE_PROFILES, SQLITE_STORAGE_PROFILE
+
+
+def create_database_engine(url: str, profile: str = SQLITE_STORAGE_PROFILE) -> AsyncEngine:
+    """
+    Create an async SQLite engine with a storage profile applied.
+
+    Args:
+        url: Database URL (sqlite+aiosqlite:///path)
+        profile: Name of a profile in SQLITE_STORAGE_PROFILES ("tuned" or "default")
+
+    Returns:
+        An engine whose pool uses the profile's settings and whose new
+        connections run the profile's PRAGMAs
+    """
+    if profile not in SQLITE_STORAGE_PROFILES:
+        raise ValueError(f"Unknown SQLite storage profile: {profile}")
+    settings = SQLITE_STORAGE_PROFILES[profile]
+    engine = create_async_engine(url, **settings["pool"])
+
+    # connection-level settings, so run once per new connection (journal_mode=WAL
+    # is stored in the database file; the rest only last as long as the connection)
+    @event.listens_for(engine.sync_engine, "connect")
+    def _apply_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for name, value in settings["pragmas"].items():
+            cursor.execute(f"PRAGMA {name}={value}")
+        cursor.close()
+
+    return engine
+
+
+# create_all only creates missing tables, so database files made before these
+# were added (like the committed database.db) get them from upgrade_schema
+_ADDED_COLUMNS = [
+    # (table, column, definition); existing submissions were English and complete
+    ("formsubmission", "language", "VARCHAR NOT NULL DEFAULT 'en'"),
+    ("formsubmission", "translation_status", "VARCHAR NOT NULL DEFAULT 'complete'"),
+]
+_ADDED_INDEXES = [
+    "CREATE INDEX IF NOT EXISTS ix_form_created_at ON form (created_at)",
+    "CREATE INDEX IF NOT EXISTS ix_formsubmission_submitted_at ON formsubmission (submitted_at)",
+    "CREATE INDEX IF NOT EXISTS ix_formsubmission_translation_status "
+    "ON formsubmission (translation_status)",
+    "CREATE INDEX IF NOT EXISTS ix_formsubmission_form_id_submitted_at "
+    "ON formsubmission (form_id, submitted_at)",
+]
+
+
+def _has_unique_index(connection, table: str, columns: list[str]) -> bool:
+    """Whether a unique index (or UNIQUE constraint) covers exactly these columns."""
+    for index in connection.execute(text(f"PRAGMA index_list({table})")).mappings():
+        if not index["unique"]:
+            continue
+        info = connection.execute(text(f"PRAGMA index_info('{index['name']}')")).mappings()
+        if [column["name"] for column in info] == columns:
+            return True
+    return False
+
+
+def upgrade_schema(connection):
+    """
+    Bring a database created by an older version up to the current models.
+    Idempotent; run after create_all (e.g. conn.run_sync(upgrade_schema)).
+    """
+    for table, column, definition in _ADDED_COLUMNS:
+        existing = {row[1] for row in connection.execute(text(f"PRAGMA table_info({table})"))}
+        if column not in existing:
+            connection.execute(text(f"ALTER TABLE {table} ADD COLUMN {column} {definition}"))
+
+    for statement in _ADDED_INDEXES:
+        connection.execute(text(statement))
+
+    # one cached translation per form and language (older files may hold duplicates;
+    # keep the first)
+    if not _has_unique_index(connection, "translatedform", ["form_id", "language_code"]):
+        connection.execute(
+            text(
+                "DELETE FROM translatedform WHERE id NOT IN "
+                "(SELECT MIN(id) FROM translatedform GROUP BY form_id, language_code)"
+            )
+        )
+        connection.execute(
+            text(
+                "CREATE UNIQUE INDEX uq_translatedform_form_id_language_code "
+                "ON translatedform (form_id, language_code)"
+            )
+        )
+
+
+# Database setup - creates connection to SQLite database file
+# aiosqlite runs each connection on its own thread, awaited from the event loop
+DATABASE_URL = "sqlite+aiosqlite:///database.db"
+engine = create_database_engine(DATABASE_URL)
+instrument_engine(engine)
+
+# expire_on_commit=False: attributes stay loaded after commit, so handlers can
+# keep reading them without triggering a lazy (blocking) refresh
+async_session = async_sessionmaker(
+    engine, class_=AsyncSession, expire_on_commit=False
+)
+
+
+async def get_session():
+    async with async_session() as session:
+        yield session
+
+
+def get_session_factory():
+    """Return the session factory, for work that outlives the request (background tasks)."""
+    return async_session
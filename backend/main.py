@@ -1,16 +1,18 @@
-from fastapi import FastAPI, HTTPException, Depends
+from fastapi import FastAPI, HTTPException, Depends, Header, Request, Response, Query
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse
 from contextlib import asynccontextmanager
+from typing import Callable, Literal, Optional, Union
 
 # SQLModel: ORM for database operations
-from sqlmodel import (
-    SQLModel,
-    create_engine,
-    Session,
-    select,
-)
+from sqlmodel import SQLModel, select, func
+from sqlmodel.ext.asyncio.session import AsyncSession
+from sqlalchemy import and_, or_, insert
+from sqlalchemy.exc import IntegrityError
 
-import uuid, json
+import asyncio, base64, hashlib, secrets, uuid, json
+from collections import defaultdict
+from datetime import datetime, UTC
 from models import (
     Form,
     FormSubmission,
@@ -18,29 +20,65 @@ from models import (
     LoginRequest,
     LoginResponse,
     TranslatedForm,
+    TranslationJob,
 )  # Our custom models
 from services.translation_service import TranslationService
-from config.constants import PRE_CACHE_LANGUAGES
-
-# Database setup - creates connection to SQLite database file
-engine = create_engine("sqlite:///database.db")  # SQLite stores data in a local file
-
-
-def get_session():
-    with Session(engine) as session:
-        yield session
+from services.translation_memory import TranslationMemoryStore
+from services.translation_providers import MissingAPIKeyError, create_translation_provider
+from services.single_flight import SingleFlight, EventBroadcast
+from services.form_cache import LatestFormCache
+from services.back_translation import back_translate_submission, back_translate_submissions
+from services.submission_export import export_csv, export_ndjson
+from services.submission_writer import SubmissionWriter
+from services.json_body import RawJSON, json_array, json_object
+from services.metrics import (
+    MetricsMiddleware,
+    record_cache_hit,
+    record_cache_lookup,
+    registry,
+)
+from services.profiling import ProfileStore, ProfilingMiddleware, profiling_enabled
+from services.job_queue import (
+    JobWorkers,
+    enqueue_job,
+    PRECACHE_FORM,
+    BACK_TRANSLATE_SUBMISSION,
+    BACK_TRANSLATE_SUBMISSIONS,
+)
+from config.constants import (
+    SUPPORTED_LANGUAGES,
+    PRE_CACHE_LANGUAGES,
+    LATEST_FORM_CACHE_TTL_SECONDS,
+    TRANSLATION_JOB_WORKERS,
+    BACK_TRANSLATION_JOB_WORKERS,
+    SUBMISSIONS_PAGE_SIZE,
+    SUBMISSIONS_MAX_PAGE_SIZE,
+    SUBMISSIONS_BULK_MAX_ITEMS,
+    BACK_TRANSLATION_GROUP_MAX_SUBMISSIONS,
+    FORM_CACHE_CONTROL,
+    LATEST_FORM_CACHE_CONTROL,
+    PROFILING_TOKEN,
+)
+from database import (
+    engine,
+    async_session,
+    get_session,
+    get_session_factory,
+    upgrade_schema,
+)
+from functools import partial
 
 
-def _initialize_dummy_users():
+async def _initialize_dummy_users():
     """
     Initialize dummy users in the database if they don't exist.
     This function is called on application startup.
     """
-    with Session(engine) as session:
+    async with async_session() as session:
 
         # get all users
         statement = select(User)
-        existing_users = session.exec(statement).all()
+        existing_users = (await session.exec(statement)).all()
 
         # if not users, create dummy users
         if len(existing_users) == 0:
@@ -68,7 +106,7 @@ def _initialize_dummy_users():
 
             session.add(patient_user)
             session.add(admin_user)
-            session.commit()
+            await session.commit()
             print("✓ Dummy users initialized in database")
         else:
             print(f"✓ Found {len(existing_users)} existing user(s) in database")
@@ -77,18 +115,79 @@ def _initialize_dummy_users():
 # runs when the FASTAPI starts up
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    # create tables and users if they don't exist
-    SQLModel.metadata.create_all(engine)
-    _initialize_dummy_users()
+    # create tables and users if they don't exist (and add columns/indexes
+    # that an older database file is missing)
+    async with engine.begin() as conn:
+        await conn.run_sync(SQLModel.metadata.create_all)
+        await conn.run_sync(upgrade_schema)
+    await _initialize_dummy_users()
+
+    # one translator (and one connection pool) shared by every request
+    # the backend (OpenAI or the local stub) is chosen by TRANSLATION_PROVIDER;
+    # without an API key the app runs in English only, but an unknown provider
+    # name fails startup
+    try:
+        app.state.translator = TranslationService(
+            provider=create_translation_provider(),
+            memory=TranslationMemoryStore(async_session),
+        )
+    except MissingAPIKeyError as e:
+        app.state.translator = None
+        print(f"Warning: Translation disabled: {e}")
+
+    # new submissions are committed in batches (group commit)
+    app.state.submission_writer = SubmissionWriter(async_session)
+
+    # workers for queued translation jobs (they wait in the table if translation is disabled)
+    app.state.job_workers = None
+    if app.state.translator is not None:
+        app.state.job_workers = JobWorkers(
+            async_session,
+            _job_handlers(app.state.translator, async_session),
+            TRANSLATION_JOB_WORKERS,
+            kind_workers={BACK_TRANSLATE_SUBMISSION: BACK_TRANSLATION_JOB_WORKERS},
+        )
+        await app.state.job_workers.start()
+
     yield
-    # cleanup: close database connection
-    engine.dispose()
+
+    # cleanup: commit waiting submissions, stop workers, close translator
+    # connections and database connection
+    await app.state.submission_writer.aclose()
+    if app.state.job_workers is not None:
+        await app.state.job_workers.stop()
+    if app.state.translator is not None:
+        await app.state.translator.aclose()
+    await engine.dispose()
+
+
+def get_translator(request: Request) -> Optional[TranslationService]:
+    """Return the app-wide translator (None if translation isn't configured)."""
+    return getattr(request.app.state, "translator", None)
+
+
+def get_submission_writer(request: Request) -> SubmissionWriter:
+    """Return the app-wide submission writer."""
+    return request.app.state.submission_writer
+
+
+def get_job_workers(request: Request) -> Optional[JobWorkers]:
+    """Return this process's translation job workers (None if translation is disabled)."""
+    return getattr(request.app.state, "job_workers", None)
 
 
 # create the FASTAPI app (runs lifespan() above)
 app = FastAPI(lifespan=lifespan)
 
 
+# per-route latency histograms for /metrics
+app.add_middleware(MetricsMiddleware)
+
+# opt-in request profiling (only installed when a token or sample rate is configured)
+profile_store = ProfileStore()
+if profiling_enabled():
+    app.add_middleware(ProfilingMiddleware, store=profile_store)
+
 # !! make sure to update so that only the frontend can access the backend !!
 app.add_middleware(
     CORSMiddleware,
@@ -99,9 +198,159 @@ app.add_middleware(
 )
 
 
+# one in-flight translation per (form_id, language_code), shared by all waiters
+translation_flights = SingleFlight()
+
+# serialized /api/forms/latest responses per language, cleared when a form is created
+latest_form_cache = LatestFormCache(ttl_seconds=LATEST_FORM_CACHE_TTL_SECONDS)
+
+
+async def _translate_and_cache(
+    form_id: str,
+    form_name: str,
+    fields: list[dict],
+    lang_code: str,
+    translator: TranslationService,
+    session_factory,
+) -> TranslatedForm:
+    """
+    Translate a form into one language and save it to the TranslatedForm cache.
+    Run through translation_flights so concurrent cache misses share one call.
+
+    Returns:
+        The cached TranslatedForm row
+    """
+    # another request may have cached it since the caller checked (the session
+    # is closed before translating, so no connection is held during the call)
+    async with session_factory() as session:
+        cache_statement = select(TranslatedForm).where(
+            TranslatedForm.form_id == form_id, TranslatedForm.language_code == lang_code
+        )
+        cached_translation = (await session.exec(cache_statement)).first()
+    if cached_translation:
+        return cached_translation
+
+    # translate the form name and fields in parallel
+    translated_form_name, translated_fields = await asyncio.gather(
+        translator.translate_form_name(form_name, lang_code),
+        translator.translate_form_fields(fields, lang_code),
+    )
+
+    return await _save_translation(
+        form_id, lang_code, translated_form_name, translated_fields, session_factory
+    )
+
+
+async def _save_translation(
+    form_id: str,
+    lang_code: str,
+    translated_form_name: str,
+    translated_fields: list[dict],
+    session_factory,
+) -> TranslatedForm:
+    """
+    Save a translated form to the TranslatedForm cache (first writer wins).
+
+    Returns:
+        The cached row (the other writer's, if it got there first)
+    """
+    async with session_factory() as session:
+        translation = TranslatedForm(
+            form_id=form_id,
+            language_code=lang_code,
+            translated_form_name=translated_form_name,
+            translated_fields=json.dumps(translated_fields),
+        )
+        session.add(translation)
+        try:
+            await session.commit()
+        except IntegrityError:
+            # cached by another request or worker process in the meantime; keep its row
+            await session.rollback()
+            cache_statement = select(TranslatedForm).where(
+                TranslatedForm.form_id == form_id,
+                TranslatedForm.language_code == lang_code,
+            )
+            translation = (await session.exec(cache_statement)).one()
+        return translation
+
+
+async def _run_precache_job(
+    payload: dict,
+    last_attempt: bool,
+    translator: TranslationService,
+    session_factory,
+):
+    """Job handler: cache one language's translation of a new form."""
+    async with session_factory() as session:
+        form = await session.get(Form, payload["form_id"])
+    if form is None:
+        return
+
+    lang_code = payload["language_code"]
+    await translation_flights.do(
+        (form.id, lang_code),
+        lambda: _translate_and_cache(
+            form.id,
+            form.form_name,
+            json.loads(form.fields),
+            lang_code,
+            translator,
+            session_factory,
+        ),
+    )
+
+
+async def _run_back_translation_job(
+    payload: dict,
+    last_attempt: bool,
+    translator: TranslationService,
+    session_factory,
+):
+    """Job handler: translate one submission's answers to English."""
+    await back_translate_submission(
+        payload["submission_id"], translator, session_factory, last_attempt
+    )
+
+
+async def _run_group_back_translation_job(
+    payload: dict,
+    last_attempt: bool,
+    translator: TranslationService,
+    session_factory,
+):
+    """Job handler: translate a group of submissions' answers to English."""
+    await back_translate_submissions(
+        payload["submission_ids"], translator, session_factory, last_attempt
+    )
+
+
+def _job_handlers(translator: TranslationService, session_factory) -> dict:
+    """Map each job kind to its handler."""
+    return {
+        PRECACHE_FORM: partial(
+            _run_precache_job, translator=translator, session_factory=session_factory
+        ),
+        BACK_TRANSLATE_SUBMISSION: partial(
+            _run_back_translation_job,
+            translator=translator,
+            session_factory=session_factory,
+        ),
+        BACK_TRANSLATE_SUBMISSIONS: partial(
+            _run_group_back_translation_job,
+            translator=translator,
+            session_factory=session_factory,
+        ),
+    }
+
+
 # create a form
 @app.post("/api/forms")
-async def create_form(form: dict, session: Session = Depends(get_session)):
+async def create_form(
+    form: dict,
+    session: AsyncSession = Depends(get_session),
+    job_workers: Optional[JobWorkers] = Depends(get_job_workers),
+):
     form_id = str(uuid.uuid4())
     db_form = Form(
         id=form_id, form_name=form["form_name"], fields=json.dumps(form["fields"])
@@ -109,156 +358,823 @@ async def create_form(form: dict, session: Session = Depends(get_session)):
 
     # Session manages database transactions - automatically handles connection/cleanup
     session.add(db_form)
-    session.commit()
 
-    # Pre-cache translations for configured languages
-    translator = TranslationService()
+    # Pre-cache translations for configured languages (one job per language, saved with the form)
     for lang_code in PRE_CACHE_LANGUAGES:
-        try:
-            translated_form_name = await translator.translate_form_name(
-                form["form_name"], lang_code
-            )
-            translated_fields = await translator.translate_form_fields(
-                form["fields"], lang_code
-            )
+        enqueue_job(
+            session, PRECACHE_FORM, {"form_id": form_id, "language_code": lang_code}
+        )
 
-            translated_form = TranslatedForm(
-                form_id=form_id,
-                language_code=lang_code,
-                translated_form_name=translated_form_name,
-                translated_fields=json.dumps(translated_fields),
-            )
-            session.add(translated_form)
-            session.commit()
-        except Exception as e:
-            print(f"Warning: Failed to pre-cache {lang_code} translation: {e}")
+    await session.commit()
+    latest_form_cache.invalidate()
+    if job_workers is not None:
+        job_workers.notify(PRECACHE_FORM, len(PRE_CACHE_LANGUAGES))
 
     return {"form_id": form_id}
 
 
+def _json_response(body: bytes, headers: Optional[dict] = None) -> Response:
+    """Send an already-encoded JSON body (skips FastAPI's jsonable_encoder pass)."""
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+def _form_etag(
+    form_id: str, lang_code: str, translation_version: Union[int, str]
+) -> str:
+    """
+    Strong ETag for a form in one language.
+    Forms and cached translations never change once saved, so the form id,
+    language and translation version (the TranslatedForm row id, 0 for English)
+    identify the response body exactly.
+    """
+    key = f"{form_id}:{lang_code}:{translation_version}"
+    return '"' + hashlib.sha256(key.encode()).hexdigest()[:32] + '"'
+
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Whether an If-None-Match header matches etag (weak comparison, as RFC 9110 asks)."""
+    if if_none_match is None:
+        return False
+    candidates = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+    return "*" in candidates or etag in candidates
+
+
+def _cacheable_form_response(
+    build_body: Callable[[], bytes],
+    etag: str,
+    cache_control: str,
+    if_none_match: Optional[str],
+) -> Response:
+    """
+    Answer 304 if the client already has this version, else send the body.
+    build_body is only called for a 200, so a 304 never touches the form JSON.
+    """
+    headers = {"ETag": etag, "Cache-Control": cache_control}
+    if _etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers=headers)
+    return _json_response(build_body(), headers)
+
+
+def _check_language(lang: str):
+    """Reject a language code the app doesn't translate to."""
+    if lang not in SUPPORTED_LANGUAGES:
+        raise HTTPException(status_code=400, detail=f"Unsupported language: {lang}")
+
+
 # get the most recent form (with optional translation)
 @app.get("/api/forms/latest")
-async def get_latest_form(lang: str = "en", session: Session = Depends(get_session)):
+async def get_latest_form(
+    lang: str = "en",
+    if_none_match: Optional[str] = Header(default=None),
+    session: AsyncSession = Depends(get_session),
+    session_factory=Depends(get_session_factory),
+    translator: Optional[TranslationService] = Depends(get_translator),
+):
+    # only supported languages, so the cache holds at most one entry per language
+    _check_language(lang)
+
+    # Serve from memory when possible (no SQL, no JSON work)
+    cached = latest_form_cache.get(lang)
+    record_cache_hit("latest_form", cached is not None)
+    if cached is not None:
+        cached_body, cached_etag = cached
+        return _cacheable_form_response(
+            lambda: cached_body, cached_etag, LATEST_FORM_CACHE_CONTROL, if_none_match
+        )
+    cache_generation = latest_form_cache.generation
+
     statement = select(Form).order_by(Form.created_at.desc())
-    latest_form = session.exec(statement).first()
+    latest_form = (await session.exec(statement)).first()
 
     if not latest_form:
         raise HTTPException(status_code=404, detail="No forms found")
 
-    fields = json.loads(latest_form.fields)
+    def english_body() -> bytes:
+        # the stored fields JSON goes into the body as is
+        return json_object(
+            {
+                "id": latest_form.id,
+                "form_name": latest_form.form_name,
+                "fields": RawJSON(latest_form.fields),
+            }
+        )
+
+    def cached_body(build_body: Callable[[], bytes], etag: str) -> Callable[[], bytes]:
+        # a body that is built (for a 200) is kept in memory for the next request
+        def build() -> bytes:
+            body = build_body()
+            latest_form_cache.set(lang, body, etag, cache_generation)
+            return body
+
+        return build
 
     # Return English version directly
     if lang == "en":
-        return {
-            "id": latest_form.id,
-            "form_name": latest_form.form_name,
-            "fields": fields,
-        }
+        etag = _form_etag(latest_form.id, lang, 0)
+        return _cacheable_form_response(
+            cached_body(english_body, etag), etag, LATEST_FORM_CACHE_CONTROL, if_none_match
+        )
 
     # Check cache for translation
     cache_statement = select(TranslatedForm).where(
         TranslatedForm.form_id == latest_form.id, TranslatedForm.language_code == lang
     )
-    cached_translation = session.exec(cache_statement).first()
+    cached_translation = (await session.exec(cache_statement)).first()
+    record_cache_hit("translated_form", cached_translation is not None)
 
+    # Translate and cache (English fallback if translation is unavailable, sent
+    # with no-store so the browser asks again)
     if cached_translation:
-        return {
-            "id": latest_form.id,
-            "form_name": cached_translation.translated_form_name,
-            "fields": json.loads(cached_translation.translated_fields),
-        }
+        translation = cached_translation
+
+    elif translator is None:
+        return _json_response(english_body(), {"Cache-Control": "no-store"})
 
-    # Translate and cache
+    else:
+        # end the read so its pooled connection isn't held for the whole translation
+        # (_translate_and_cache needs a connection of its own to save the result)
+        await session.commit()
+        try:
+            # concurrent cache misses for this form and language share one translation
+            translation = await translation_flights.do(
+                (latest_form.id, lang),
+                lambda: _translate_and_cache(
+                    latest_form.id,
+                    latest_form.form_name,
+                    json.loads(latest_form.fields),
+                    lang,
+                    translator,
+                    session_factory,
+                ),
+            )
+        except Exception as e:
+            # If translation fails, return English version (not cached, so it's retried)
+            return _json_response(english_body(), {"Cache-Control": "no-store"})
+
+    def translated_body() -> bytes:
+        return json_object(
+            {
+                "id": latest_form.id,
+                "form_name": translation.translated_form_name,
+                "fields": RawJSON(translation.translated_fields),
+            }
+        )
+
+    etag = _form_etag(latest_form.id, lang, translation.id)
+    return _cacheable_form_response(
+        cached_body(translated_body, etag), etag, LATEST_FORM_CACHE_CONTROL, if_none_match
+    )
+
+
+def _sse_event(event: str, data) -> str:
+    """Format one Server-Sent Event."""
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+def _form_stream_event(form_id: str, form_name: str, field_count: int) -> str:
+    """The "form" event that starts a form stream."""
+    return _sse_event(
+        "form", {"id": form_id, "form_name": form_name, "field_count": field_count}
+    )
+
+
+# streaming translations in progress by (form_id, language_code); their SSE
+# events are sent to every request for that form and language
+form_streams: dict[tuple[str, str], EventBroadcast] = {}
+
+
+async def _stream_and_cache(
+    form: Form,
+    lang_code: str,
+    translator: TranslationService,
+    session_factory,
+    broadcast: EventBroadcast,
+) -> TranslatedForm:
+    """
+    Translate a form with the streaming API, publishing its SSE events to
+    broadcast, and save it to the TranslatedForm cache.
+    Run through translation_flights like _translate_and_cache, so /api/forms/latest
+    misses wait for it too. If translation fails, the remaining fields are sent
+    in English and the error is re-raised (nothing is cached, so it's retried).
+
+    Returns:
+        The cached TranslatedForm row
+    """
+    fields = json.loads(form.fields)
+    name_task = asyncio.ensure_future(translator.translate_form_name(form.form_name, lang_code))
+    translated_fields = list(fields)
+    sent = set()
     try:
-        translator = TranslationService()
-        translated_form_name = await translator.translate_form_name(
-            latest_form.form_name, lang
+        try:
+            async for index, field in translator.stream_form_fields(fields, lang_code):
+                if not sent:
+                    broadcast.publish(_form_stream_event(form.id, await name_task, len(fields)))
+                translated_fields[index] = field
+                sent.add(index)
+                broadcast.publish(_sse_event("field", {"index": index, "field": field}))
+            if not fields:
+                broadcast.publish(_form_stream_event(form.id, await name_task, 0))
+            translated_form_name = await name_task
+        except Exception as e:
+            print(f"Warning: Failed to stream {lang_code} translation: {e}")
+            if not sent:
+                broadcast.publish(_form_stream_event(form.id, form.form_name, len(fields)))
+            for index, field in enumerate(fields):
+                if index not in sent:
+                    broadcast.publish(_sse_event("field", {"index": index, "field": field}))
+            broadcast.publish(_sse_event("done", {}))
+            raise
+        finally:
+            name_task.cancel()
+
+        # subscribers see "done" now; their responses end once the row is saved
+        broadcast.publish(_sse_event("done", {}))
+        return await _save_translation(
+            form.id, lang_code, translated_form_name, translated_fields, session_factory
         )
-        translated_fields = await translator.translate_form_fields(fields, lang)
+    finally:
+        # later requests wait on the flight for the saved row instead
+        form_streams.pop((form.id, lang_code), None)
+        broadcast.close()
 
-        # Cache the translation
-        new_translation = TranslatedForm(
-            form_id=latest_form.id,
-            language_code=lang,
-            translated_form_name=translated_form_name,
-            translated_fields=json.dumps(translated_fields),
+
+def _ignore_stream_error(flight: asyncio.Future):
+    """A failed form stream already sent its subscribers the English fallback."""
+    if not flight.cancelled():
+        flight.exception()
+
+
+# stream the most recent form, sending each field as soon as it is translated
+@app.get("/api/forms/latest/stream")
+async def stream_latest_form(
+    lang: str = "en",
+    session: AsyncSession = Depends(get_session),
+    session_factory=Depends(get_session_factory),
+    translator: Optional[TranslationService] = Depends(get_translator),
+):
+    """
+    Server-Sent Events version of /api/forms/latest.
+    Sends a "form" event (id, form_name, field_count), one "field" event per
+    field (index, field) in the order translations arrive, then "done".
+    Concurrent requests for an uncached language share one translation.
+    """
+    _check_language(lang)
+
+    statement = select(Form).order_by(Form.created_at.desc())
+    latest_form = (await session.exec(statement)).first()
+
+    if not latest_form:
+        raise HTTPException(status_code=404, detail="No forms found")
+
+    cached_translation = None
+    if lang != "en":
+        cache_statement = select(TranslatedForm).where(
+            TranslatedForm.form_id == latest_form.id,
+            TranslatedForm.language_code == lang,
         )
-        session.add(new_translation)
-        session.commit()
+        cached_translation = (await session.exec(cache_statement)).first()
+        record_cache_hit("translated_form", cached_translation is not None)
 
-        return {
-            "id": latest_form.id,
-            "form_name": translated_form_name,
-            "fields": translated_fields,
-        }
-    except Exception as e:
-        # If translation fails, return English version
-        return {
-            "id": latest_form.id,
-            "form_name": latest_form.form_name,
-            "fields": fields,
-        }
+    # English, cached or untranslatable: everything is ready now
+    async def ready_events(translation: Optional[TranslatedForm]):
+        form_name, fields = latest_form.form_name, json.loads(latest_form.fields)
+        if translation:
+            form_name = translation.translated_form_name
+            fields = json.loads(translation.translated_fields)
+        yield _form_stream_event(latest_form.id, form_name, len(fields))
+        for index, field in enumerate(fields):
+            yield _sse_event("field", {"index": index, "field": field})
+        yield _sse_event("done", {})
+
+    if lang == "en" or cached_translation or translator is None:
+        events = ready_events(cached_translation)
+    else:
+        # end the read so its pooled connection isn't held for the whole translation
+        await session.commit()
+        key = (latest_form.id, lang)
+        broadcast = form_streams.get(key)
+        if broadcast is None and not translation_flights.running(key):
+            broadcast = form_streams[key] = EventBroadcast()
+            flight = translation_flights.start(
+                key,
+                lambda: _stream_and_cache(
+                    latest_form, lang, translator, session_factory, broadcast
+                ),
+            )
+            flight.add_done_callback(_ignore_stream_error)
+
+        if broadcast is not None:
+            # first request starts the stream; the others join it (and catch up)
+            events = broadcast.subscribe()
+        else:
+            # a non-streaming translation is under way: wait for it, then send it
+            try:
+                translation = await translation_flights.do(
+                    key,
+                    lambda: _translate_and_cache(
+                        latest_form.id,
+                        latest_form.form_name,
+                        json.loads(latest_form.fields),
+                        lang,
+                        translator,
+                        session_factory,
+                    ),
+                )
+            except Exception:
+                translation = None  # English fallback (not cached, so it's retried)
+            events = ready_events(translation)
+
+    return StreamingResponse(
+        events,
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+def _parse_languages(langs: Optional[str]) -> list[str]:
+    """Parse a comma-separated list of language codes (all supported languages if None)."""
+    if langs is None:
+        return list(SUPPORTED_LANGUAGES)
+    codes = list(dict.fromkeys(code.strip() for code in langs.split(",") if code.strip()))
+    if not codes:
+        raise HTTPException(status_code=400, detail="No languages requested")
+    unsupported = [code for code in codes if code not in SUPPORTED_LANGUAGES]
+    if unsupported:
+        raise HTTPException(
+            status_code=400, detail=f"Unsupported language: {', '.join(unsupported)}"
+        )
+    return codes
+
+
+# get the most recent form in several languages at once
+@app.get("/api/forms/latest/bundle")
+async def get_latest_form_bundle(
+    langs: Optional[str] = None,
+    if_none_match: Optional[str] = Header(default=None),
+    session: AsyncSession = Depends(get_session),
+):
+    """
+    Return the latest form with every cached translation for the requested languages
+    (comma-separated, default: all supported), so the patient page can switch
+    languages without another request. Languages with no cached translation yet
+    are listed in "missing"; the page streams those from /api/forms/latest/stream.
+    """
+    lang_codes = _parse_languages(langs)
+
+    # one query: the latest form, joined to its cached translations (if any)
+    latest_form_id = (
+        select(Form.id).order_by(Form.created_at.desc()).limit(1).scalar_subquery()
+    )
+    statement = (
+        select(Form, TranslatedForm)
+        .outerjoin(
+            TranslatedForm,
+            and_(
+                TranslatedForm.form_id == Form.id,
+                TranslatedForm.language_code.in_(lang_codes),
+            ),
+        )
+        .where(Form.id == latest_form_id)
+    )
+    rows = (await session.exec(statement)).all()
+
+    if not rows:
+        raise HTTPException(status_code=404, detail="No forms found")
+
+    form = rows[0][0]
+    cached = {t.language_code: t for _, t in rows if t is not None}
+    translated_codes = [code for code in lang_codes if code != "en"]
+    record_cache_lookup(
+        "translated_form", len(cached), len(translated_codes) - len(cached)
+    )
+
+    # translation version per language (0 for English), as in _form_etag()
+    versions = {"en": 0} if "en" in lang_codes else {}
+    versions.update({code: t.id for code, t in cached.items()})
+    etag = _form_etag(
+        form.id,
+        ",".join(lang_codes),
+        ",".join(f"{code}={versions[code]}" for code in sorted(versions)),
+    )
+
+    def bundle_body() -> bytes:
+        # the stored fields JSON goes into the body as is
+        translations = {}
+        if "en" in lang_codes:
+            translations["en"] = RawJSON(
+                json_object({"form_name": form.form_name, "fields": RawJSON(form.fields)})
+            )
+        for code, translation in cached.items():
+            translations[code] = RawJSON(
+                json_object(
+                    {
+                        "form_name": translation.translated_form_name,
+                        "fields": RawJSON(translation.translated_fields),
+                    }
+                )
+            )
+        return json_object(
+            {
+                "id": form.id,
+                "translations": RawJSON(json_object(translations)),
+                "missing": [code for code in lang_codes if code not in versions],
+            }
+        )
+
+    return _cacheable_form_response(
+        bundle_body, etag, LATEST_FORM_CACHE_CONTROL, if_none_match
+    )
 
 
 # save a form submission
 @app.post("/api/submissions")
-async def save_submission(submission: dict, session: Session = Depends(get_session)):
-    submission_data = submission["submission_data"]
+async def save_submission(
+    submission: dict,
+    writer: SubmissionWriter = Depends(get_submission_writer),
+    job_workers: Optional[JobWorkers] = Depends(get_job_workers),
+):
     language = submission.get("language", "en")
 
-    # Translate responses to English if submitted in another language
-    if language != "en":
-        try:
-            translator = TranslationService()
-            submission_data = await translator.translate_responses_to_english(
-                submission_data, language
-            )
-        except Exception as e:
-            # If translation fails, log and store original data
-            print(f"Warning: Failed to translate submission responses: {e}")
-
+    # Store the answers as given; non-English ones are translated to English in the background
     db_submission = FormSubmission(
         form_id=submission["form_id"],
-        submission_data=json.dumps(submission_data),
+        submission_data=json.dumps(submission["submission_data"]),
+        language=language,
+        translation_status="complete" if language == "en" else "pending",
     )
-    session.add(db_submission)
-    session.commit()
+
+    # committed with other submissions arriving at the same moment, together with
+    # their back-translation jobs; returns once the batch has committed
+    await writer.add(db_submission)
+    if job_workers is not None and db_submission.translation_status == "pending":
+        job_workers.notify(BACK_TRANSLATE_SUBMISSION)
+
     return {"status": "success"}
 
 
-# get all form submissions
+# an NDJSON line that isn't valid JSON (reported as that item's error)
+_INVALID_JSON = object()
+
+
+async def _read_bulk_items(request: Request) -> list:
+    """
+    Read the submissions of a bulk upload: a JSON array, or NDJSON (one
+    submission per line) when sent as application/x-ndjson.
+    """
+    items = []
+
+    def add(item):
+        if len(items) >= SUBMISSIONS_BULK_MAX_ITEMS:
+            raise HTTPException(
+                status_code=413,
+                detail=f"At most {SUBMISSIONS_BULK_MAX_ITEMS} submissions per upload",
+            )
+        items.append(item)
+
+    def add_line(line: bytes):
+        if line.strip():
+            try:
+                add(json.loads(line))
+            except ValueError:
+                add(_INVALID_JSON)
+
+    if request.headers.get("content-type", "").startswith("application/x-ndjson"):
+        # parsed line by line as the body arrives
+        buffer = b""
+        async for chunk in request.stream():
+            *lines, buffer = (buffer + chunk).split(b"\n")
+            for line in lines:
+                add_line(line)
+        add_line(buffer)
+        return items
+
+    try:
+        body = json.loads(await request.body())
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Body must be a JSON array or NDJSON")
+    if not isinstance(body, list):
+        raise HTTPException(status_code=400, detail="Body must be a JSON array or NDJSON")
+    for item in body:
+        add(item)
+    return items
+
+
+def _bulk_item_error(item, form_ids: set[str]) -> Optional[str]:
+    """Why a bulk-uploaded submission can't be saved (None if it's valid)."""
+    if item is _INVALID_JSON:
+        return "Invalid JSON"
+    if not isinstance(item, dict):
+        return "Submission must be an object"
+    if not isinstance(item.get("form_id"), str):
+        return "form_id is required"
+    if not isinstance(item.get("submission_data"), dict):
+        return "submission_data must be an object"
+    language = item.get("language", "en")
+    if not isinstance(language, str) or language not in SUPPORTED_LANGUAGES:
+        return f"Unsupported language: {language}"
+    if "submitted_at" in item:
+        try:
+            datetime.fromisoformat(item["submitted_at"])
+        except (TypeError, ValueError):
+            return "submitted_at must be an ISO 8601 datetime"
+    if item["form_id"] not in form_ids:
+        return "Form not found"
+    return None
+
+
+# save a batch of submissions (kiosks and tablets uploading their offline queue)
+@app.post("/api/submissions/bulk")
+async def save_submissions_bulk(
+    request: Request,
+    session: AsyncSession = Depends(get_session),
+    job_workers: Optional[JobWorkers] = Depends(get_job_workers),
+):
+    """
+    Validate each submission and insert the valid ones in one transaction.
+    Non-English submissions are back-translated by grouped jobs (one
+    translation request per group of submissions in the same language).
+    Returns a result per item, in upload order.
+    """
+    items = await _read_bulk_items(request)
+
+    # the forms referred to, checked with one query
+    referenced = {
+        item["form_id"]
+        for item in items
+        if isinstance(item, dict) and isinstance(item.get("form_id"), str)
+    }
+    form_ids = set()
+    if referenced:
+        statement = select(Form.id).where(Form.id.in_(referenced))
+        form_ids = set((await session.exec(statement)).all())
+
+    results = []
+    rows = []
+    row_indices = []
+    now = datetime.now(UTC)
+    for index, item in enumerate(items):
+        error = _bulk_item_error(item, form_ids)
+        if error is not None:
+            results.append({"index": index, "status": "rejected", "detail": error})
+            continue
+        language = item.get("language", "en")
+        submitted_at = item.get("submitted_at")
+        rows.append(
+            {
+                "form_id": item["form_id"],
+                "submission_data": json.dumps(item["submission_data"]),
+                "submitted_at": (
+                    _as_stored_utc(datetime.fromisoformat(submitted_at))
+                    if submitted_at
+                    else now
+                ),
+                "language": language,
+                "translation_status": "complete" if language == "en" else "pending",
+            }
+        )
+        row_indices.append(index)
+        results.append(None)  # filled in with the new id below
+
+    if rows:
+        # one multi-row INSERT ... RETURNING. SQLite doesn't promise the order of
+        # RETURNING rows, but gives new rows increasing ids in insertion order, so
+        # the sorted ids line up with rows. (sort_by_parameter_order=True would
+        # fall back to a statement per row on SQLite.)
+        statement = insert(FormSubmission).returning(FormSubmission.id)
+        connection = await session.connection()
+        ids = sorted((await connection.execute(statement, rows)).scalars().all())
+
+        # back-translation jobs, grouped by language (committed with the rows)
+        pending = defaultdict(list)
+        for row, submission_id in zip(rows, ids):
+            if row["translation_status"] == "pending":
+                pending[row["language"]].append(submission_id)
+        job_count = 0
+        for submission_ids in pending.values():
+            for start in range(0, len(submission_ids), BACK_TRANSLATION_GROUP_MAX_SUBMISSIONS):
+                group = submission_ids[start : start + BACK_TRANSLATION_GROUP_MAX_SUBMISSIONS]
+                enqueue_job(session, BACK_TRANSLATE_SUBMISSIONS, {"submission_ids": group})
+                job_count += 1
+
+        await session.commit()
+        if job_workers is not None and job_count:
+            job_workers.notify(BACK_TRANSLATE_SUBMISSIONS, job_count)
+
+        for index, submission_id in zip(row_indices, ids):
+            results[index] = {"index": index, "status": "created", "id": submission_id}
+
+    return {
+        "created": len(rows),
+        "rejected": len(items) - len(rows),
+        "results": results,
+    }
+
+
+def _encode_cursor(submitted_at: datetime, submission_id: int) -> str:
+    """Encode a submissions page position as an opaque URL-safe string."""
+    raw = json.dumps([submitted_at.isoformat(), submission_id])
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def _decode_cursor(cursor: str) -> tuple[datetime, int]:
+    """Decode a cursor from _encode_cursor() (400 if it's malformed)."""
+    try:
+        submitted_at, submission_id = json.loads(base64.urlsafe_b64decode(cursor))
+        return datetime.fromisoformat(submitted_at), int(submission_id)
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def _as_stored_utc(value: datetime) -> datetime:
+    """Convert a datetime to naive UTC, the way SQLite stores submitted_at."""
+    if value.tzinfo is not None:
+        value = value.astimezone(UTC).replace(tzinfo=None)
+    return value
+
+
+def _select_submissions(
+    form_id: Optional[str],
+    submitted_after: Optional[datetime],
+    submitted_before: Optional[datetime],
+):
+    """Select submissions for a form and date range ([after, before)), if given."""
+    statement = select(FormSubmission)
+    if form_id is not None:
+        statement = statement.where(FormSubmission.form_id == form_id)
+    if submitted_after is not None:
+        statement = statement.where(
+            FormSubmission.submitted_at >= _as_stored_utc(submitted_after)
+        )
+    if submitted_before is not None:
+        statement = statement.where(
+            FormSubmission.submitted_at < _as_stored_utc(submitted_before)
+        )
+    return statement
+
+
+# get form submissions, newest first, one page at a time
 @app.get("/api/submissions")
-async def get_submissions(session: Session = Depends(get_session)):
-    statement = select(FormSubmission).order_by(FormSubmission.submitted_at.desc())
-    submissions = session.exec(statement).all()
+async def get_submissions(
+    form_id: Optional[str] = None,
+    submitted_after: Optional[datetime] = None,
+    submitted_before: Optional[datetime] = None,
+    cursor: Optional[str] = None,
+    limit: int = Query(
+        default=SUBMISSIONS_PAGE_SIZE, ge=1, le=SUBMISSIONS_MAX_PAGE_SIZE
+    ),
+    session: AsyncSession = Depends(get_session),
+):
+    """
+    List submissions newest first, optionally filtered by form and date range.
+    Pass the returned next_cursor back as `cursor` to get the next page
+    (keyset pagination on submitted_at, id: each page costs the same however deep it is).
+    """
+    statement = _select_submissions(form_id, submitted_after, submitted_before)
+    if cursor is not None:
+        cursor_submitted_at, cursor_id = _decode_cursor(cursor)
+        statement = statement.where(
+            or_(
+                FormSubmission.submitted_at < cursor_submitted_at,
+                and_(
+                    FormSubmission.submitted_at == cursor_submitted_at,
+                    FormSubmission.id < cursor_id,
+                ),
+            )
+        )
 
-    # for each submission, create a dictionary with the submission data
-    return [
-        {
-            "id": s.id,
-            "form_id": s.form_id,
-            "submission_data": json.loads(s.submission_data),
-            "submitted_at": s.submitted_at,
-        }
-        for s in submissions
-    ]
+    # fetch one extra row to know whether there's another page
+    statement = statement.order_by(
+        FormSubmission.submitted_at.desc(), FormSubmission.id.desc()
+    ).limit(limit + 1)
+    submissions = (await session.exec(statement)).all()
+    page = submissions[:limit]
+
+    next_cursor = None
+    if len(submissions) > limit:
+        next_cursor = _encode_cursor(page[-1].submitted_at, page[-1].id)
+
+    # for each submission, create a JSON object with the stored answers spliced in
+    submissions_json = json_array(
+        json_object(
+            {
+                "id": s.id,
+                "form_id": s.form_id,
+                "submission_data": RawJSON(s.submission_data),
+                "submitted_at": s.submitted_at,
+                "language": s.language,
+                "translation_status": s.translation_status,
+            }
+        )
+        for s in page
+    )
+    return _json_response(
+        json_object({"submissions": submissions_json, "next_cursor": next_cursor})
+    )
+
+
+# export form submissions as a download, streamed from the database
+@app.get("/api/submissions/export")
+async def export_submissions(
+    format: Literal["ndjson", "csv"] = "ndjson",
+    form_id: Optional[str] = None,
+    submitted_after: Optional[datetime] = None,
+    submitted_before: Optional[datetime] = None,
+    session_factory=Depends(get_session_factory),
+):
+    """
+    Export every matching submission (oldest first) as NDJSON or CSV.
+    Rows are streamed in batches as they're read, instead of building the
+    whole export in memory like /api/submissions does for one page.
+    """
+    statement = _select_submissions(
+        form_id, submitted_after, submitted_before
+    ).order_by(FormSubmission.submitted_at, FormSubmission.id)
+
+    if format == "csv":
+        chunks = export_csv(session_factory, statement)
+        media_type = "text/csv"
+    else:
+        chunks = export_ndjson(session_factory, statement)
+        media_type = "application/x-ndjson"
+
+    return StreamingResponse(
+        chunks,
+        media_type=media_type,
+        headers={
+            "Content-Disposition": f'attachment; filename="submissions.{format}"'
+        },
+    )
+
+
+# get translation job queue status
+@app.get("/api/jobs")
+async def get_job_status(session: AsyncSession = Depends(get_session)):
+    """
+    Summarize the translation job queue.
+    Returns job counts by kind and status, and when the oldest queued job was created.
+    """
+    statement = select(
+        TranslationJob.kind, TranslationJob.status, func.count()
+    ).group_by(TranslationJob.kind, TranslationJob.status)
+    counts = {}
+    for kind, status, count in (await session.exec(statement)).all():
+        counts.setdefault(kind, {})[status] = count
+
+    oldest_statement = select(func.min(TranslationJob.created_at)).where(
+        TranslationJob.status == "queued"
+    )
+    oldest_queued_at = (await session.exec(oldest_statement)).first()
+
+    return {"counts": counts, "oldest_queued_at": oldest_queued_at}
+
+
+# get one translation job
+@app.get("/api/jobs/{job_id}")
+async def get_job(job_id: int, session: AsyncSession = Depends(get_session)):
+    job = await session.get(TranslationJob, job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+
+    return {
+        "id": job.id,
+        "kind": job.kind,
+        "payload": json.loads(job.payload),
+        "status": job.status,
+        "attempts": job.attempts,
+        "max_attempts": job.max_attempts,
+        "run_after": job.run_after,
+        "last_error": job.last_error,
+        "created_at": job.created_at,
+        "updated_at": job.updated_at,
+    }
 
 
 # get a form
 @app.get("/api/forms/{form_id}")
-async def get_form(form_id: str, session: Session = Depends(get_session)):
+async def get_form(
+    form_id: str,
+    if_none_match: Optional[str] = Header(default=None),
+    session: AsyncSession = Depends(get_session),
+):
     # session.get() retrieves a record by primary key (id)
-    db_form = session.get(Form, form_id)
+    db_form = await session.get(Form, form_id)
     if not db_form:
         raise HTTPException(status_code=404, detail="Form not found")
 
-    # json.loads converts JSON string back to Python dict for the API response
-    return {"form_name": db_form.form_name, "fields": json.loads(db_form.fields)}
+    # the stored fields JSON string goes into the response body as is (only for a 200)
+    return _cacheable_form_response(
+        lambda: json_object(
+            {"form_name": db_form.form_name, "fields": RawJSON(db_form.fields)}
+        ),
+        _form_etag(db_form.id, "en", 0),
+        FORM_CACHE_CONTROL,
+        if_none_match,
+    )
 
 
 # login endpoint
 @app.post("/api/auth/login", response_model=LoginResponse)
-async def login(credentials: LoginRequest, session: Session = Depends(get_session)):
+async def login(credentials: LoginRequest, session: AsyncSession = Depends(get_session)):
     """
     Authenticate user with email and password.
     Returns user type (patient or admin) on successful login.
@@ -269,7 +1185,7 @@ async def login(credentials: LoginRequest, session: Session = Depends(get_sessio
 
     # Query database for user by email
     statement = select(User).where(User.email == email)
-    user = session.exec(statement).first()
+    user = (await session.exec(statement)).first()
 
     # Check if user exists
     if not user:
@@ -292,7 +1208,7 @@ async def login(credentials: LoginRequest, session: Session = Depends(get_sessio
 
 # get user information by email
 @app.get("/api/users/{email}")
-async def get_user_info(email: str, session: Session = Depends(get_session)):
+async def get_user_info(email: str, session: AsyncSession = Depends(get_session)):
     """
     Retrieve user information by email.
     Returns user details including patient-specific fields if applicable.
@@ -301,7 +1217,7 @@ async def get_user_info(email: str, session: Session = Depends(get_session)):
 
     # Query database for user by email
     statement = select(User).where(User.email == email)
-    user = session.exec(statement).first()
+    user = (await session.exec(statement)).first()
 
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
@@ -324,6 +1240,32 @@ async def get_user_info(email: str, session: Session = Depends(get_session)):
     return user_data
 
 
+# Prometheus scrape endpoint
+@app.get("/metrics")
+async def metrics():
+    return Response(registry.render(), media_type="text/plain; version=0.0.4")
+
+
+# download a stored request profile (collapsed stacks, for flamegraph tools)
+@app.get("/api/profiles/{profile_id}")
+async def get_profile(
+    profile_id: str, x_profile: Optional[str] = Header(default=None)
+):
+    """
+    Return a profile recorded by the profiling middleware.
+    Admin only: the request must send the profiling token in X-Profile.
+    """
+    if not PROFILING_TOKEN or not secrets.compare_digest(
+        (x_profile or "").encode(), PROFILING_TOKEN.encode()
+    ):
+        raise HTTPException(status_code=403, detail="Profiling token required")
+
+    path = profile_store.path(profile_id)
+    if path is None:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    return Response(await asyncio.to_thread(path.read_bytes), media_type="text/plain")
+
+
 # test endpoint
 @app.get("/api/test")
 async def test_endpoint():
@@ -332,9 +1274,9 @@ async def test_endpoint():
 
 # debug endpoint
 @app.get("/api/forms")
-async def debug_forms(session: Session = Depends(get_session)):
+async def debug_forms(session: AsyncSession = Depends(get_session)):
     statement = select(Form)
-    forms = session.exec(statement).all()
+    forms = (await session.exec(statement)).all()
     return [
         {
             "id": f.id,
@@ -1,5 +1,5 @@
 from typing import Optional
-from sqlmodel import Field, SQLModel
+from sqlmodel import Field, SQLModel, UniqueConstraint, Index
 from datetime import datetime, UTC
 from pydantic import BaseModel
 
@@ -10,16 +10,30 @@ class Form(SQLModel, table=True):
     id: str = Field(default=None, primary_key=True)
     form_name: str
     fields: str  # Store fields as a JSON string
-    created_at: datetime = Field(default_factory=lambda: datetime.now(UTC))
+    created_at: datetime = Field(
+        default_factory=lambda: datetime.now(UTC), index=True
+    )  # indexed for "latest form" lookups
 
 
 class FormSubmission(SQLModel, table=True):
     """Represents a user's form submission."""
 
+    # for listing one form's submissions newest first (keyset pagination)
+    __table_args__ = (
+        Index("ix_formsubmission_form_id_submitted_at", "form_id", "submitted_at"),
+    )
+
     id: int = Field(default=None, primary_key=True)
     form_id: str
     submission_data: str  # Store submission data as a JSON string
-    submitted_at: datetime = Field(default_factory=lambda: datetime.now(UTC))
+    submitted_at: datetime = Field(
+        default_factory=lambda: datetime.now(UTC), index=True
+    )
+
+    # Language the patient answered in; non-English answers are translated later
+    language: str = Field(default="en")
+    # "pending" until translated to English, then "complete" (or "failed")
+    translation_status: str = Field(default="complete", index=True)
 
 
 class User(SQLModel, table=True):
@@ -55,7 +69,9 @@ class LoginRequest(BaseModel):
 
 
 class TranslatedForm(SQLModel, table=True):
-    """Cached translations of forms."""
+    """Cached translations of forms (at most one per form and language)."""
+
+    __table_args__ = (UniqueConstraint("form_id", "language_code"),)
 
     id: int = Field(default=None, primary_key=True)
     form_id: str = Field(index=True)
@@ -65,6 +81,44 @@ class TranslatedForm(SQLModel, table=True):
     created_at: datetime = Field(default_factory=lambda: datetime.now(UTC))
 
 
+class TranslationMemory(SQLModel, table=True):
+    """
+    Translations of individual text segments (labels, placeholders, options).
+    Shared across forms so repeated strings like "Date of Birth" are translated once.
+    """
+
+    __table_args__ = (UniqueConstraint("source_hash", "language_code"),)
+
+    id: int = Field(default=None, primary_key=True)
+    source_hash: str  # SHA-256 of source_text
+    language_code: str
+    source_text: str
+    translated_text: str
+    created_at: datetime = Field(default_factory=lambda: datetime.now(UTC))
+
+
+class TranslationJob(SQLModel, table=True):
+    """
+    Durable background translation work (form pre-caching, submission back-translation).
+    Workers claim a job by leasing it; a job whose lease expires is picked up again.
+    """
+
+    id: int = Field(default=None, primary_key=True)
+    kind: str  # e.g. "precache_form", "back_translate_submission"
+    payload: str  # Store job arguments as a JSON string
+    status: str = Field(default="queued", index=True)  # queued, running, done, failed
+    attempts: int = Field(default=0)
+    max_attempts: int
+    run_after: datetime = Field(
+        default_factory=lambda: datetime.now(UTC), index=True
+    )  # not claimed before this time (retry backoff)
+    lease_owner: Optional[str] = Field(default=None)
+    lease_expires_at: Optional[datetime] = Field(default=None)
+    last_error: Optional[str] = Field(default=None)
+    created_at: datetime = Field(default_factory=lambda: datetime.now(UTC))
+    updated_at: datetime = Field(default_factory=lambda: datetime.now(UTC))
+
+
 class LoginResponse(BaseModel):
     """Response model for successful login."""
 
@@ -0,0 +1,137 @@
+import json
+from collections import defaultdict
+from sqlmodel import select
+from models import Form, FormSubmission, TranslatedForm
+from services.translation_service import TranslationService
+from services.response_prefilter import build_option_lookup, split_responses
+
+
+async def _load_form_fields(session, form_id: str, language: str) -> tuple[list, dict]:
+    """The form's fields and the reverse option lookup for one language."""
+    form = await session.get(Form, form_id)
+    if form is None:
+        return [], {}
+    fields = json.loads(form.fields)
+
+    statement = select(TranslatedForm).where(
+        TranslatedForm.form_id == form_id, TranslatedForm.language_code == language
+    )
+    translated_form = (await session.exec(statement)).first()
+    translated_fields = (
+        json.loads(translated_form.translated_fields) if translated_form else None
+    )
+    return fields, build_option_lookup(fields, translated_fields)
+
+
+async def back_translate_submission(
+    submission_id: int,
+    translator: TranslationService,
+    session_factory,
+    last_attempt: bool,
+):
+    """
+    Translate one pending submission to English and mark it complete.
+    Runs as a "back_translate_submission" job. On failure the error is re-raised
+    so the job is retried; after the last attempt the submission is marked
+    "failed" and keeps the patient's original answers.
+    """
+    async with session_factory() as session:
+        submission = await session.get(FormSubmission, submission_id)
+        if submission is None or submission.translation_status != "pending":
+            return
+        fields, option_lookup = await _load_form_fields(
+            session, submission.form_id, submission.language
+        )
+        # hand the connection back to the pool while waiting for the translation
+        await session.commit()
+
+        # option answers, dates, numbers etc. are resolved here; only free text is sent
+        resolved, to_translate = split_responses(
+            json.loads(submission.submission_data), fields, option_lookup
+        )
+        try:
+            translated_data = resolved
+            if to_translate:
+                translated_data = {
+                    **resolved,
+                    **await translator.translate_responses_to_english(
+                        to_translate, submission.language
+                    ),
+                }
+        except Exception:
+            if last_attempt:
+                submission.translation_status = "failed"
+                session.add(submission)
+                await session.commit()
+            raise
+
+        submission.submission_data = json.dumps(translated_data)
+        submission.translation_status = "complete"
+        session.add(submission)
+        await session.commit()
+
+
+async def back_translate_submissions(
+    submission_ids: list[int],
+    translator: TranslationService,
+    session_factory,
+    last_attempt: bool,
+):
+    """
+    Translate a group of pending submissions to English with one request per language.
+    Runs as a "back_translate_submissions" job (queued by bulk uploads).
+    Submissions that were translated are marked complete even if others in the
+    group failed; the job is then retried for the rest, and after the last
+    attempt those are marked "failed" and keep the patient's original answers.
+    """
+    async with session_factory() as session:
+        statement = select(FormSubmission).where(
+            FormSubmission.id.in_(submission_ids),
+            FormSubmission.translation_status == "pending",
+        )
+        submissions = (await session.exec(statement)).all()
+
+        # option answers, dates, numbers etc. are resolved here; only free text is sent
+        forms = {}
+        resolved, to_translate = {}, {}
+        for submission in submissions:
+            form_key = (submission.form_id, submission.language)
+            if form_key not in forms:
+                forms[form_key] = await _load_form_fields(session, *form_key)
+            resolved[submission.id], to_translate[submission.id] = split_responses(
+                json.loads(submission.submission_data), *forms[form_key]
+            )
+        # hand the connection back to the pool while waiting for the translations
+        await session.commit()
+
+        by_language = defaultdict(list)
+        for submission in submissions:
+            by_language[submission.language].append(submission)
+
+        error = None
+        for language, group in by_language.items():
+            try:
+                translated = await translator.translate_submissions_to_english(
+                    {str(s.id): to_translate[s.id] for s in group}, language
+                )
+            except Exception as e:
+                error, translated = e, {}
+
+            for submission in group:
+                translated_data = translated.get(str(submission.id))
+                if translated_data is not None:
+                    translated_data = {**resolved[submission.id], **translated_data}
+                    submission.submission_data = json.dumps(translated_data)
+                    submission.translation_status = "complete"
+                    session.add(submission)
+                    continue
+
+                if error is None:
+                    error = ValueError(f"Submission {submission.id} missing from translation")
+                if last_attempt:
+                    submission.translation_status = "failed"
+                    session.add(submission)
+
+        await session.commit()
+        if error is not None:
+            raise error
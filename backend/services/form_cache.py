@@ -0,0 +1,49 @@
+import time
+from typing import Optional
+
+
+class LatestFormCache:
+    """
+    In-memory cache of the serialized /api/forms/latest response (and its ETag),
+    per language. Entries expire after ttl_seconds and are all dropped by invalidate().
+    """
+
+    def __init__(self, ttl_seconds: float):
+        self._ttl_seconds = ttl_seconds
+        self._entries: dict[str, tuple[bytes, str, float]] = {}
+        # bumped by invalidate(), so responses built from older data aren't stored
+        self.generation = 0
+
+    def get(self, language_code: str) -> Optional[tuple[bytes, str]]:
+        """Return the cached (body, etag), or None if missing or expired."""
+        entry = self._entries.get(language_code)
+        if entry is None:
+            return None
+        body, etag, expires_at = entry
+        if time.monotonic() >= expires_at:
+            self._entries.pop(language_code, None)
+            return None
+        return body, etag
+
+    def set(self, language_code: str, body: bytes, etag: str, generation: int):
+        """
+        Cache a response body.
+
+        Args:
+            language_code: Language the body was rendered in
+            body: Serialized JSON response
+            etag: ETag header sent with the body
+            generation: Value of self.generation when the request started reading
+        """
+        if generation != self.generation:
+            return
+        self._entries[language_code] = (
+            body,
+            etag,
+            time.monotonic() + self._ttl_seconds,
+        )
+
+    def invalidate(self):
+        """Drop every cached language (called when a new form is created)."""
+        self.generation += 1
+        self._entries.clear()
@@ -0,0 +1,236 @@
+import asyncio
+import json
+import os
+import socket
+import uuid
+from collections import deque
+from datetime import datetime, timedelta, UTC
+from typing import Awaitable, Callable, Optional
+from sqlalchemy import and_, or_, update
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+from models import TranslationJob
+from config.constants import (
+    JOB_MAX_ATTEMPTS,
+    JOB_RETRY_BASE_SECONDS,
+    JOB_LEASE_SECONDS,
+    JOB_POLL_INTERVAL_SECONDS,
+)
+
+# Job kinds
+PRECACHE_FORM = "precache_form"
+BACK_TRANSLATE_SUBMISSION = "back_translate_submission"
+BACK_TRANSLATE_SUBMISSIONS = "back_translate_submissions"
+
+# A handler gets the job's payload and whether this is its last attempt
+JobHandler = Callable[[dict, bool], Awaitable[None]]
+
+
+def enqueue_job(session: AsyncSession, kind: str, payload: dict) -> TranslationJob:
+    """
+    Add a job to the session (saved when the caller commits).
+    Committing it together with the row it refers to means neither is lost.
+    """
+    job = TranslationJob(kind=kind, payload=json.dumps(payload), max_attempts=JOB_MAX_ATTEMPTS)
+    session.add(job)
+    return job
+
+
+class JobWorkers:
+    """
+    Pool of asyncio workers that run TranslationJob rows.
+    Jobs are claimed with a lease (one atomic UPDATE ... RETURNING), so several
+    uvicorn processes can share the table without running a job twice.
+    notify() wakes one idle worker per new job instead of all of them, so each
+    job costs one claim (and one write transaction), not one per worker.
+    Failed jobs are retried with exponential backoff.
+    kind_workers adds workers that only run one kind of job, so jobs that
+    spend their time waiting (e.g. back-translations waiting to be batched)
+    don't hold up the others.
+    """
+
+    def __init__(
+        self,
+        session_factory,
+        handlers: dict[str, JobHandler],
+        worker_count: int,
+        kind_workers: Optional[dict[str, int]] = None,
+    ):
+        self._session_factory = session_factory
+        self._handlers = handlers
+        self._worker_count = worker_count
+        self._kind_workers = kind_workers or {}
+        self._owner = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        # idle workers waiting to be woken, by the kind they run (None: any kind)
+        self._idle: dict[Optional[str], deque[asyncio.Future]] = {}
+        self._workers: list[asyncio.Task] = []
+
+    def _worker_kinds(self) -> list[Optional[str]]:
+        """The kind each worker runs (None: any kind)."""
+        kinds = [None] * self._worker_count
+        for kind, count in self._kind_workers.items():
+            kinds += [kind] * count
+        return kinds
+
+    async def start(self):
+        """Start the workers."""
+        self._workers = [
+            asyncio.create_task(self._work(kind)) for kind in self._worker_kinds()
+        ]
+
+    async def stop(self):
+        """Stop the workers (a job they were running is retried once its lease expires)."""
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+
+    def notify(self, kind: Optional[str] = None, count: int = 1):
+        """
+        Wake idle workers for newly committed jobs (call after the commit).
+
+        Args:
+            kind: Kind of the new jobs; wakes that kind's dedicated workers if
+                it has any, else the shared ones
+            count: Number of new jobs (at most one worker is woken per job)
+        """
+        idle = self._idle.get(kind if kind in self._kind_workers else None)
+        while idle and count > 0:
+            waiter = idle.popleft()
+            if not waiter.done():  # may have timed out in the meantime
+                waiter.set_result(None)
+                count -= 1
+
+    async def run_until_idle(self):
+        """Run jobs until none are ready (jobs waiting on retry backoff are left)."""
+
+        async def drain(kind):
+            while (job := await self._claim(kind)) is not None:
+                await self._run(job)
+
+        await asyncio.gather(*(drain(kind) for kind in self._worker_kinds()))
+
+    async def _work(self, kind: Optional[str] = None):
+        while True:
+            job = await self._claim(kind)
+            if job is None:
+                await self._wait_for_jobs(kind)
+                continue
+            await self._run(job)
+
+    async def _wait_for_jobs(self, kind: Optional[str]):
+        """Sleep until notify() picks this worker, or the poll interval passes."""
+        waiter = asyncio.get_running_loop().create_future()
+        idle = self._idle.setdefault(kind, deque())
+        idle.append(waiter)
+        try:
+            await asyncio.wait_for(waiter, JOB_POLL_INTERVAL_SECONDS)
+        except asyncio.TimeoutError:
+            pass
+        finally:
+            if waiter in idle:
+                idle.remove(waiter)
+
+    def _claimable(self, now: datetime):
+        """Condition for jobs that are ready, or whose worker's lease has expired."""
+        return or_(
+            and_(TranslationJob.status == "queued", TranslationJob.run_after <= now),
+            and_(
+                TranslationJob.status == "running",
+                TranslationJob.lease_expires_at < now,
+            ),
+        )
+
+    async def _claim(self, kind: Optional[str] = None) -> Optional[TranslationJob]:
+        """Lease the next ready job (of one kind, if given), or return None if there isn't one."""
+        now = datetime.now(UTC)
+        claimable = self._claimable(now)
+        if kind is not None:
+            claimable = and_(claimable, TranslationJob.kind == kind)
+        next_job = (
+            select(TranslationJob.id)
+            .where(claimable)
+            .order_by(TranslationJob.run_after)
+            .limit(1)
+        )
+
+        async with self._session_factory() as session:
+            # read first, so an idle poll doesn't take SQLite's write lock
+            if (await session.exec(next_job)).first() is None:
+                return None
+
+            # pick and lease in one statement: the subquery runs inside the
+            # UPDATE's write lock, so a job another worker took in between is
+            # no longer claimable and the next one is leased instead
+            statement = (
+                update(TranslationJob)
+                .where(TranslationJob.id == next_job.scalar_subquery())
+                .values(
+                    status="running",
+                    attempts=TranslationJob.attempts + 1,
+                    lease_owner=self._owner,
+                    lease_expires_at=now + timedelta(seconds=JOB_LEASE_SECONDS),
+                    updated_at=now,
+                )
+                .returning(TranslationJob)
+            )
+            job = (await session.exec(statement)).scalars().first()
+            await session.commit()
+        return job
+
+    async def _run(self, job: TranslationJob):
+        handler = self._handlers[job.kind]
+        lease = asyncio.create_task(self._keep_lease(job.id))
+        try:
+            await handler(json.loads(job.payload), job.attempts >= job.max_attempts)
+        except Exception as e:
+            print(f"Warning: Job {job.id} ({job.kind}) failed: {e}")
+            await self._finish(job, error=e)
+        else:
+            await self._finish(job)
+        finally:
+            lease.cancel()
+
+    async def _keep_lease(self, job_id: int):
+        """Renew a running job's lease so long translations aren't taken over."""
+        while True:
+            await asyncio.sleep(JOB_LEASE_SECONDS / 3)
+            now = datetime.now(UTC)
+            async with self._session_factory() as session:
+                await session.exec(
+                    update(TranslationJob)
+                    .where(
+                        TranslationJob.id == job_id,
+                        TranslationJob.lease_owner == self._owner,
+                    )
+                    .values(lease_expires_at=now + timedelta(seconds=JOB_LEASE_SECONDS))
+                )
+                await session.commit()
+
+    async def _finish(self, job: TranslationJob, error: Optional[Exception] = None):
+        """Mark a job done, or schedule its retry (failed once out of attempts)."""
+        now = datetime.now(UTC)
+        values = {"lease_owner": None, "lease_expires_at": None, "updated_at": now}
+        if error is None:
+            values["status"] = "done"
+        elif job.attempts >= job.max_attempts:
+            values.update(status="failed", last_error=str(error))
+        else:
+            backoff = JOB_RETRY_BASE_SECONDS * 2 ** (job.attempts - 1)
+            values.update(
+                status="queued",
+                last_error=str(error),
+                run_after=now + timedelta(seconds=backoff),
+            )
+
+        async with self._session_factory() as session:
+            # only if we still hold the lease (it may have expired and moved on)
+            await session.exec(
+                update(TranslationJob)
+                .where(
+                    TranslationJob.id == job.id,
+                    TranslationJob.lease_owner == self._owner,
+                )
+                .values(**values)
+            )
+            await session.commit()
@@ -0,0 +1,44 @@
+"""
+Fast JSON response bodies.
+JSON text already stored in the database (form fields, translated fields,
+submission answers) is spliced into the body as is instead of being parsed
+and encoded again; only the small envelope around it is encoded, with orjson.
+"""
+
+from typing import Iterable, Union
+import orjson
+
+
+class RawJSON:
+    """JSON text that is already encoded, spliced into a body without parsing it."""
+
+    __slots__ = ("encoded",)
+
+    def __init__(self, text: Union[str, bytes]):
+        self.encoded = text.encode("utf-8") if isinstance(text, str) else text
+
+
+def _encode(value) -> bytes:
+    if isinstance(value, RawJSON):
+        return value.encoded
+    return orjson.dumps(value)
+
+
+def json_object(members: dict) -> bytes:
+    """
+    Encode a JSON object, splicing in any RawJSON values as they are.
+
+    Args:
+        members: Keys (strings) and values (RawJSON, or anything orjson can encode)
+
+    Returns:
+        UTF-8 JSON bytes
+    """
+    return b"{" + b",".join(
+        orjson.dumps(key) + b":" + _encode(value) for key, value in members.items()
+    ) + b"}"
+
+
+def json_array(items: Iterable[bytes]) -> RawJSON:
+    """Join already-encoded JSON values (e.g. from json_object()) into an array."""
+    return RawJSON(b"[" + b",".join(items) + b"]")
@@ -0,0 +1,249 @@
+"""
+Prometheus-format metrics.
+A small in-process registry of counters and histograms (rendered by the
+/metrics endpoint), the ASGI middleware that times each route, and the
+engine hooks that time each SQL statement. Recording a value is a dict
+lookup and an addition, so it's cheap enough for every request and query.
+"""
+
+import time
+from bisect import bisect_left
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+# Histogram buckets (seconds) for request, SQL and translation latency
+LATENCY_BUCKETS = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1,
+    0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0,
+)
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(names: tuple[str, ...], values: tuple, extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_number(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(value)
+
+
+class Counter:
+    """A value that only goes up, per combination of label values."""
+
+    def __init__(self, name: str, help_text: str, labelnames: tuple[str, ...] = ()):
+        self.name = name
+        self.help_text = help_text
+        self.labelnames = labelnames
+        self._values: dict[tuple, float] = {}
+
+    def inc(self, amount: float = 1, **labels):
+        key = tuple(labels[name] for name in self.labelnames)
+        self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels) -> float:
+        return self._values.get(tuple(labels[name] for name in self.labelnames), 0)
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} counter"]
+        for key, value in sorted(self._values.items()):
+            lines.append(
+                f"{self.name}{_format_labels(self.labelnames, key)} {_format_number(value)}"
+            )
+        return lines
+
+    def clear(self):
+        self._values.clear()
+
+
+class Histogram:
+    """Counts of observed values per bucket, plus their sum, per combination of label values."""
+
+    def __init__(
+        self,
+        name: str,
+        help_text: str,
+        labelnames: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = LATENCY_BUCKETS,
+    ):
+        self.name = name
+        self.help_text = help_text
+        self.labelnames = labelnames
+        self.buckets = buckets
+        # label values -> [count per bucket (+Inf last), sum]
+        self._series: dict[tuple, list] = {}
+
+    def observe(self, value: float, **labels):
+        key = tuple(labels[name] for name in self.labelnames)
+        series = self._series.get(key)
+        if series is None:
+            series = self._series[key] = [[0] * (len(self.buckets) + 1), 0.0]
+        series[0][bisect_left(self.buckets, value)] += 1
+        series[1] += value
+
+    def count(self, **labels) -> int:
+        series = self._series.get(tuple(labels[name] for name in self.labelnames))
+        return sum(series[0]) if series else 0
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        for key, (bucket_counts, total) in sorted(self._series.items()):
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (float("inf"),), bucket_counts):
+                cumulative += bucket_count
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                labels = _format_labels(self.labelnames, key, f'le="{le}"')
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{labels} {repr(total)}")
+            lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+    def clear(self):
+        self._series.clear()
+
+
+class MetricsRegistry:
+    """Every metric the app exposes, rendered in the Prometheus text format."""
+
+    def __init__(self):
+        self._metrics: list = []
+
+    def counter(self, name: str, help_text: str, labelnames: tuple[str, ...] = ()) -> Counter:
+        metric = Counter(name, help_text, labelnames)
+        self._metrics.append(metric)
+        return metric
+
+    def histogram(self, name: str, help_text: str, labelnames: tuple[str, ...] = ()) -> Histogram:
+        metric = Histogram(name, help_text, labelnames)
+        self._metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        lines = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+    def clear(self):
+        """Reset every metric (for tests)."""
+        for metric in self._metrics:
+            metric.clear()
+
+
+registry = MetricsRegistry()
+
+HTTP_REQUEST_DURATION = registry.histogram(
+    "http_request_duration_seconds",
+    "Time to handle a request, by route template and status",
+    ("method", "route", "status"),
+)
+DB_QUERY_DURATION = registry.histogram(
+    "db_query_duration_seconds",
+    "Time to run a SQL statement, by statement type (each observation is one query)",
+    ("operation",),
+)
+TRANSLATION_REQUESTS = registry.counter(
+    "translation_requests_total",
+    "Calls to the translation backend, by operation and outcome",
+    ("operation", "outcome"),
+)
+TRANSLATION_DURATION = registry.histogram(
+    "translation_request_duration_seconds",
+    "Time for one call to the translation backend, by operation",
+    ("operation",),
+)
+TRANSLATION_TOKENS = registry.counter(
+    "translation_tokens_total",
+    "Tokens used by the translation model, by kind (prompt or completion)",
+    ("kind",),
+)
+CACHE_LOOKUPS = registry.counter(
+    "translation_cache_lookups_total",
+    "Translation cache lookups, by cache (latest_form, translated_form, memory) and result",
+    ("cache", "result"),
+)
+
+
+def record_cache_lookup(cache: str, hits: int, misses: int):
+    """Count hits and misses of one of the translation caches."""
+    if hits:
+        CACHE_LOOKUPS.inc(hits, cache=cache, result="hit")
+    if misses:
+        CACHE_LOOKUPS.inc(misses, cache=cache, result="miss")
+
+
+def record_cache_hit(cache: str, hit: bool):
+    """Count a single lookup of one of the translation caches as a hit or a miss."""
+    CACHE_LOOKUPS.inc(1, cache=cache, result="hit" if hit else "miss")
+
+
+def record_token_usage(usage) -> None:
+    """Count the tokens in an OpenAI usage object (None when the reply has none)."""
+    if usage is None:
+        return
+    TRANSLATION_TOKENS.inc(usage.prompt_tokens or 0, kind="prompt")
+    TRANSLATION_TOKENS.inc(usage.completion_tokens or 0, kind="completion")
+
+
+class MetricsMiddleware:
+    """
+    ASGI middleware recording each request's latency under its route template
+    (e.g. /api/forms/{form_id}), so ids don't create a series per request.
+    Streamed responses are timed until their last chunk is sent.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        status = 500
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            route = scope.get("route")
+            HTTP_REQUEST_DURATION.observe(
+                time.perf_counter() - start,
+                method=scope["method"],
+                route=route.path if route is not None else "unmatched",
+                status=status,
+            )
+
+
+def instrument_engine(engine: AsyncEngine):
+    """Time every SQL statement the engine runs (count and duration by statement type)."""
+
+    @event.listens_for(engine.sync_engine, "before_cursor_execute")
+    def _start_query(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+    @event.listens_for(engine.sync_engine, "after_cursor_execute")
+    def _end_query(conn, cursor, statement, parameters, context, executemany):
+        started = conn.info["query_start"].pop()
+        words = statement.split(None, 1)
+        operation = words[0].upper() if words else "OTHER"
+        DB_QUERY_DURATION.observe(time.perf_counter() - started, operation=operation)
+
+    # a failed statement never reaches after_cursor_execute
+    @event.listens_for(engine.sync_engine, "handle_error")
+    def _fail_query(exception_context):
+        conn = exception_context.connection
+        if conn is not None and conn.info.get("query_start"):
+            conn.info["query_start"].pop()
@@ -0,0 +1,110 @@
+"""
+Micro-batching for work that is cheaper done together than one item at a time.
+Callers hand in one item each and wait for their own result, while the items
+that arrive within a short window are processed as one batch (one commit, one
+translation request). Used by SubmissionWriter and ResponseBatcher, so both
+close, time out and fail batches the same way.
+"""
+
+import asyncio
+import contextlib
+from typing import Any, Awaitable, Callable, Hashable, Optional
+
+# Processes one batch: (group, items) -> one result per item, in the same order
+ProcessBatch = Callable[[Hashable, list], Awaitable[list]]
+
+
+class _Batch:
+    """Items waiting to be processed together, and their callers' futures."""
+
+    def __init__(self):
+        self.items: list = []
+        self.futures: list[asyncio.Future] = []
+        self.full = asyncio.Event()
+
+
+class MicroBatcher:
+    """
+    Gathers items into batches, one open batch per group (e.g. per language).
+    The first item of a batch starts a timer; the batch is processed when the
+    timer ends or it holds max_items, whichever comes first, so no caller waits
+    more than max_wait_seconds before its batch starts. Each caller gets its
+    own item's result, or the batch's error if processing failed.
+    With serial=True batches are processed one at a time, and a batch keeps
+    filling (up to max_items) while it waits for the one before it.
+    """
+
+    def __init__(
+        self,
+        process: ProcessBatch,
+        max_items: int,
+        max_wait_seconds: float,
+        serial: bool = False,
+    ):
+        self._process = process
+        self._max_items = max_items
+        self._max_wait_seconds = max_wait_seconds
+        self._batches: dict[Hashable, _Batch] = {}
+        self._flushers: set[asyncio.Task] = set()
+        self._lock = asyncio.Lock() if serial else contextlib.nullcontext()
+
+    async def submit(self, item: Any, group: Optional[Hashable] = None) -> Any:
+        """
+        Add an item to its group's open batch (starting one if needed).
+
+        Args:
+            item: The item to process
+            group: Only items of the same group are batched together
+
+        Returns:
+            The item's result, once its batch has been processed (raises the
+            batch's error if processing failed)
+        """
+        batch = self._batches.get(group)
+        if batch is None:
+            batch = self._batches[group] = _Batch()
+            flusher = asyncio.create_task(self._flush(batch, group))
+            self._flushers.add(flusher)
+            flusher.add_done_callback(self._flushers.discard)
+
+        future = asyncio.get_running_loop().create_future()
+        batch.items.append(item)
+        batch.futures.append(future)
+        if len(batch.items) >= self._max_items:
+            # full: later callers start a new batch
+            self._close(batch, group)
+            batch.full.set()
+        return await future
+
+    async def aclose(self):
+        """Process the batches still waiting now, and wait until all are done."""
+        for batch in self._batches.values():
+            batch.full.set()
+        await asyncio.gather(*self._flushers, return_exceptions=True)
+
+    def _close(self, batch: _Batch, group: Optional[Hashable]):
+        if self._batches.get(group) is batch:
+            del self._batches[group]
+
+    async def _flush(self, batch: _Batch, group: Optional[Hashable]):
+        try:
+            await asyncio.wait_for(batch.full.wait(), self._max_wait_seconds)
+        except asyncio.TimeoutError:
+            pass
+
+        async with self._lock:
+            # close the batch (it may have kept filling while the lock was held)
+            self._close(batch, group)
+            try:
+                results = await self._process(group, batch.items)
+                if len(results) != len(batch.items):
+                    raise ValueError("Batch returned a different number of results")
+            except Exception as e:
+                for future in batch.futures:
+                    if not future.done():
+                        future.set_exception(e)
+                return
+
+        for future, result in zip(batch.futures, results):
+            if not future.done():  # the caller may have gone away
+                future.set_result(result)
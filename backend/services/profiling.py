@@ -0,0 +1,206 @@
+"""
+Opt-in per-request profiling.
+A profiled request is sampled by a background thread every few milliseconds:
+each sample is the request task's stack, including the coroutines it is
+suspended in (so time awaiting SQL or translation shows up under the await
+that waited, not just time on the CPU). The samples are written out as
+collapsed stacks ("folded" format, one "frame;frame;frame count" line per
+distinct stack), which flamegraph.pl, speedscope and inferno read directly.
+
+Requests are profiled when they send the admin profiling token in the
+X-Profile header, or at random at the configured sample rate. With neither
+configured the middleware isn't installed, so unprofiled apps pay nothing.
+"""
+
+import asyncio
+import os
+import random
+import secrets
+import sys
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Optional
+from config.constants import (
+    PROFILING_TOKEN,
+    PROFILING_SAMPLE_RATE,
+    PROFILING_INTERVAL_SECONDS,
+    PROFILE_DIR,
+    PROFILE_MAX_FILES,
+)
+
+PROFILE_HEADER = b"x-profile"
+
+
+def profiling_enabled() -> bool:
+    """Whether profiling is configured at all (admin token or a sample rate)."""
+    return bool(PROFILING_TOKEN) or PROFILING_SAMPLE_RATE > 0
+
+
+def _frame_name(frame) -> str:
+    code = frame.f_code
+    return f"{code.co_qualname} ({os.path.basename(code.co_filename)}:{frame.f_lineno})"
+
+
+def _awaited(coro):
+    """What a coroutine, generator or async generator is suspended on (None if nothing)."""
+    for attribute in ("cr_await", "gi_yieldfrom", "ag_await"):
+        awaited = getattr(coro, attribute, None)
+        if awaited is not None:
+            return awaited
+    return None
+
+
+def _coroutine_frame(coro):
+    for attribute in ("cr_frame", "gi_frame", "ag_frame"):
+        frame = getattr(coro, attribute, None)
+        if frame is not None:
+            return frame
+    return None
+
+
+class StackSampler:
+    """
+    Samples one asyncio task's stack from a background thread.
+    The coroutine chain gives the stack whether the task is running or
+    suspended; while it runs, the event loop thread's frames above the
+    innermost coroutine are added (plain function calls and C extensions
+    made from it).
+    """
+
+    def __init__(self, task: asyncio.Task, interval: float = PROFILING_INTERVAL_SECONDS):
+        self.task = task
+        self.interval = interval
+        self.stacks: Counter = Counter()
+        self._loop_thread_id = threading.get_ident()
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="profiler", daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stopped.set()
+        self._thread.join()
+
+    def _run(self):
+        while not self._stopped.wait(self.interval):
+            stack = self.sample()
+            if stack:
+                self.stacks[stack] += 1
+
+    def sample(self) -> tuple[str, ...]:
+        frames = []
+        awaitable = self.task.get_coro()
+        while awaitable is not None:
+            frame = _coroutine_frame(awaitable)
+            if frame is None:
+                # a Future (a thread's result, a socket read, a sleep); the C
+                # implementation hands out a FutureIter for it
+                name = type(awaitable).__name__.removesuffix("Iter")
+                frames.append(f"<await {name}>")
+                break
+            frames.append(frame)
+            awaitable = _awaited(awaitable)
+
+        # when the innermost coroutine is the one running, add what it called
+        innermost = frames[-1] if frames and not isinstance(frames[-1], str) else None
+        thread_frame = sys._current_frames().get(self._loop_thread_id)
+        called = []
+        while innermost is not None and thread_frame is not None:
+            if thread_frame is innermost:
+                frames.extend(reversed(called))
+                break
+            called.append(thread_frame)
+            thread_frame = thread_frame.f_back
+
+        return tuple(
+            frame if isinstance(frame, str) else _frame_name(frame) for frame in frames
+        )
+
+
+class ProfileStore:
+    """Profiles saved as collapsed-stack files, keeping the newest max_files."""
+
+    def __init__(self, directory: str = PROFILE_DIR, max_files: int = PROFILE_MAX_FILES):
+        self.directory = Path(directory)
+        self.max_files = max_files
+
+    def path(self, profile_id: str) -> Optional[Path]:
+        """The file for a profile id (None for ids that aren't ours, or profiles that are gone)."""
+        if not profile_id.isalnum():
+            return None
+        path = self.directory / f"{profile_id}.folded"
+        return path if path.exists() else None
+
+    def save(self, profile_id: str, root: str, stacks: Counter):
+        self.directory.mkdir(parents=True, exist_ok=True)
+        lines = [
+            ";".join((root,) + stack) + f" {count}"
+            for stack, count in stacks.most_common()
+        ]
+        (self.directory / f"{profile_id}.folded").write_text("\n".join(lines) + "\n")
+
+        # drop the oldest profiles beyond the limit
+        saved = sorted(self.directory.glob("*.folded"), key=lambda p: (p.stat().st_mtime_ns, p.name))
+        for old in saved[: max(0, len(saved) - self.max_files)]:
+            old.unlink(missing_ok=True)
+
+
+class ProfilingMiddleware:
+    """
+    ASGI middleware that profiles requests sent with the admin token in the
+    X-Profile header, or a random sample_rate share of all requests.
+    A profiled response carries an X-Profile-Id header naming the stored profile.
+    """
+
+    def __init__(
+        self,
+        app,
+        token: str = PROFILING_TOKEN,
+        sample_rate: float = PROFILING_SAMPLE_RATE,
+        store: Optional[ProfileStore] = None,
+        interval: float = PROFILING_INTERVAL_SECONDS,
+    ):
+        self.app = app
+        self.token = token.encode() if token else None
+        self.sample_rate = sample_rate
+        self.store = store or ProfileStore()
+        self.interval = interval
+
+    def _should_profile(self, scope) -> bool:
+        if self.token is not None:
+            for name, value in scope["headers"]:
+                if name == PROFILE_HEADER and secrets.compare_digest(value, self.token):
+                    return True
+        return self.sample_rate > 0 and random.random() < self.sample_rate
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not self._should_profile(scope):
+            await self.app(scope, receive, send)
+            return
+
+        profile_id = secrets.token_hex(8)
+
+        async def send_with_profile_id(message):
+            if message["type"] == "http.response.start":
+                message = {
+                    **message,
+                    "headers": [
+                        *message.get("headers", []),
+                        (b"x-profile-id", profile_id.encode()),
+                    ],
+                }
+            await send(message)
+
+        sampler = StackSampler(asyncio.current_task(), self.interval)
+        start = time.perf_counter()
+        sampler.start()
+        try:
+            await self.app(scope, receive, send_with_profile_id)
+        finally:
+            sampler.stop()
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            root = f"{scope['method']} {scope['path']} ({elapsed_ms:.0f} ms)"
+            await asyncio.to_thread(self.store.save, profile_id, root, sampler.stacks)
@@ -0,0 +1,53 @@
+import itertools
+from typing import Awaitable, Callable
+
+from services.micro_batch import MicroBatcher
+
+# Translates several submissions' responses at once: ({key: response_data}, language) -> {key: translated}
+TranslateMany = Callable[[dict[str, dict], str], Awaitable[dict[str, dict]]]
+
+# stands in for a response the reply left out
+_MISSING = object()
+
+
+class ResponseBatcher:
+    """
+    Merges concurrent back-translations in the same language into one request.
+    The first response of a batch starts a timer; the batch is sent when the
+    timer ends or it holds max_submissions responses, whichever comes first,
+    so no caller waits more than max_wait_seconds before its request is sent.
+    The reply is split back out by the key each response was sent under.
+    """
+
+    def __init__(
+        self,
+        translate_many: TranslateMany,
+        max_submissions: int,
+        max_wait_seconds: float,
+    ):
+        self._translate_many = translate_many
+        self._keys = itertools.count(1)
+        self._batcher = MicroBatcher(self._send, max_submissions, max_wait_seconds)
+
+    async def translate(self, response_data: dict, source_language: str) -> dict:
+        """
+        Translate one submission's responses as part of the current batch.
+
+        Args:
+            response_data: Dictionary of field responses (field_key: value pairs)
+            source_language: Language code the responses are in (e.g., 'es')
+
+        Returns:
+            The translated responses (raises the batch's error if its request
+            failed, or ValueError if the reply left this submission out)
+        """
+        translated = await self._batcher.submit(response_data, source_language)
+        if translated is _MISSING:
+            raise ValueError("Response missing from batched translation")
+        return translated
+
+    async def _send(self, source_language: str, responses: list[dict]) -> list:
+        """Translate a batch in one request, keyed so the reply can be split back out."""
+        keyed = {str(next(self._keys)): response_data for response_data in responses}
+        translated = await self._translate_many(keyed, source_language)
+        return [translated.get(key, _MISSING) for key in keyed]
@@ -0,0 +1,109 @@
+"""
+Local pre-filter for back-translation.
+Most answers on an intake form don't need the model: dates, phone numbers,
+emails and numbers read the same in every language, and select/radio/checkbox
+answers are one of the form's own options, whose English original we already
+have. Only what's left (free text) is sent for translation.
+"""
+
+import re
+from typing import Optional
+
+# answers to these field types are kept as they are
+NON_LINGUISTIC_FIELD_TYPES = {"email", "tel", "date", "number"}
+# answers to these field types are one (or, for checkboxes, several) of the field's options
+OPTION_FIELD_TYPES = {"select", "radio", "checkbox"}
+
+_EMAIL = re.compile(r"^[^@\s]+@[^@\s]+\.[^@\s]+$")
+
+
+def fields_by_key(fields: list[dict]) -> dict[str, dict]:
+    """Fields by the key their answers are submitted under (`{field id}_{index}`)."""
+    return {f"{field.get('id')}_{index}": field for index, field in enumerate(fields)}
+
+
+def build_option_lookup(
+    fields: list[dict], translated_fields: Optional[list[dict]] = None
+) -> dict[str, dict[str, str]]:
+    """
+    Reverse lookup from an option as the patient saw it to its English original.
+
+    Args:
+        fields: The form's (English) field definitions
+        translated_fields: The same fields from the form's TranslatedForm, if
+            the patient was shown a translation (same order and options)
+
+    Returns:
+        {field_key: {shown_option: english_option}} for fields with options.
+        English options map to themselves, for patients shown the English form.
+    """
+    lookup = {}
+    for index, field in enumerate(fields):
+        options = field.get("options") or []
+        if field.get("type") not in OPTION_FIELD_TYPES or not options:
+            continue
+        key = f"{field.get('id')}_{index}"
+        lookup[key] = {option: option for option in options}
+
+        if translated_fields is None or index >= len(translated_fields):
+            continue
+        translated = translated_fields[index]
+        translated_options = translated.get("options") or []
+        # a translation whose options don't line up can't be mapped back
+        if translated.get("id") != field.get("id") or len(translated_options) != len(options):
+            continue
+        for shown, original in zip(translated_options, options):
+            if isinstance(shown, str):
+                lookup[key].setdefault(shown, original)
+    return lookup
+
+
+def is_non_linguistic(value: str) -> bool:
+    """True for answers without words to translate (numbers, dates, phone numbers, emails)."""
+    value = value.strip()
+    return not any(char.isalpha() for char in value) or bool(_EMAIL.match(value))
+
+
+def split_responses(
+    response_data: dict,
+    fields: list[dict],
+    option_lookup: dict[str, dict[str, str]],
+) -> tuple[dict, dict]:
+    """
+    Resolve what can be resolved locally and pick out the answers that need the model.
+
+    Args:
+        response_data: Dictionary of field responses (field_key: value pairs)
+        fields: The form's (English) field definitions
+        option_lookup: Reverse option lookup from build_option_lookup
+
+    Returns:
+        (resolved, to_translate): resolved holds every answer, with option
+        answers mapped to English; to_translate holds only the answers still
+        to be translated (their translations replace the resolved values)
+    """
+    fields = fields_by_key(fields)
+    resolved = {}
+    to_translate = {}
+    for key, value in response_data.items():
+        field_type = fields.get(key, {}).get("type")
+        options = option_lookup.get(key, {})
+        resolved[key] = value
+
+        if field_type in NON_LINGUISTIC_FIELD_TYPES:
+            continue
+        if isinstance(value, str):
+            if value in options:
+                resolved[key] = options[value]
+            elif value.strip() and not is_non_linguistic(value):
+                to_translate[key] = value
+        elif isinstance(value, list) and value:
+            # checkbox answers: map what we can; send the list if anything is left
+            mapped = [options.get(item, item) if isinstance(item, str) else item for item in value]
+            resolved[key] = mapped
+            if any(
+                isinstance(item, str) and item not in options and not is_non_linguistic(item)
+                for item in value
+            ):
+                to_translate[key] = mapped
+    return resolved, to_translate
@@ -0,0 +1,80 @@
+import asyncio
+from typing import AsyncIterator, Awaitable, Callable, Hashable, TypeVar
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """
+    De-duplicates concurrent calls that share a key.
+    The first caller for a key starts the work; callers that arrive while it is
+    still running wait for the same result instead of starting their own.
+    """
+
+    def __init__(self):
+        self._in_flight: dict[Hashable, asyncio.Future] = {}
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> T:
+        """
+        Run fn() for key, or join the call already in flight for key.
+
+        Args:
+            key: Identifies the work (e.g. (form_id, language_code))
+            fn: Starts the work; only called if nothing is in flight for key
+
+        Returns:
+            The result of the shared call (exceptions are shared too)
+        """
+        # shield: one waiter giving up (e.g. client disconnect) must not cancel the others
+        return await asyncio.shield(self.start(key, fn))
+
+    def start(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> asyncio.Future:
+        """Start fn() for key unless a call is already in flight; return that call's future."""
+        future = self._in_flight.get(key)
+        if future is None:
+            future = asyncio.ensure_future(fn())
+            self._in_flight[key] = future
+            future.add_done_callback(lambda _: self._in_flight.pop(key, None))
+        return future
+
+    def running(self, key: Hashable) -> bool:
+        """Whether a call for key is in flight."""
+        return key in self._in_flight
+
+
+class EventBroadcast:
+    """
+    Events from one producer, sent to any number of subscribers.
+    Every subscriber gets all events from the first, so one that joins
+    mid-stream catches up before following along.
+    """
+
+    def __init__(self):
+        self._events: list = []
+        self._closed = False
+        self._published = asyncio.Event()
+
+    def publish(self, event):
+        """Send an event to every subscriber."""
+        self._events.append(event)
+        self._wake()
+
+    def close(self):
+        """End every subscription once it has sent the events published so far."""
+        self._closed = True
+        self._wake()
+
+    def _wake(self):
+        self._published.set()
+        self._published = asyncio.Event()
+
+    async def subscribe(self) -> AsyncIterator:
+        """Yield the events published so far, then each new one until closed."""
+        sent = 0
+        while True:
+            while sent < len(self._events):
+                yield self._events[sent]
+                sent += 1
+            if self._closed:
+                return
+            await self._published.wait()
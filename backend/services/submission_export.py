@@ -0,0 +1,163 @@
+"""
+Streaming export of form submissions as NDJSON or CSV.
+Rows are read through a server-side cursor and written out one batch at a
+time, so memory stays flat however many submissions are exported.
+"""
+
+import csv
+import io
+import json
+from typing import AsyncIterator
+from sqlmodel import select
+from sqlmodel.sql.expression import SelectOfScalar
+from models import Form, FormSubmission
+from services.json_body import RawJSON, json_object
+from config.constants import SUBMISSIONS_EXPORT_BATCH_SIZE
+
+# Columns every CSV export starts with (the answers follow, one column per field key)
+CSV_COLUMNS = ["id", "form_id", "submitted_at", "language", "translation_status"]
+# Last CSV column: answers under keys the header doesn't have, as a JSON object
+CSV_OTHER_ANSWERS_COLUMN = "other_answers"
+
+
+async def _stream_batches(session_factory, statement) -> AsyncIterator[list]:
+    """Yield the statement's rows in batches, fetched through a server-side cursor."""
+    statement = statement.execution_options(yield_per=SUBMISSIONS_EXPORT_BATCH_SIZE)
+    async with session_factory() as session:
+        result = await session.stream_scalars(statement)
+        async for batch in result.partitions():
+            yield batch
+
+
+def _submission_line(submission: FormSubmission) -> bytes:
+    """One NDJSON line, with the stored answers spliced in as they are."""
+    return json_object(
+        {
+            "id": submission.id,
+            "form_id": submission.form_id,
+            "submission_data": RawJSON(submission.submission_data),
+            "submitted_at": submission.submitted_at,
+            "language": submission.language,
+            "translation_status": submission.translation_status,
+        }
+    ) + b"\n"
+
+
+async def export_ndjson(
+    session_factory, statement: SelectOfScalar[FormSubmission]
+) -> AsyncIterator[bytes]:
+    """
+    Stream submissions as newline-delimited JSON, one submission per line.
+
+    Args:
+        session_factory: Opens the session the export reads with
+        statement: Selects the submissions to export, in order
+
+    Returns:
+        Async iterator of UTF-8 chunks (one per batch of rows)
+    """
+    async for batch in _stream_batches(session_factory, statement):
+        yield b"".join(_submission_line(s) for s in batch)
+
+
+def _csv_value(value) -> str:
+    """Flatten an answer into one CSV cell (checkbox lists are joined with "; ")."""
+    if value is None:
+        return ""
+    if isinstance(value, list):
+        return "; ".join(_csv_value(item) for item in value)
+    if isinstance(value, dict):
+        return json.dumps(value, ensure_ascii=False)
+    return str(value)
+
+
+async def _answer_keys(session_factory, statement) -> list[str]:
+    """
+    Collect the field keys used by the exported submissions, in first-seen order.
+    Reads only submission_data, streamed, so it holds the keys and not the rows.
+    """
+    keys = {}
+    key_statement = statement.with_only_columns(FormSubmission.submission_data)
+    async for batch in _stream_batches(session_factory, key_statement):
+        for submission_data in batch:
+            keys.update(dict.fromkeys(json.loads(submission_data)))
+    return list(keys)
+
+
+async def _csv_answer_columns(session_factory, statement) -> list[str]:
+    """
+    The answer columns for a CSV export: each exported form's field keys
+    (`{field id}_{index}`, as the patient form submits them), oldest form first.
+    Only submissions whose form no longer exists are scanned for their keys.
+    """
+    form_id_statement = (
+        statement.with_only_columns(FormSubmission.form_id).distinct().order_by(None)
+    )
+    async with session_factory() as session:
+        form_ids = (await session.exec(form_id_statement)).all()
+        forms = (
+            await session.exec(
+                select(Form).where(Form.id.in_(form_ids)).order_by(Form.created_at)
+            )
+        ).all()
+
+    keys = {}
+    for form in forms:
+        for index, field in enumerate(json.loads(form.fields)):
+            keys[f"{field.get('id')}_{index}"] = None
+
+    missing_form_ids = set(form_ids) - {form.id for form in forms}
+    if missing_form_ids:
+        missing_statement = statement.where(FormSubmission.form_id.in_(missing_form_ids))
+        keys.update(dict.fromkeys(await _answer_keys(session_factory, missing_statement)))
+    return list(keys)
+
+
+async def export_csv(
+    session_factory, statement: SelectOfScalar[FormSubmission]
+) -> AsyncIterator[str]:
+    """
+    Stream submissions as CSV, with each field key of the answers as its own column.
+    The columns come from the exported forms' definitions, so the header is
+    sent before any submission is read; answers under other keys (e.g. from
+    bulk uploads) go in the last column as JSON.
+
+    Args:
+        session_factory: Opens the sessions the export reads with
+        statement: Selects the submissions to export, in order
+
+    Returns:
+        Async iterator of text chunks (the header, then one per batch of rows)
+    """
+    answer_keys = await _csv_answer_columns(session_factory, statement)
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+
+    def flush() -> str:
+        chunk = buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+        return chunk
+
+    writer.writerow(CSV_COLUMNS + answer_keys + [CSV_OTHER_ANSWERS_COLUMN])
+    yield flush()
+
+    header_keys = set(answer_keys)
+    async for batch in _stream_batches(session_factory, statement):
+        for submission in batch:
+            answers = json.loads(submission.submission_data)
+            other_answers = {
+                key: value for key, value in answers.items() if key not in header_keys
+            }
+            writer.writerow(
+                [
+                    submission.id,
+                    submission.form_id,
+                    submission.submitted_at.isoformat(),
+                    submission.language,
+                    submission.translation_status,
+                ]
+                + [_csv_value(answers.get(key)) for key in answer_keys]
+                + [_csv_value(other_answers) if other_answers else ""]
+            )
+        yield flush()
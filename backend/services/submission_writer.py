@@ -0,0 +1,61 @@
+"""
+Group commit for submission inserts.
+During check-in peaks many patients submit at once; committing each row in its
+own transaction makes every one wait for its own commit (and for the write lock
+behind all the others). SubmissionWriter gathers the submissions that arrive
+within a short window (or until a batch is full), inserts them in one
+transaction, and only then answers each caller.
+"""
+
+from models import FormSubmission
+from services.job_queue import enqueue_job, BACK_TRANSLATE_SUBMISSION
+from services.micro_batch import MicroBatcher
+from config.constants import SUBMISSION_BATCH_MAX_ROWS, SUBMISSION_BATCH_WINDOW_SECONDS
+
+
+class SubmissionWriter:
+    """
+    Commits submissions in batches.
+    The first submission of a batch starts a timer; the batch is committed
+    when the window ends or it reaches max_rows, whichever comes first.
+    Batches commit one at a time, and a batch keeps filling while it waits for
+    the one before it, so under load each commit carries more rows.
+    """
+
+    def __init__(
+        self,
+        session_factory,
+        max_rows: int = SUBMISSION_BATCH_MAX_ROWS,
+        window_seconds: float = SUBMISSION_BATCH_WINDOW_SECONDS,
+    ):
+        self._session_factory = session_factory
+        self._batcher = MicroBatcher(self._commit, max_rows, window_seconds, serial=True)
+
+    async def add(self, submission: FormSubmission) -> FormSubmission:
+        """
+        Save a submission, with its back-translation job if it's pending.
+
+        Args:
+            submission: A new FormSubmission (not yet in any session)
+
+        Returns:
+            The submission, once the transaction holding it has committed (its
+            id is set). Raises the commit's error if the batch failed.
+        """
+        return await self._batcher.submit(submission)
+
+    async def aclose(self):
+        """Commit the submissions still waiting (call before disposing of the engine)."""
+        await self._batcher.aclose()
+
+    async def _commit(self, group, rows: list[FormSubmission]) -> list[FormSubmission]:
+        """Insert the rows and their back-translation jobs in one transaction."""
+        async with self._session_factory() as session:
+            session.add_all(rows)
+            pending = [row for row in rows if row.translation_status == "pending"]
+            if pending:
+                await session.flush()  # assigns the submission ids
+                for row in pending:
+                    enqueue_job(session, BACK_TRANSLATE_SUBMISSION, {"submission_id": row.id})
+            await session.commit()
+        return rows
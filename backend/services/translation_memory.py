@@ -0,0 +1,74 @@
+import hashlib
+from datetime import datetime, UTC
+from sqlalchemy.dialects.sqlite import insert
+from sqlmodel import select
+from models import TranslationMemory
+
+# Keep IN (...) lists well under SQLite's bound-parameter limit
+LOOKUP_BATCH_SIZE = 500
+
+
+def hash_segment(text: str) -> str:
+    """Hash a source segment for translation memory lookups."""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class TranslationMemoryStore:
+    """Reads and writes segment translations in the TranslationMemory table."""
+
+    def __init__(self, session_factory):
+        self._session_factory = session_factory
+
+    async def lookup(self, texts: list[str], language_code: str) -> dict[str, str]:
+        """
+        Find stored translations for source segments.
+
+        Args:
+            texts: Source segments (English)
+            language_code: Target language code (e.g., 'es')
+
+        Returns:
+            Dictionary mapping each known source segment to its translation
+        """
+        hashes = list({hash_segment(text): text for text in texts})
+        found = {}
+        async with self._session_factory() as session:
+            for start in range(0, len(hashes), LOOKUP_BATCH_SIZE):
+                statement = select(TranslationMemory).where(
+                    TranslationMemory.language_code == language_code,
+                    TranslationMemory.source_hash.in_(
+                        hashes[start : start + LOOKUP_BATCH_SIZE]
+                    ),
+                )
+                for entry in (await session.exec(statement)).all():
+                    found[entry.source_text] = entry.translated_text
+        return found
+
+    async def save(self, translations: dict[str, str], language_code: str):
+        """
+        Store new segment translations (segments already stored are left as they are).
+
+        Args:
+            translations: Dictionary mapping source segment -> translated segment
+            language_code: Target language code (e.g., 'es')
+        """
+        if not translations:
+            return
+        now = datetime.now(UTC)
+        rows = [
+            {
+                "source_hash": hash_segment(source_text),
+                "language_code": language_code,
+                "source_text": source_text,
+                "translated_text": translated_text,
+                "created_at": now,
+            }
+            for source_text, translated_text in translations.items()
+        ]
+        statement = insert(TranslationMemory).on_conflict_do_nothing(
+            index_elements=["source_hash", "language_code"]
+        )
+        async with self._session_factory() as session:
+            connection = await session.connection()
+            await connection.execute(statement, rows)
+            await session.commit()
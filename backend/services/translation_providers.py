@@ -0,0 +1,323 @@
+"""
+Translation backends.
+TranslationService does the caching, chunking and retries; a provider only
+turns text into translated text. The OpenAI provider calls the model; the
+stub provider answers locally with deterministic pseudo-translations and
+simulated latency and failures, for load tests and CI runs without a key.
+"""
+
+import asyncio
+import json
+import random
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import AsyncIterator, Optional
+import httpx
+from openai import AsyncOpenAI, DefaultAsyncHttpxClient
+from services.metrics import record_token_usage
+from config.constants import (
+    SUPPORTED_LANGUAGES,
+    TRANSLATION_PROVIDER,
+    TRANSLATION_MAX_CONNECTIONS,
+    TRANSLATION_MAX_KEEPALIVE_CONNECTIONS,
+    TRANSLATION_KEEPALIVE_EXPIRY_SECONDS,
+    TRANSLATION_CONNECT_TIMEOUT_SECONDS,
+    TRANSLATION_TIMEOUT_SECONDS,
+    STUB_TRANSLATION_LATENCY_SECONDS,
+    STUB_TRANSLATION_JITTER_SECONDS,
+    STUB_TRANSLATION_FAILURE_RATE,
+    STUB_TRANSLATION_SEED,
+)
+
+
+class MissingAPIKeyError(RuntimeError):
+    """The provider's API key isn't configured (translation is switched off)."""
+
+
+class TranslationProvider(ABC):
+    """
+    Interface for translation backends.
+    Content items are dicts with an "index" and text under "label",
+    "placeholder" and/or "options"; replies keep each item's "index".
+    A backend missing one of the abstract methods fails when it's created.
+    """
+
+    @abstractmethod
+    async def translate_text(self, text: str, target_language: str) -> str:
+        """Translate one piece of text (e.g. a form name) to a language code."""
+
+    @abstractmethod
+    async def translate_items(
+        self, content: list[dict], target_language: str
+    ) -> list[dict]:
+        """Translate a batch of content items in one call."""
+
+    @abstractmethod
+    def stream_items(
+        self, content: list[dict], target_language: str
+    ) -> AsyncIterator[dict]:
+        """Translate a batch of content items, yielding each one as it completes."""
+
+    @abstractmethod
+    async def translate_responses(
+        self, responses: dict, source_language: str
+    ) -> dict:
+        """Translate patient answers (field_key: text or list) to English."""
+
+    async def aclose(self):
+        """Release the provider's connections, if it has any."""
+
+
+class OpenAITranslationProvider(TranslationProvider):
+    """
+    Translates with OpenAI's gpt-4o-mini.
+    Meant to be created once per app: the client keeps a pool of open
+    connections that every request reuses.
+    """
+
+    # get api key and create client (unless one is passed in)
+    def __init__(self, client: Optional[AsyncOpenAI] = None):
+        if client is None:
+            api_key = self._load_api_key()
+            if not api_key:
+                raise MissingAPIKeyError(
+                    "OpenAI API key not found. Create backend/config/api_key.txt with your key."
+                )
+            client = self._create_client(api_key)
+        self._client = client
+
+    @staticmethod
+    def _create_client(api_key: str) -> AsyncOpenAI:
+        """Create an OpenAI client with a keep-alive connection pool and timeouts."""
+        http_client = DefaultAsyncHttpxClient(
+            limits=httpx.Limits(
+                max_connections=TRANSLATION_MAX_CONNECTIONS,
+                max_keepalive_connections=TRANSLATION_MAX_KEEPALIVE_CONNECTIONS,
+                keepalive_expiry=TRANSLATION_KEEPALIVE_EXPIRY_SECONDS,
+            ),
+        )
+        return AsyncOpenAI(
+            api_key=api_key,
+            timeout=httpx.Timeout(
+                TRANSLATION_TIMEOUT_SECONDS,
+                connect=TRANSLATION_CONNECT_TIMEOUT_SECONDS,
+            ),
+            http_client=http_client,
+        )
+
+    def _load_api_key(self) -> str:
+        """Load API key from local file."""
+        key_file = Path(__file__).parent.parent / "config" / "api_key.txt"
+        if key_file.exists():
+            return key_file.read_text().strip()
+        return ""
+
+    async def aclose(self):
+        """Close the client and its pooled connections."""
+        await self._client.close()
+
+    async def _complete(self, prompt: str, stream: bool = False):
+        """Send one prompt to the model (token usage is recorded for non-streamed replies)."""
+        response = await self._client.chat.completions.create(
+            model="gpt-4o-mini",
+            messages=[
+                {
+                    "role": "system",
+                    "content": "You are a professional medical translator. Translate accurately while maintaining medical terminology precision.",
+                },
+                {"role": "user", "content": prompt},
+            ],
+            temperature=0.3,
+            stream=stream,
+            # streamed replies report usage in their last event
+            **({"stream_options": {"include_usage": True}} if stream else {}),
+        )
+        if not stream:
+            record_token_usage(response.usage)
+        return response
+
+    def _reply_json(self, response):
+        """Parse a JSON reply (removing markdown code blocks if present)."""
+        translated_text = response.choices[0].message.content.strip()
+        if translated_text.startswith("```"):
+            lines = translated_text.split("\n")
+            translated_text = "\n".join(lines[1:-1])
+        return json.loads(translated_text)
+
+    async def translate_text(self, text: str, target_language: str) -> str:
+        # get target language
+        target_lang_name = SUPPORTED_LANGUAGES.get(target_language, target_language)
+
+        # prompt
+        prompt = f"""Translate the following form name to {target_lang_name}.
+                    Keep medical terminology accurate and professional.
+                    Return ONLY the translated text, nothing else.
+
+                    Form name: {text}"""
+
+        # return first and only response's content
+        response = await self._complete(prompt)
+        return response.choices[0].message.content.strip()
+
+    async def translate_items(
+        self, content: list[dict], target_language: str
+    ) -> list[dict]:
+        target_lang_name = SUPPORTED_LANGUAGES.get(target_language, target_language)
+        prompt = f"""Translate the following form field content to {target_lang_name}.
+                    Maintain the JSON structure exactly. Only translate the text values, not the keys.
+                    Keep medical terminology accurate and professional.
+
+                    {json.dumps(content, ensure_ascii=False)}"""
+
+        return self._reply_json(await self._complete(prompt))
+
+    async def stream_items(
+        self, content: list[dict], target_language: str
+    ) -> AsyncIterator[dict]:
+        target_lang_name = SUPPORTED_LANGUAGES.get(target_language, target_language)
+        prompt = f"""Translate the following form field content to {target_lang_name}.
+                    Return one JSON object per line (JSON Lines), one line for each input item, keeping its "index".
+                    Only translate the text values, not the keys. Return nothing else.
+                    Keep medical terminology accurate and professional.
+
+                    {json.dumps(content, ensure_ascii=False)}"""
+
+        stream = await self._complete(prompt, stream=True)
+
+        # each complete line of the reply is one translated item
+        buffer = ""
+        async for event in stream:
+            if not event.choices:
+                record_token_usage(getattr(event, "usage", None))
+                continue
+            buffer += event.choices[0].delta.content or ""
+            *lines, buffer = buffer.split("\n")
+            for line in lines:
+                item = self._parse_stream_line(line)
+                if item is not None:
+                    yield item
+
+        item = self._parse_stream_line(buffer)
+        if item is not None:
+            yield item
+
+    def _parse_stream_line(self, line: str) -> Optional[dict]:
+        """Parse one line of a JSON Lines reply (None for blank lines and code fences)."""
+        line = line.strip()
+        if not line or line.startswith("```"):
+            return None
+        return json.loads(line)
+
+    async def translate_responses(
+        self, responses: dict, source_language: str
+    ) -> dict:
+        # get source language
+        source_lang_name = SUPPORTED_LANGUAGES.get(source_language, source_language)
+
+        prompt = f"""Translate the following patient form responses from {source_lang_name} to English.
+                    Maintain the JSON structure exactly. Only translate the text values, not the keys.
+                    Keep medical terminology accurate and professional.
+
+                    {json.dumps(responses, ensure_ascii=False)}"""
+
+        return self._reply_json(await self._complete(prompt))
+
+
+class SimulatedTranslationError(RuntimeError):
+    """A failure injected by StubTranslationProvider."""
+
+
+class StubTranslationProvider(TranslationProvider):
+    """
+    Local translation backend for load tests and CI.
+    Every string is "translated" by prefixing its language code ("[es] Name"),
+    so results are deterministic. Each call waits latency_seconds
+    (+/- jitter_seconds) and fails with probability failure_rate; the jitter
+    and failures come from a seeded random generator.
+    """
+
+    def __init__(
+        self,
+        latency_seconds: float = STUB_TRANSLATION_LATENCY_SECONDS,
+        jitter_seconds: float = STUB_TRANSLATION_JITTER_SECONDS,
+        failure_rate: float = STUB_TRANSLATION_FAILURE_RATE,
+        seed: Optional[int] = STUB_TRANSLATION_SEED,
+    ):
+        self.latency_seconds = latency_seconds
+        self.jitter_seconds = jitter_seconds
+        self.failure_rate = failure_rate
+        self._random = random.Random(seed)
+        self.calls = 0
+
+    def _translate(self, value, language_code: str):
+        if isinstance(value, str):
+            return f"[{language_code}] {value}"
+        if isinstance(value, list):
+            return [self._translate(v, language_code) for v in value]
+        if isinstance(value, dict):
+            return {
+                k: v if k == "index" else self._translate(v, language_code)
+                for k, v in value.items()
+            }
+        return value
+
+    def _delay(self) -> float:
+        jitter = self._random.uniform(-self.jitter_seconds, self.jitter_seconds)
+        return max(0.0, self.latency_seconds + jitter)
+
+    def _should_fail(self) -> bool:
+        return self._random.random() < self.failure_rate
+
+    async def _call(self, result):
+        """Simulate one model call that returns result."""
+        self.calls += 1
+        delay, fail = self._delay(), self._should_fail()
+        await asyncio.sleep(delay)
+        if fail:
+            raise SimulatedTranslationError("Simulated translation failure")
+        return result
+
+    async def translate_text(self, text: str, target_language: str) -> str:
+        return await self._call(self._translate(text, target_language))
+
+    async def translate_items(
+        self, content: list[dict], target_language: str
+    ) -> list[dict]:
+        return await self._call(self._translate(content, target_language))
+
+    async def stream_items(
+        self, content: list[dict], target_language: str
+    ) -> AsyncIterator[dict]:
+        # the call's latency is spread over the items; a failure breaks the
+        # stream part way through, like a dropped connection
+        self.calls += 1
+        delay, fail = self._delay(), self._should_fail()
+        fail_at = self._random.randrange(len(content)) if fail and content else None
+        for position, item in enumerate(content):
+            await asyncio.sleep(delay / len(content))
+            if position == fail_at:
+                raise SimulatedTranslationError("Simulated translation stream failure")
+            yield self._translate(item, target_language)
+
+    async def translate_responses(
+        self, responses: dict, source_language: str
+    ) -> dict:
+        return await self._call(self._translate(responses, "en"))
+
+
+def create_translation_provider(name: str = TRANSLATION_PROVIDER) -> TranslationProvider:
+    """
+    Create the translation backend selected in config.
+
+    Args:
+        name: "openai" or "stub"
+
+    Returns:
+        A new provider. Raises ValueError for an unknown name (a config
+        mistake) and MissingAPIKeyError if the OpenAI key isn't set up.
+    """
+    if name == "openai":
+        return OpenAITranslationProvider()
+    if name == "stub":
+        return StubTranslationProvider()
+    raise ValueError(f"Unknown translation provider: {name}")
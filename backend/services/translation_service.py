@@ -1,27 +1,84 @@
+import asyncio
 import json
-from pathlib import Path
-from openai import AsyncOpenAI
-from config.constants import SUPPORTED_LANGUAGES
+import time
+from typing import AsyncIterator, Awaitable, Optional, TypeVar
+from services.translation_memory import TranslationMemoryStore
+from services.translation_providers import TranslationProvider, OpenAITranslationProvider
+from services.response_batcher import ResponseBatcher
+from services.metrics import (
+    TRANSLATION_REQUESTS,
+    TRANSLATION_DURATION,
+    record_cache_lookup,
+)
+from config.constants import (
+    TRANSLATION_CHUNK_MAX_FIELDS,
+    TRANSLATION_CHUNK_MAX_CHARS,
+    TRANSLATION_CHUNK_CONCURRENCY,
+    TRANSLATION_CHUNK_ATTEMPTS,
+    BACK_TRANSLATION_GROUP_MAX_SUBMISSIONS,
+    BACK_TRANSLATION_BATCH_WAIT_SECONDS,
+)
+
+T = TypeVar("T")
 
 
 class TranslationService:
-    """Handles form field translation using OpenAI API."""
-
-    # get api key and create client
-    def __init__(self):
-        api_key = self._load_api_key()
-        if not api_key:
-            raise ValueError(
-                "OpenAI API key not found. Create backend/config/api_key.txt with your key."
+    """
+    Translates forms and patient responses through a TranslationProvider
+    (OpenAI by default), adding translation memory, chunking and retries.
+    Meant to be created once per app: the provider's client keeps a pool of
+    open connections that every request reuses. Call aclose() on shutdown.
+    """
+
+    def __init__(
+        self,
+        provider: Optional[TranslationProvider] = None,
+        memory: Optional[TranslationMemoryStore] = None,
+    ):
+        # OpenAI backend unless another is passed in (raises ValueError without an API key)
+        self._provider = provider if provider is not None else OpenAITranslationProvider()
+        # segment translations shared across forms (optional)
+        self._memory = memory
+        # concurrent back-translations in one language share a request
+        self._response_batcher = ResponseBatcher(
+            self.translate_submissions_to_english,
+            BACK_TRANSLATION_GROUP_MAX_SUBMISSIONS,
+            BACK_TRANSLATION_BATCH_WAIT_SECONDS,
+        )
+
+    async def aclose(self):
+        """Close the provider and its pooled connections."""
+        await self._provider.aclose()
+
+    async def _call_provider(self, operation: str, call: Awaitable[T]) -> T:
+        """Await one provider call, recording its outcome and latency."""
+        start = time.perf_counter()
+        outcome = "error"
+        try:
+            result = await call
+            outcome = "ok"
+            return result
+        finally:
+            TRANSLATION_REQUESTS.inc(operation=operation, outcome=outcome)
+            TRANSLATION_DURATION.observe(
+                time.perf_counter() - start, operation=operation
             )
-        self._client = AsyncOpenAI(api_key=api_key)
 
-    def _load_api_key(self) -> str:
-        """Load API key from local file."""
-        key_file = Path(__file__).parent.parent / "config" / "api_key.txt"
-        if key_file.exists():
-            return key_file.read_text().strip()
-        return ""
+    async def _stream_provider(
+        self, content: list[dict], target_language: str
+    ) -> AsyncIterator[dict]:
+        """Stream one provider call, recording its outcome and latency (until the last item)."""
+        start = time.perf_counter()
+        outcome = "error"
+        try:
+            async for item in self._provider.stream_items(content, target_language):
+                yield item
+            outcome = "ok"
+        finally:
+            TRANSLATION_REQUESTS.inc(operation="stream_items", outcome=outcome)
+            TRANSLATION_DURATION.observe(
+                time.perf_counter() - start, operation="stream_items"
+            )
 
     async def translate_form_name(self, form_name: str, target_language: str) -> str:
         """
@@ -37,32 +94,10 @@ class TranslationService:
         if target_language == "en":
             return form_name
 
-        # get target language
-        target_lang_name = SUPPORTED_LANGUAGES.get(target_language, target_language)
-
-        # prompt
-        prompt = f"""Translate the following form name to {target_lang_name}. 
-                    Keep medical terminology accurate and professional. 
-                    Return ONLY the translated text, nothing else.
-
-                    Form name: {form_name}"""
-
-        # send prompt to OpenAI and get response
-        response = await self._client.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=[
-                {
-                    "role": "system",
-                    "content": "You are a professional medical translator. Translate accurately while maintaining medical terminology precision.",
-                },
-                {"role": "user", "content": prompt},
-            ],
-            temperature=0.3,
+        return await self._call_provider(
+            "translate_text", self._provider.translate_text(form_name, target_language)
         )
 
-        # return first and only response's content
-        return response.choices[0].message.content.strip()
-
     async def translate_responses_to_english(
         self, response_data: dict, source_language: str
     ) -> dict:
@@ -79,10 +114,58 @@ class TranslationService:
         if source_language == "en":
             return response_data
 
-        # get source language
-        source_lang_name = SUPPORTED_LANGUAGES.get(source_language, source_language)
+        if not self._translatable_responses(response_data):
+            return response_data
+
+        # sent together with other submissions arriving within
+        # BACK_TRANSLATION_BATCH_WAIT_SECONDS (one request per batch)
+        return await self._response_batcher.translate(response_data, source_language)
 
-        # Extract non-empty text values to translate
+    async def translate_submissions_to_english(
+        self, responses: dict[str, dict], source_language: str
+    ) -> dict[str, dict]:
+        """
+        Translate several submissions' responses to English in one request.
+
+        Args:
+            responses: Response data (field_key: value pairs) keyed by submission id
+            source_language: Language code all the responses are in (e.g., 'es')
+
+        Returns:
+            Translated response data by submission id. A submission the reply
+            leaves out is missing from the result, so the caller can retry it.
+        """
+        if source_language == "en":
+            return responses
+
+        translatable = {}
+        for submission_key, response_data in responses.items():
+            items = self._translatable_responses(response_data)
+            if items:
+                translatable[submission_key] = items
+
+        # submissions with nothing to translate are already done
+        translated = {
+            key: data for key, data in responses.items() if key not in translatable
+        }
+        if not translatable:
+            return translated
+
+        reply = await self._call_provider(
+            "translate_responses",
+            self._provider.translate_responses(translatable, source_language),
+        )
+        for submission_key in translatable:
+            translated_items = reply.get(submission_key)
+            if isinstance(translated_items, dict):
+                translated[submission_key] = {
+                    **responses[submission_key],
+                    **translated_items,
+                }
+        return translated
+
+    def _translatable_responses(self, response_data: dict) -> dict:
+        """The answers worth sending for translation (non-empty text and checkbox lists)."""
         translatable_items = {}
         for key, value in response_data.items():
             if isinstance(value, str) and value.strip():
@@ -90,45 +173,7 @@ class TranslationService:
             elif isinstance(value, list) and value:
                 # Handle checkbox arrays
                 translatable_items[key] = value
-
-        if not translatable_items:
-            return response_data
-
-        # Translate in batch [This should be generalized and combined with _translate_batch()]
-        prompt = f"""Translate the following patient form responses from {source_lang_name} to English.
-                    Maintain the JSON structure exactly. Only translate the text values, not the keys.
-                    Keep medical terminology accurate and professional.
-
-                    {json.dumps(translatable_items, ensure_ascii=False)}"""
-
-        response = await self._client.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=[
-                {
-                    "role": "system",
-                    "content": "You are a professional medical translator. Translate accurately while maintaining medical terminology precision.",
-                },
-                {"role": "user", "content": prompt},
-            ],
-            temperature=0.3,
-        )
-
-        # return first and only response's content
-        translated_text = response.choices[0].message.content.strip()
-
-        # Remove markdown code blocks if present
-        if translated_text.startswith("```"):
-            lines = translated_text.split("\n")
-            translated_text = "\n".join(lines[1:-1])
-
-        translated_items = json.loads(translated_text)
-
-        # Merge translated values back into original response data
-        translated_response = response_data.copy()
-        for key, value in translated_items.items():
-            translated_response[key] = value
-
-        return translated_response
+        return translatable_items
 
     async def translate_form_fields(
         self, fields: list[dict], target_language: str
@@ -145,16 +190,201 @@ class TranslationService:
         """
         if target_language == "en":
             return fields
-            # default value
-        target_lang_name = SUPPORTED_LANGUAGES.get(target_language, target_language)
 
         translatable_content = self._extract_translatable_content(fields)
-        translated_content = await self._translate_batch(
-            translatable_content, target_lang_name
-        )
+        if self._memory is None:
+            translated_content = await self._translate_chunked(
+                translatable_content, target_language
+            )
+        else:
+            translated_content = await self._translate_with_memory(
+                translatable_content, target_language
+            )
 
         return self._apply_translations(fields, translated_content)
 
+    async def stream_form_fields(
+        self, fields: list[dict], target_language: str
+    ) -> AsyncIterator[tuple[int, dict]]:
+        """
+        Translate form fields, yielding each field as soon as its translation arrives.
+        Uses the model's streaming API, so the first fields are ready after
+        roughly one chunk's latency instead of the whole form's.
+
+        Args:
+            fields: List of field dictionaries containing translatable text
+            target_language: Language code (e.g., 'es' for Spanish)
+
+        Yields:
+            (index, translated_field) pairs, in no particular order
+        """
+        if target_language == "en":
+            for index, field in enumerate(fields):
+                yield index, field
+            return
+
+        content = self._extract_translatable_content(fields)
+        known = {}
+        pending = content
+        if self._memory is not None:
+            known = await self._lookup_memory(content, target_language)
+            pending = self._unseen_content(content, known)
+
+        # fields the memory fully covers are ready right away
+        pending_indices = {item["index"] for item in pending}
+        for item in content:
+            if item["index"] not in pending_indices:
+                translation = self._merge_translation(item, {}, known)
+                yield item["index"], self._apply_translation(
+                    fields[item["index"]], translation
+                )
+
+        if not pending:
+            return
+
+        # stream every chunk concurrently into one queue
+        queue: asyncio.Queue = asyncio.Queue()
+        semaphore = asyncio.Semaphore(TRANSLATION_CHUNK_CONCURRENCY)
+
+        async def stream_chunk(chunk: list[dict]):
+            remaining = {item["index"]: item for item in chunk}
+            async with semaphore:
+                for attempt in range(1, TRANSLATION_CHUNK_ATTEMPTS + 1):
+                    try:
+                        # on a retry, only ask for the items that haven't arrived
+                        async for translation in self._stream_provider(
+                            list(remaining.values()), target_language
+                        ):
+                            if translation.get("index") in remaining:
+                                del remaining[translation["index"]]
+                                await queue.put(translation)
+                        if not remaining:
+                            return
+                        raise ValueError(
+                            f"Translation reply is missing fields {sorted(remaining)}"
+                        )
+                    except Exception as e:
+                        if attempt == TRANSLATION_CHUNK_ATTEMPTS:
+                            raise
+                        print(
+                            f"Warning: Retrying translation chunk (attempt {attempt} failed): {e}"
+                        )
+
+        async def stream_all():
+            try:
+                await asyncio.gather(
+                    *(stream_chunk(chunk) for chunk in self._chunk_content(pending))
+                )
+                await queue.put(None)
+            except Exception as e:
+                await queue.put(e)
+
+        producer = asyncio.ensure_future(stream_all())
+        content_by_index = {item["index"]: item for item in content}
+        learned = {}
+        try:
+            while (translation := await queue.get()) is not None:
+                if isinstance(translation, Exception):
+                    raise translation
+                item = content_by_index[translation["index"]]
+                self._learn_segments(item, translation, learned)
+                merged = self._merge_translation(item, translation, known)
+                yield item["index"], self._apply_translation(
+                    fields[item["index"]], merged
+                )
+        finally:
+            producer.cancel()
+
+        if self._memory is not None:
+            await self._memory.save(learned, target_language)
+
+    async def _translate_with_memory(
+        self, content: list[dict], target_language: str
+    ) -> list[dict]:
+        """
+        Translate extracted field content, sending only segments the memory hasn't seen.
+
+        Args:
+            content: Output of _extract_translatable_content()
+            target_language: Language code (e.g., 'es')
+
+        Returns:
+            Translated content in the same shape as _translate_chunked() returns
+        """
+        known = await self._lookup_memory(content, target_language)
+        pending = self._unseen_content(content, known)
+
+        translated_by_index = {}
+        if pending:
+            translated = await self._translate_chunked(pending, target_language)
+            translated_by_index = {t["index"]: t for t in translated}
+
+        # remember newly translated segments for future forms
+        learned = {}
+        for item in pending:
+            self._learn_segments(item, translated_by_index.get(item["index"], {}), learned)
+        await self._memory.save(learned, target_language)
+
+        # merge fresh translations with remembered ones
+        return [
+            self._merge_translation(item, translated_by_index.get(item["index"], {}), known)
+            for item in content
+        ]
+
+    async def _lookup_memory(
+        self, content: list[dict], target_language: str
+    ) -> dict[str, str]:
+        """Look up every segment of the content in translation memory."""
+        segments = set()
+        for item in content:
+            segments.update(self._item_segments(item))
+        known = await self._memory.lookup(list(segments), target_language)
+        record_cache_lookup("memory", len(known), len(segments) - len(known))
+        return known
+
+    def _unseen_content(self, content: list[dict], known: dict[str, str]) -> list[dict]:
+        """Keep only the text the memory doesn't know (options are sent as a whole list)."""
+        pending = []
+        for item in content:
+            unseen = {"index": item["index"]}
+            for key in ("label", "placeholder"):
+                if key in item and item[key] not in known:
+                    unseen[key] = item[key]
+            if "options" in item and any(o not in known for o in item["options"]):
+                unseen["options"] = item["options"]
+            if len(unseen) > 1:
+                pending.append(unseen)
+        return pending
+
+    def _learn_segments(self, item: dict, translation: dict, learned: dict[str, str]):
+        """Record the segment translations of one translated item in learned."""
+        for key in ("label", "placeholder"):
+            if key in item and key in translation:
+                learned[item[key]] = translation[key]
+        options = translation.get("options")
+        if "options" in item and options and len(options) == len(item["options"]):
+            learned.update(zip(item["options"], options))
+
+    def _merge_translation(
+        self, item: dict, translation: dict, known: dict[str, str]
+    ) -> dict:
+        """Fill one content item from its fresh translation, falling back to memory."""
+        merged_item = {"index": item["index"]}
+        for key in ("label", "placeholder"):
+            if key in item:
+                merged_item[key] = translation.get(key, known.get(item[key], item[key]))
+        if "options" in item:
+            merged_item["options"] = translation.get("options") or [
+                known.get(option, option) for option in item["options"]
+            ]
+        return merged_item
+
+    def _item_segments(self, item: dict) -> list[str]:
+        """List the text segments (label, placeholder, options) of one content item."""
+        segments = [item[key] for key in ("label", "placeholder") if key in item]
+        segments.extend(item.get("options", []))
+        return [segment for segment in segments if isinstance(segment, str)]
+
     def _extract_translatable_content(self, fields: list[dict]) -> list[dict]:
         """Extract translatable text from fields."""
         content = []
@@ -169,60 +399,91 @@ class TranslationService:
             content.append(item)
         return content
 
-    async def _translate_batch(
+    def _chunk_content(self, content: list[dict]) -> list[list[dict]]:
+        """Split content into chunks bounded by field count and JSON size."""
+        chunks = []
+        current, current_chars = [], 0
+        for item in content:
+            item_chars = len(json.dumps(item, ensure_ascii=False))
+            if current and (
+                len(current) >= TRANSLATION_CHUNK_MAX_FIELDS
+                or current_chars + item_chars > TRANSLATION_CHUNK_MAX_CHARS
+            ):
+                chunks.append(current)
+                current, current_chars = [], 0
+            current.append(item)
+            current_chars += item_chars
+        if current:
+            chunks.append(current)
+        return chunks
+
+    async def _translate_chunked(
         self, content: list[dict], target_language: str
     ) -> list[dict]:
-        """Translate batch of content using OpenAI."""
-        prompt = f"""Translate the following form field content to {target_language}. 
-                    Maintain the JSON structure exactly. Only translate the text values, not the keys.
-                    Keep medical terminology accurate and professional.
-
-                    {json.dumps(content, ensure_ascii=False)}"""
-
-        response = await self._client.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=[
-                {
-                    "role": "system",
-                    "content": "You are a professional medical translator. Translate accurately while maintaining medical terminology precision.",
-                },
-                {"role": "user", "content": prompt},
-            ],
-            temperature=0.3,
-        )
+        """
+        Translate content in size-bounded chunks, several at a time.
+        A chunk whose reply fails or is malformed is retried on its own.
 
-        translated_text = response.choices[0].message.content.strip()
+        Args:
+            content: Items from _extract_translatable_content() (each has an "index")
+            target_language: Language code (e.g., 'es')
 
-        # Remove markdown code blocks if present
-        if translated_text.startswith("```"):
-            lines = translated_text.split("\n")
-            translated_text = "\n".join(lines[1:-1])
+        Returns:
+            Translated items for every chunk, in the original order
+        """
+        semaphore = asyncio.Semaphore(TRANSLATION_CHUNK_CONCURRENCY)
+
+        async def translate_chunk(chunk: list[dict]) -> list[dict]:
+            async with semaphore:
+                for attempt in range(1, TRANSLATION_CHUNK_ATTEMPTS + 1):
+                    try:
+                        translated = await self._call_provider(
+                            "translate_items",
+                            self._provider.translate_items(chunk, target_language),
+                        )
+                        self._check_chunk_reply(chunk, translated)
+                        return translated
+                    except Exception as e:
+                        if attempt == TRANSLATION_CHUNK_ATTEMPTS:
+                            raise
+                        print(
+                            f"Warning: Retrying translation chunk (attempt {attempt} failed): {e}"
+                        )
+
+        translated_chunks = await asyncio.gather(
+            *(translate_chunk(chunk) for chunk in self._chunk_content(content))
+        )
+        return [item for chunk in translated_chunks for item in chunk]
 
-        return json.loads(translated_text)
+    def _check_chunk_reply(self, chunk: list[dict], translated) -> None:
+        """Raise ValueError unless the reply has a translation for every item in the chunk."""
+        if not isinstance(translated, list):
+            raise ValueError("Translation reply is not a list")
+        returned = {t.get("index") for t in translated if isinstance(t, dict)}
+        missing = {item["index"] for item in chunk} - returned
+        if missing:
+            raise ValueError(f"Translation reply is missing fields {sorted(missing)}")
 
     def _apply_translations(
         self, original_fields: list[dict], translations: list[dict]
     ) -> list[dict]:
-        """Apply translations to original fields."""
-        translated_fields = []
-
-        for field in original_fields:
-            translated_field = field.copy()
-
-            # Find matching translation by index
-            translation = next(
-                (t for t in translations if t["index"] == original_fields.index(field)),
-                None,
-            )
-
-            if translation:
-                if "label" in translation:
-                    translated_field["label"] = translation["label"]
-                if "placeholder" in translation:
-                    translated_field["placeholder"] = translation["placeholder"]
-                if "options" in translation:
-                    translated_field["options"] = translation["options"]
-
-            translated_fields.append(translated_field)
-
-        return translated_fields
+        """Apply translations to original fields (matched by each field's position)."""
+        translations_by_index = {t["index"]: t for t in translations if "index" in t}
+        return [
+            self._apply_translation(field, translations_by_index.get(index))
+            for index, field in enumerate(original_fields)
+        ]
+
+    def _apply_translation(self, field: dict, translation: Optional[dict]) -> dict:
+        """Apply one translated content item to a copy of its field."""
+        translated_field = field.copy()
+
+        if translation:
+            if "label" in translation:
+                translated_field["label"] = translation["label"]
+            if "placeholder" in translation:
+                translated_field["placeholder"] = translation["placeholder"]
+            if "options" in translation:
+                translated_field["options"] = translation["options"]
+
+        return translated_field
@@ -5,40 +5,129 @@ This file is automatically discovered by pytest and provides common fixtures.
 
 from fastapi.testclient import TestClient
 from sqlmodel import create_engine, Session, SQLModel
-from sqlalchemy.pool import StaticPool
+from sqlmodel.ext.asyncio.session import AsyncSession
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+from sqlalchemy.pool import NullPool
 import pytest
+import tempfile
 import sys
 import os
 
 # update sys.path to be the backend directory
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
-from main import app, get_session
+from main import (
+    app,
+    get_session,
+    get_session_factory,
+    get_translator,
+    get_submission_writer,
+    latest_form_cache,
+    _job_handlers,
+)
+from services.job_queue import JobWorkers
+from services.metrics import instrument_engine
+from services.submission_writer import SubmissionWriter
 
-# database reference (sqlite://:in-memory SQLite database)
-DATABASE_URL = "sqlite://"
+# database reference (temporary SQLite file)
+# a file (not :memory:) so the sync fixture session and the async app engine see the same data
+DATABASE_PATH = os.path.join(tempfile.mkdtemp(), "test.db")
 engine = create_engine(
-    DATABASE_URL,
+    f"sqlite:///{DATABASE_PATH}",
     connect_args={"check_same_thread": False},  # allow multithreading
-    poolclass=StaticPool,  # need this for shared session between pytest.fixture and fastapi app
+)
+async_engine = create_async_engine(
+    f"sqlite+aiosqlite:///{DATABASE_PATH}",
+    poolclass=NullPool,  # TestClient runs each request on its own event loop
+)
+instrument_engine(async_engine)
+async_test_session = async_sessionmaker(
+    async_engine, class_=AsyncSession, expire_on_commit=False
 )
 
 
 # create test session
-def get_test_session():
-    with Session(engine) as session:
+async def get_test_session():
+    async with async_test_session() as session:
         yield session
 
 
 # override get_session with get_test_session
 app.dependency_overrides[get_session] = get_test_session
+app.dependency_overrides[get_session_factory] = lambda: async_test_session
+
+# submissions are group-committed to the test database
+submission_writer = SubmissionWriter(async_test_session)
+app.dependency_overrides[get_submission_writer] = lambda: submission_writer
+
+
+class FakeTranslator:
+    """
+    Stand-in for TranslationService that never calls OpenAI.
+    "Translates" by prefixing text with the target language code, e.g. "[es] Name".
+    Grouped back-translation requests are recorded in grouped_calls.
+    """
+
+    def __init__(self):
+        self.grouped_calls = []
+
+    def _translate(self, text, language):
+        return f"[{language}] {text}"
+
+    async def translate_form_name(self, form_name, target_language):
+        if target_language == "en":
+            return form_name
+        return self._translate(form_name, target_language)
+
+    async def translate_form_fields(self, fields, target_language):
+        if target_language == "en":
+            return fields
+        translated_fields = []
+        for field in fields:
+            translated_field = field.copy()
+            for key in ("label", "placeholder"):
+                if key in field:
+                    translated_field[key] = self._translate(field[key], target_language)
+            if field.get("options"):
+                translated_field["options"] = [
+                    self._translate(option, target_language)
+                    for option in field["options"]
+                ]
+            translated_fields.append(translated_field)
+        return translated_fields
+
+    async def stream_form_fields(self, fields, target_language):
+        translated_fields = await self.translate_form_fields(fields, target_language)
+        for index, field in enumerate(translated_fields):
+            yield index, field
+
+    async def translate_responses_to_english(self, response_data, source_language):
+        if source_language == "en":
+            return response_data
+        return {
+            key: self._translate(value, "en") if isinstance(value, str) else value
+            for key, value in response_data.items()
+        }
+
+    async def translate_submissions_to_english(self, responses, source_language):
+        self.grouped_calls.append(sorted(responses))
+        return {
+            key: await self.translate_responses_to_english(response_data, source_language)
+            for key, response_data in responses.items()
+        }
+
+
+# override get_translator with a shared FakeTranslator
+fake_translator = FakeTranslator()
+app.dependency_overrides[get_translator] = lambda: fake_translator
 
 
 # A pytest fixture is a function that runs before each test function that uses it.
 @pytest.fixture(name="session")
 def session_fixture():
-    # create the database tables
+    # create the database tables (and forget forms cached by earlier tests)
     SQLModel.metadata.create_all(engine)
+    latest_form_cache.invalidate()
     with Session(engine) as session:
         # yield the session to the test
         yield session
@@ -57,3 +146,18 @@ client = TestClient(app)
 def client_fixture():
     """Provide a test client for making HTTP requests."""
     return client
+
+
+@pytest.fixture(name="translator")
+def translator_fixture():
+    """Provide the fake translator used by the app under test."""
+    return fake_translator
+
+
+@pytest.fixture(name="job_workers")
+def job_workers_fixture():
+    """
+    Provide translation job workers wired to the test database and fake translator.
+    Tests run queued jobs with asyncio.run(job_workers.run_until_idle()).
+    """
+    return JobWorkers(async_test_session, _job_handlers(fake_translator, async_test_session), 2)
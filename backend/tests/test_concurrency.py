@@ -0,0 +1,273 @@
+"""
+Tests for concurrent request handling.
+Focus: Slow database or translation work overlaps instead of running one at a time.
+"""
+
+import asyncio
+import json
+import time
+
+import httpx
+from fastapi import Request
+from sqlalchemy import event, text
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+from sqlalchemy.pool import NullPool
+from sqlmodel import Session, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from main import app, get_session, get_translator, _job_handlers
+from models import Form, TranslatedForm
+from services.job_queue import JobWorkers, enqueue_job, PRECACHE_FORM
+from services.single_flight import SingleFlight, EventBroadcast
+from conftest import DATABASE_PATH, get_test_session, async_test_session, fake_translator
+
+SLOW_QUERY_MS = 500
+
+
+def _sleep_ms(ms):
+    """SQLite function that blocks the connection's thread, like a slow query would."""
+    time.sleep(ms / 1000)
+    return ms
+
+
+def test_slow_query_does_not_block_other_requests(session: Session):
+    """A slow /api/submissions query should not delay /api/forms/latest."""
+    session.add(
+        Form(
+            id="form-1",
+            form_name="Intake",
+            fields=json.dumps([{"name": "field1", "type": "text"}]),
+        )
+    )
+    session.commit()
+
+    slow_engine = create_async_engine(
+        f"sqlite+aiosqlite:///{DATABASE_PATH}", poolclass=NullPool
+    )
+
+    @event.listens_for(slow_engine.sync_engine, "connect")
+    def _register_sleep(dbapi_connection, connection_record):
+        dbapi_connection.create_function("sleep_ms", 1, _sleep_ms)
+
+    slow_session = async_sessionmaker(
+        slow_engine, class_=AsyncSession, expire_on_commit=False
+    )
+
+    # only the submissions listing pays for the slow query
+    async def get_slow_session(request: Request):
+        async with slow_session() as db_session:
+            if request.url.path == "/api/submissions":
+                await db_session.exec(text(f"SELECT sleep_ms({SLOW_QUERY_MS})"))
+            yield db_session
+
+    async def run_requests():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(
+            transport=transport, base_url="http://test"
+        ) as async_client:
+
+            async def timed_get(path):
+                response = await async_client.get(path)
+                return response, time.perf_counter()
+
+            start = time.perf_counter()
+            slow, fast = await asyncio.gather(
+                timed_get("/api/submissions"), timed_get("/api/forms/latest")
+            )
+            return start, slow, fast
+
+    app.dependency_overrides[get_session] = get_slow_session
+    try:
+        start, (slow_response, slow_done), (fast_response, fast_done) = asyncio.run(
+            run_requests()
+        )
+    finally:
+        app.dependency_overrides[get_session] = get_test_session
+        asyncio.run(slow_engine.dispose())
+
+    # verify both requests succeeded
+    assert slow_response.status_code == 200
+    assert fast_response.status_code == 200
+    assert fast_response.json()["form_name"] == "Intake"
+
+    # the fast request finished while the slow query was still running
+    assert fast_done < slow_done
+    assert fast_done - start < SLOW_QUERY_MS / 1000
+    assert slow_done - start >= SLOW_QUERY_MS / 1000
+
+
+class SlowTranslator:
+    """Translator whose calls each take a fixed time, tracking how many overlap."""
+
+    def __init__(self, delay):
+        self.delay = delay
+        self.calls = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def _call(self, result):
+        self.calls += 1
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(self.delay)
+        self.in_flight -= 1
+        return result
+
+    async def translate_form_name(self, form_name, target_language):
+        return await self._call(f"[{target_language}] {form_name}")
+
+    async def translate_form_fields(self, fields, target_language):
+        return await self._call(fields)
+
+    async def stream_form_fields(self, fields, target_language):
+        for index, field in enumerate(await self._call(fields)):
+            yield index, {**field, "label": f"[{target_language}] {field['label']}"}
+
+
+def test_precache_jobs_run_concurrently(session: Session):
+    """Pre-caching several languages should overlap, bounded by the number of job workers."""
+    languages = ["es", "fr", "de"]
+    session.add(
+        Form(id="form-1", form_name="Intake", fields=json.dumps([{"label": "Name"}]))
+    )
+    for lang_code in languages:
+        enqueue_job(
+            session, PRECACHE_FORM, {"form_id": "form-1", "language_code": lang_code}
+        )
+    session.commit()
+
+    translator = SlowTranslator(delay=0.2)
+    workers = JobWorkers(
+        async_test_session, _job_handlers(translator, async_test_session), 2
+    )
+
+    start = time.perf_counter()
+    asyncio.run(workers.run_until_idle())
+    elapsed = time.perf_counter() - start
+
+    # 2 workers, each translating a form name and fields in parallel
+    assert translator.max_in_flight == 4
+    assert elapsed < 2 * len(languages) * translator.delay
+
+    # verify every language was cached
+    cached = session.exec(select(TranslatedForm)).all()
+    assert sorted(t.language_code for t in cached) == sorted(languages)
+
+
+def test_single_flight_shares_one_call():
+    """Concurrent calls with the same key should run the work once and share its result."""
+    flights = SingleFlight()
+    calls = []
+
+    async def work(key):
+        calls.append(key)
+        await asyncio.sleep(0.05)
+        return f"result-{key}"
+
+    async def run():
+        return await asyncio.gather(
+            *(flights.do("a", lambda: work("a")) for _ in range(5)),
+            flights.do("b", lambda: work("b")),
+        )
+
+    results = asyncio.run(run())
+
+    assert results == ["result-a"] * 5 + ["result-b"]
+    assert calls == ["a", "b"]
+
+
+def test_event_broadcast_catches_up_late_subscribers():
+    """A subscriber joining mid-stream should get the earlier events, then the rest."""
+    broadcast = EventBroadcast()
+
+    async def collect():
+        return [event async for event in broadcast.subscribe()]
+
+    async def run():
+        early = asyncio.ensure_future(collect())
+        broadcast.publish("form")
+        await asyncio.sleep(0)
+        late = asyncio.ensure_future(collect())
+        broadcast.publish("field")
+        await asyncio.sleep(0)
+        broadcast.publish("done")
+        broadcast.close()
+        return await asyncio.gather(early, late)
+
+    assert asyncio.run(run()) == [["form", "field", "done"]] * 2
+
+
+def test_concurrent_cache_misses_translate_once(session: Session):
+    """Many patients loading an uncached language at once should trigger one translation."""
+    session.add(
+        Form(
+            id="form-1",
+            form_name="Intake",
+            fields=json.dumps([{"label": "Name", "type": "text"}]),
+        )
+    )
+    session.commit()
+    translator = SlowTranslator(delay=0.1)
+
+    async def run_requests():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(
+            transport=transport, base_url="http://test"
+        ) as async_client:
+            return await asyncio.gather(
+                *(async_client.get("/api/forms/latest?lang=es") for _ in range(10))
+            )
+
+    app.dependency_overrides[get_translator] = lambda: translator
+    try:
+        responses = asyncio.run(run_requests())
+    finally:
+        app.dependency_overrides[get_translator] = lambda: fake_translator
+
+    # every patient got the translation, from a single name + fields call
+    assert all(r.json()["form_name"] == "[es] Intake" for r in responses)
+    assert translator.calls == 2
+
+    # verify only one cached row was written
+    cached = session.exec(select(TranslatedForm)).all()
+    assert len(cached) == 1
+
+
+def test_concurrent_stream_misses_translate_once(session: Session):
+    """Patients streaming an uncached language at once should share one streaming translation."""
+    session.add(
+        Form(
+            id="form-1",
+            form_name="Intake",
+            fields=json.dumps([{"label": "Name", "type": "text"}]),
+        )
+    )
+    session.commit()
+    translator = SlowTranslator(delay=0.1)
+
+    async def run_requests():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(
+            transport=transport, base_url="http://test"
+        ) as async_client:
+            streams = [async_client.get("/api/forms/latest/stream?lang=es") for _ in range(10)]
+            # a plain /api/forms/latest miss joins the same translation
+            return await asyncio.gather(*streams, async_client.get("/api/forms/latest?lang=es"))
+
+    app.dependency_overrides[get_translator] = lambda: translator
+    try:
+        *streams, latest = asyncio.run(run_requests())
+    finally:
+        app.dependency_overrides[get_translator] = lambda: fake_translator
+
+    # every patient got the whole translated stream, from a single name + fields call
+    assert len({response.text for response in streams}) == 1
+    assert '"form_name": "[es] Intake"' in streams[0].text
+    assert '"label": "[es] Name"' in streams[0].text
+    assert streams[0].text.endswith("event: done\ndata: {}\n\n")
+    assert latest.json()["form_name"] == "[es] Intake"
+    assert translator.calls == 2
+
+    # verify only one cached row was written
+    cached = session.exec(select(TranslatedForm)).all()
+    assert len(cached) == 1
@@ -0,0 +1,113 @@
+"""
+Tests for the database engine setup.
+Focus: SQLite storage profiles (PRAGMAs on new connections and pool settings)
+and upgrading database files made by older versions.
+"""
+
+import asyncio
+import sqlite3
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import IntegrityError
+from sqlmodel import SQLModel
+
+from database import create_database_engine, upgrade_schema
+
+
+def _pragmas(engine, names):
+    async def read():
+        async with engine.connect() as conn:
+            values = {
+                name: (await conn.execute(text(f"PRAGMA {name}"))).scalar()
+                for name in names
+            }
+        await engine.dispose()
+        return values
+
+    return asyncio.run(read())
+
+
+def test_tuned_profile_applies_pragmas(tmp_path):
+    """Every connection from a tuned engine should use WAL, NORMAL sync and a busy timeout."""
+    engine = create_database_engine(f"sqlite+aiosqlite:///{tmp_path / 'tuned.db'}", "tuned")
+
+    values = _pragmas(
+        engine, ["journal_mode", "synchronous", "busy_timeout", "cache_size", "mmap_size"]
+    )
+
+    assert values == {
+        "journal_mode": "wal",
+        "synchronous": 1,  # NORMAL
+        "busy_timeout": 5000,
+        "cache_size": -65536,
+        "mmap_size": 268435456,
+    }
+    assert engine.pool.size() == 8
+
+
+def test_default_profile_keeps_sqlite_defaults(tmp_path):
+    """The default profile should leave SQLite's rollback journal and full sync."""
+    engine = create_database_engine(f"sqlite+aiosqlite:///{tmp_path / 'default.db'}", "default")
+
+    values = _pragmas(engine, ["journal_mode", "synchronous"])
+
+    assert values == {"journal_mode": "delete", "synchronous": 2}  # FULL
+
+
+def test_unknown_profile_is_rejected(tmp_path):
+    """Test that a misspelled profile name fails instead of silently using defaults."""
+    with pytest.raises(ValueError, match="Unknown SQLite storage profile"):
+        create_database_engine(f"sqlite+aiosqlite:///{tmp_path / 'x.db'}", "fast")
+
+
+# the tables as the committed database.db has them (before language/status columns)
+OLD_SCHEMA = """
+CREATE TABLE form (id VARCHAR NOT NULL, form_name VARCHAR NOT NULL,
+    fields VARCHAR NOT NULL, created_at DATETIME NOT NULL, PRIMARY KEY (id));
+CREATE TABLE formsubmission (id INTEGER NOT NULL, form_id VARCHAR NOT NULL,
+    submission_data VARCHAR NOT NULL, submitted_at DATETIME NOT NULL, PRIMARY KEY (id));
+CREATE TABLE translatedform (id INTEGER NOT NULL, form_id VARCHAR NOT NULL,
+    language_code VARCHAR NOT NULL, translated_form_name VARCHAR NOT NULL,
+    translated_fields VARCHAR NOT NULL, created_at DATETIME NOT NULL, PRIMARY KEY (id));
+INSERT INTO formsubmission VALUES (1, 'form-1', '{}', '2025-01-01 00:00:00');
+INSERT INTO translatedform VALUES (1, 'form-1', 'es', 'A', '[]', '2025-01-01 00:00:00');
+INSERT INTO translatedform VALUES (2, 'form-1', 'es', 'B', '[]', '2025-01-02 00:00:00');
+"""
+
+
+def test_upgrade_schema_migrates_old_database(tmp_path):
+    """An older database file should get the new columns, indexes and unique constraint."""
+    path = tmp_path / "old.db"
+    with sqlite3.connect(path) as conn:
+        conn.executescript(OLD_SCHEMA)
+    engine = create_database_engine(f"sqlite+aiosqlite:///{path}", "default")
+
+    async def upgrade_and_check():
+        # twice, as on every startup
+        for _ in range(2):
+            async with engine.begin() as conn:
+                await conn.run_sync(SQLModel.metadata.create_all)
+                await conn.run_sync(upgrade_schema)
+
+        async with engine.connect() as conn:
+            submission = (
+                await conn.execute(text("SELECT language, translation_status FROM formsubmission"))
+            ).one()
+            indexes = {
+                row[1] for row in await conn.execute(text("PRAGMA index_list(formsubmission)"))
+            }
+            names = (await conn.execute(text("SELECT translated_form_name FROM translatedform"))).all()
+            with pytest.raises(IntegrityError):
+                await conn.execute(
+                    text("INSERT INTO translatedform VALUES (3, 'form-1', 'es', 'C', '[]', '')")
+                )
+        await engine.dispose()
+        return submission, indexes, names
+
+    submission, indexes, names = asyncio.run(upgrade_and_check())
+
+    assert tuple(submission) == ("en", "complete")
+    assert "ix_formsubmission_form_id_submitted_at" in indexes
+    # the duplicate cached translation was dropped (first one kept)
+    assert [tuple(row) for row in names] == [("A",)]
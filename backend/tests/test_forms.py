@@ -3,7 +3,18 @@ Tests for form-related endpoints.
 Focus: Form creation, retrieval, and management.
 """
 
-from sqlmodel import Session
+import asyncio
+import json
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.exc import IntegrityError
+from sqlmodel import Session, select
+from models import TranslatedForm, TranslationJob
+import main
+from main import app, get_translator, latest_form_cache, _translate_and_cache
+from config.constants import PRE_CACHE_LANGUAGES, FORM_CACHE_CONTROL
+from conftest import async_engine, async_test_session, fake_translator
 
 
 def test_create_form(session: Session, client):
@@ -128,3 +139,358 @@ def test_get_all_forms(session: Session, client):
     assert all("form_name" in item for item in data)
     assert all("fields" in item for item in data)
     assert all("created_at" in item for item in data)
+
+
+def test_get_latest_form_translated(session: Session, client):
+    """Test retrieving the latest form in another language."""
+    form_data = {
+        "form_name": "Intake Form",
+        "fields": [{"id": "name", "label": "Full Name", "type": "text"}],
+    }
+    client.post("/api/forms", json=form_data)
+
+    response = client.get("/api/forms/latest?lang=es")
+
+    # verify the translated form name and field label
+    assert response.status_code == 200
+    data = response.json()
+    assert data["form_name"] == "[es] Intake Form"
+    assert data["fields"][0]["label"] == "[es] Full Name"
+    assert data["fields"][0]["type"] == "text"
+
+
+def test_create_form_precaches_translations(session: Session, client, job_workers):
+    """Test that creating a form queues jobs that cache translations for pre-cache languages."""
+    form_data = {
+        "form_name": "Intake Form",
+        "fields": [{"id": "name", "label": "Full Name", "type": "text"}],
+    }
+    form_id = client.post("/api/forms", json=form_data).json()["form_id"]
+
+    # verify one queued job per pre-cache language, then run them
+    jobs = session.exec(select(TranslationJob)).all()
+    assert len(jobs) == len(PRE_CACHE_LANGUAGES)
+    assert all(job.status == "queued" for job in jobs)
+    asyncio.run(job_workers.run_until_idle())
+
+    # verify one cached translation per pre-cache language
+    statement = select(TranslatedForm).where(TranslatedForm.form_id == form_id)
+    cached = session.exec(statement).all()
+    assert sorted(t.language_code for t in cached) == sorted(PRE_CACHE_LANGUAGES)
+    assert all(t.translated_form_name.endswith("Intake Form") for t in cached)
+
+
+def test_translated_form_unique_per_language(session: Session):
+    """Test that a form can only have one cached translation per language."""
+    session.add(
+        TranslatedForm(
+            form_id="form-1",
+            language_code="es",
+            translated_form_name="Formulario",
+            translated_fields="[]",
+        )
+    )
+    session.commit()
+
+    # Attempt to cache the same form and language again
+    session.add(
+        TranslatedForm(
+            form_id="form-1",
+            language_code="es",
+            translated_form_name="Formulario",
+            translated_fields="[]",
+        )
+    )
+
+    # This should raise an error due to unique constraint
+    with pytest.raises(IntegrityError):
+        session.commit()
+    session.rollback()
+
+
+def test_get_latest_form_served_from_memory(session: Session, client):
+    """Test that repeat requests for the latest form run no SQL."""
+    client.post("/api/forms", json={"form_name": "Cached Form", "fields": []})
+    first = client.get("/api/forms/latest?lang=es")
+
+    # count SQL statements issued by the app from here on
+    statements = []
+
+    def count_statement(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(async_engine.sync_engine, "before_cursor_execute", count_statement)
+    try:
+        second = client.get("/api/forms/latest?lang=es")
+    finally:
+        event.remove(
+            async_engine.sync_engine, "before_cursor_execute", count_statement
+        )
+
+    assert second.status_code == 200
+    assert second.json() == first.json()
+    assert statements == []
+
+
+def test_create_form_invalidates_latest_form_cache(session: Session, client):
+    """Test that a newly created form replaces the cached latest form."""
+    client.post("/api/forms", json={"form_name": "Old Form", "fields": []})
+    assert client.get("/api/forms/latest").json()["form_name"] == "Old Form"
+
+    client.post("/api/forms", json={"form_name": "New Form", "fields": []})
+
+    assert client.get("/api/forms/latest").json()["form_name"] == "New Form"
+
+
+def test_get_latest_form_not_modified(session: Session, client):
+    """Test ETag / If-None-Match revalidation of the latest form."""
+    client.post("/api/forms", json={"form_name": "Intake", "fields": []})
+    first = client.get("/api/forms/latest?lang=es")
+    etag = first.headers["etag"]
+
+    # verify it must be revalidated, since a newer form can replace it
+    assert first.headers["cache-control"] == "no-cache"
+
+    # verify a matching If-None-Match gets an empty 304 (from memory or not)
+    for _ in range(2):
+        response = client.get(
+            "/api/forms/latest?lang=es", headers={"If-None-Match": etag}
+        )
+        assert response.status_code == 304
+        assert response.content == b""
+        assert response.headers["etag"] == etag
+        latest_form_cache.invalidate()
+
+    # verify each language and each new form has its own ETag
+    assert client.get("/api/forms/latest").headers["etag"] != etag
+    client.post("/api/forms", json={"form_name": "Intake v2", "fields": []})
+    response = client.get("/api/forms/latest?lang=es", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.json()["form_name"] == "[es] Intake v2"
+
+
+def test_get_latest_form_fallback_not_cached(session: Session, client):
+    """Test that the English fallback for an untranslated language isn't cached by the browser."""
+    client.post("/api/forms", json={"form_name": "Intake", "fields": []})
+
+    app.dependency_overrides[get_translator] = lambda: None
+    try:
+        response = client.get("/api/forms/latest?lang=es")
+    finally:
+        app.dependency_overrides[get_translator] = lambda: fake_translator
+
+    assert response.json()["form_name"] == "Intake"
+    assert response.headers["cache-control"] == "no-store"
+    assert "etag" not in response.headers
+
+
+def test_get_form_not_modified(session: Session, client):
+    """Test that a form by id is cacheable and revalidates with a 304."""
+    form_id = client.post(
+        "/api/forms", json={"form_name": "Intake", "fields": []}
+    ).json()["form_id"]
+    first = client.get(f"/api/forms/{form_id}")
+
+    # verify forms can be reused by the browser, since they never change
+    assert first.headers["cache-control"] == FORM_CACHE_CONTROL
+
+    # verify a matching ETag (also as a weak or listed one) gets a 304
+    etag = first.headers["etag"]
+    for if_none_match in [etag, f"W/{etag}", f'"other", {etag}', "*"]:
+        response = client.get(
+            f"/api/forms/{form_id}", headers={"If-None-Match": if_none_match}
+        )
+        assert response.status_code == 304
+
+    response = client.get(f"/api/forms/{form_id}", headers={"If-None-Match": '"other"'})
+    assert response.status_code == 200
+
+
+def test_not_modified_skips_building_the_body(session: Session, client, monkeypatch):
+    """A 304 should be answered from the ETag alone, without serializing the form."""
+    form_id = client.post(
+        "/api/forms", json={"form_name": "Intake", "fields": []}
+    ).json()["form_id"]
+    form_etag = client.get(f"/api/forms/{form_id}").headers["etag"]
+    latest_etag = client.get("/api/forms/latest").headers["etag"]
+    latest_form_cache.invalidate()
+
+    built = []
+    monkeypatch.setattr(main, "json_object", lambda data: built.append(data) or b"{}")
+
+    response = client.get(f"/api/forms/{form_id}", headers={"If-None-Match": form_etag})
+    assert response.status_code == 304
+    response = client.get("/api/forms/latest", headers={"If-None-Match": latest_etag})
+    assert response.status_code == 304
+    assert built == []
+
+
+def parse_events(body):
+    """Parse a Server-Sent Events body into (event, data) pairs."""
+    events = []
+    for block in body.strip().split("\n\n"):
+        lines = dict(line.split(": ", 1) for line in block.split("\n"))
+        events.append((lines["event"], json.loads(lines["data"])))
+    return events
+
+
+def test_stream_latest_form_translated(session: Session, client):
+    """Test streaming the latest form in another language."""
+    form_data = {
+        "form_name": "Intake Form",
+        "fields": [
+            {"id": "name", "label": "Full Name", "type": "text"},
+            {"id": "dob", "label": "Date of Birth", "type": "date"},
+        ],
+    }
+    form_id = client.post("/api/forms", json=form_data).json()["form_id"]
+
+    response = client.get("/api/forms/latest/stream?lang=es")
+
+    # verify the form event comes first, then each field, then done
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+    events = parse_events(response.text)
+    assert events[0] == (
+        "form",
+        {"id": form_id, "form_name": "[es] Intake Form", "field_count": 2},
+    )
+    fields = {data["index"]: data["field"] for name, data in events if name == "field"}
+    assert fields[0]["label"] == "[es] Full Name"
+    assert fields[1]["label"] == "[es] Date of Birth"
+    assert events[-1] == ("done", {})
+
+    # verify the streamed translation was cached
+    statement = select(TranslatedForm).where(TranslatedForm.language_code == "es")
+    assert session.exec(statement).first().translated_form_name == "[es] Intake Form"
+
+
+def test_latest_form_rejects_unsupported_language(session: Session, client):
+    """Unknown ?lang= values should be rejected, not cached as their own entries."""
+    client.post("/api/forms", json={"form_name": "Intake", "fields": []})
+
+    for path in ("/api/forms/latest", "/api/forms/latest/stream"):
+        response = client.get(path, params={"lang": "xx"})
+        assert response.status_code == 400
+        assert response.json() == {"detail": "Unsupported language: xx"}
+    assert latest_form_cache.get("xx") is None
+
+
+def test_stream_latest_form_english(session: Session, client):
+    """Test streaming the latest form in English."""
+    form_data = {
+        "form_name": "Intake Form",
+        "fields": [{"id": "name", "label": "Full Name", "type": "text"}],
+    }
+    client.post("/api/forms", json=form_data)
+
+    events = parse_events(client.get("/api/forms/latest/stream").text)
+
+    assert [name for name, data in events] == ["form", "field", "done"]
+    assert events[1][1] == {"index": 0, "field": form_data["fields"][0]}
+
+
+def test_stream_latest_form_empty_database(session: Session, client):
+    """Test streaming when no forms exist."""
+    response = client.get("/api/forms/latest/stream")
+
+    assert response.status_code == 404
+    assert response.json() == {"detail": "No forms found"}
+
+
+def test_get_latest_form_bundle(session: Session, client, job_workers):
+    """Test getting the latest form in every cached language from one query."""
+    form_data = {
+        "form_name": "Intake Form",
+        "fields": [{"id": "name", "label": "Full Name", "type": "text"}],
+    }
+    form_id = client.post("/api/forms", json=form_data).json()["form_id"]
+    asyncio.run(job_workers.run_until_idle())
+
+    # count SQL statements issued by the app
+    statements = []
+
+    def count_statement(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(async_engine.sync_engine, "before_cursor_execute", count_statement)
+    try:
+        response = client.get("/api/forms/latest/bundle")
+    finally:
+        event.remove(
+            async_engine.sync_engine, "before_cursor_execute", count_statement
+        )
+
+    # verify every supported language was assembled from a single query
+    assert response.status_code == 200
+    assert len(statements) == 1
+    data = response.json()
+    assert data["id"] == form_id
+    assert data["missing"] == []
+    assert data["translations"]["en"]["form_name"] == "Intake Form"
+    assert data["translations"]["es"]["form_name"] == "[es] Intake Form"
+    assert data["translations"]["es"]["fields"][0]["label"] == "[es] Full Name"
+
+    # verify the bundle revalidates like the single-language endpoint
+    etag = response.headers["etag"]
+    response = client.get("/api/forms/latest/bundle", headers={"If-None-Match": etag})
+    assert response.status_code == 304
+
+
+def test_get_latest_form_bundle_missing_language(session: Session, client):
+    """Test that languages without a cached translation are listed as missing."""
+    client.post("/api/forms", json={"form_name": "Intake", "fields": []})
+
+    response = client.get("/api/forms/latest/bundle?langs=es,en")
+
+    # verify English is included and Spanish is left for the stream
+    assert response.status_code == 200
+    data = response.json()
+    assert list(data["translations"]) == ["en"]
+    assert data["missing"] == ["es"]
+
+
+def test_get_latest_form_bundle_errors(session: Session, client):
+    """Test the bundle's 404 with no forms and 400 for unsupported languages."""
+    assert client.get("/api/forms/latest/bundle").status_code == 404
+
+    client.post("/api/forms", json={"form_name": "Intake", "fields": []})
+    response = client.get("/api/forms/latest/bundle?langs=es,xx")
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Unsupported language: xx"
+
+
+def test_translate_and_cache_holds_no_connection_while_translating(session: Session):
+    """The cache check's connection should be back in the pool before the translation starts."""
+    open_connections = []
+    during_translation = []
+
+    def checkout(dbapi_connection, connection_record, connection_proxy):
+        open_connections.append(connection_record)
+
+    def checkin(dbapi_connection, connection_record):
+        open_connections.remove(connection_record)
+
+    class RecordingTranslator:
+        async def translate_form_name(self, form_name, target_language):
+            during_translation.append(len(open_connections))
+            return f"[{target_language}] {form_name}"
+
+        async def translate_form_fields(self, fields, target_language):
+            during_translation.append(len(open_connections))
+            return fields
+
+    event.listen(async_engine.sync_engine, "checkout", checkout)
+    event.listen(async_engine.sync_engine, "checkin", checkin)
+    try:
+        cached = asyncio.run(
+            _translate_and_cache(
+                "form-1", "Intake", [], "es", RecordingTranslator(), async_test_session
+            )
+        )
+    finally:
+        event.remove(async_engine.sync_engine, "checkout", checkout)
+        event.remove(async_engine.sync_engine, "checkin", checkin)
+
+    assert during_translation == [0, 0]
+    assert cached.translated_form_name == "[es] Intake"
@@ -0,0 +1,234 @@
+"""
+Tests for the translation job queue and its status endpoints.
+Focus: Leasing, retries with backoff, and job status reporting.
+"""
+
+import asyncio
+from datetime import datetime, timedelta, UTC
+
+from sqlalchemy import event
+from sqlmodel import Session, select
+
+from models import TranslationJob
+from services.job_queue import JobWorkers, enqueue_job
+from config.constants import JOB_MAX_ATTEMPTS, JOB_RETRY_BASE_SECONDS
+from conftest import async_engine, async_test_session
+
+
+def add_job(session, payload=None):
+    """Queue a "test" job and return its id."""
+    job = enqueue_job(session, "test", payload or {})
+    session.commit()
+    return job.id
+
+
+def test_failed_job_is_retried_with_backoff(session: Session):
+    """Test that a failing job goes back in the queue with a delay."""
+    job_id = add_job(session)
+
+    async def failing_handler(payload, last_attempt):
+        raise RuntimeError("temporary failure")
+
+    workers = JobWorkers(async_test_session, {"test": failing_handler}, 1)
+    before = datetime.now(UTC)
+    asyncio.run(workers.run_until_idle())
+
+    # the retry waits out the backoff, so run_until_idle doesn't run it again
+    job = session.get(TranslationJob, job_id)
+    session.refresh(job)
+    assert job.status == "queued"
+    assert job.attempts == 1
+    assert job.last_error == "temporary failure"
+    assert job.run_after.replace(tzinfo=UTC) >= before + timedelta(
+        seconds=JOB_RETRY_BASE_SECONDS
+    )
+
+
+def test_job_fails_after_max_attempts(session: Session):
+    """Test that a job stops retrying once it runs out of attempts."""
+    job_id = add_job(session)
+    last_attempts = []
+
+    async def failing_handler(payload, last_attempt):
+        last_attempts.append(last_attempt)
+        raise RuntimeError("permanent failure")
+
+    workers = JobWorkers(async_test_session, {"test": failing_handler}, 1)
+    for _ in range(JOB_MAX_ATTEMPTS):
+        # make the retry due now instead of waiting for the backoff
+        job = session.get(TranslationJob, job_id)
+        session.refresh(job)
+        job.run_after = datetime.now(UTC) - timedelta(seconds=1)
+        session.add(job)
+        session.commit()
+        asyncio.run(workers.run_until_idle())
+
+    session.refresh(job)
+    assert job.status == "failed"
+    assert job.attempts == JOB_MAX_ATTEMPTS
+    assert last_attempts == [False] * (JOB_MAX_ATTEMPTS - 1) + [True]
+
+
+def test_each_job_runs_once_across_worker_pools(session: Session):
+    """Test that two worker pools (e.g. two uvicorn processes) don't run the same job."""
+    job_ids = [add_job(session, {"n": n}) for n in range(20)]
+    runs = []
+
+    async def handler(payload, last_attempt):
+        runs.append(payload["n"])
+        await asyncio.sleep(0.01)
+
+    async def run_both():
+        first = JobWorkers(async_test_session, {"test": handler}, 3)
+        second = JobWorkers(async_test_session, {"test": handler}, 3)
+        await asyncio.gather(first.run_until_idle(), second.run_until_idle())
+
+    asyncio.run(run_both())
+
+    assert sorted(runs) == list(range(20))
+    jobs = session.exec(select(TranslationJob)).all()
+    assert {job.id for job in jobs if job.status == "done"} == set(job_ids)
+
+
+def test_kind_workers_only_run_their_kind(session: Session):
+    """Test that workers dedicated to one kind of job leave the other kinds queued."""
+    other_id = add_job(session)
+    slow = enqueue_job(session, "slow", {})
+    session.commit()
+    runs = []
+
+    async def handler(payload, last_attempt):
+        runs.append(payload)
+
+    workers = JobWorkers(
+        async_test_session, {"test": handler, "slow": handler}, 0, kind_workers={"slow": 2}
+    )
+    asyncio.run(workers.run_until_idle())
+
+    session.refresh(slow)
+    assert runs == [{}]
+    assert slow.status == "done"
+    assert session.get(TranslationJob, other_id).status == "queued"
+
+
+def test_job_is_claimed_in_one_statement(session: Session):
+    """Test that leasing a job is a single UPDATE ... RETURNING (after a read-only check)."""
+    job_id = add_job(session)
+    statements = []
+
+    def record_statement(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    workers = JobWorkers(async_test_session, {"test": None}, 1)
+    event.listen(async_engine.sync_engine, "before_cursor_execute", record_statement)
+    try:
+        job = asyncio.run(workers._claim())
+    finally:
+        event.remove(async_engine.sync_engine, "before_cursor_execute", record_statement)
+
+    assert job.id == job_id
+    assert job.status == "running"
+    assert [s.split()[0] for s in statements] == ["SELECT", "UPDATE"]
+    assert "RETURNING" in statements[1]
+
+    # nothing left to claim: only the read-only check runs
+    statements.clear()
+    event.listen(async_engine.sync_engine, "before_cursor_execute", record_statement)
+    try:
+        assert asyncio.run(workers._claim()) is None
+    finally:
+        event.remove(async_engine.sync_engine, "before_cursor_execute", record_statement)
+    assert [s.split()[0] for s in statements] == ["SELECT"]
+
+
+def test_notify_wakes_one_idle_worker_per_job():
+    """Test that notify() wakes one idle worker per new job, not every idle worker."""
+    workers = JobWorkers(async_test_session, {}, 3, kind_workers={"slow": 2})
+
+    async def run():
+        waits = [
+            asyncio.create_task(workers._wait_for_jobs(kind))
+            for kind in workers._worker_kinds()
+        ]
+        await asyncio.sleep(0)
+
+        workers.notify("test")
+        await asyncio.sleep(0.01)
+        woken = [wait.done() for wait in waits]
+
+        workers.notify("slow", 5)  # more jobs than idle workers
+        await asyncio.sleep(0.01)
+        woken_after_slow = [wait.done() for wait in waits]
+
+        for wait in waits:
+            wait.cancel()
+        await asyncio.gather(*waits, return_exceptions=True)
+        return woken, woken_after_slow
+
+    woken, woken_after_slow = asyncio.run(run())
+
+    # kinds without dedicated workers wake one shared worker
+    assert woken == [True, False, False, False, False]
+    assert woken_after_slow == [True, False, False, True, True]
+    assert all(not idle for idle in workers._idle.values())
+
+
+def test_expired_lease_is_taken_over(session: Session):
+    """Test that a job whose worker died is picked up again once its lease expires."""
+    job = enqueue_job(session, "test", {})
+    job.status = "running"
+    job.attempts = 1
+    job.lease_owner = "dead-worker"
+    job.lease_expires_at = datetime.now(UTC) - timedelta(seconds=1)
+    session.commit()
+    runs = []
+
+    async def handler(payload, last_attempt):
+        runs.append(payload)
+
+    asyncio.run(JobWorkers(async_test_session, {"test": handler}, 1).run_until_idle())
+
+    session.refresh(job)
+    assert runs == [{}]
+    assert job.status == "done"
+    assert job.attempts == 2
+
+
+def test_get_job_status(session: Session, client):
+    """Test the job queue summary endpoint."""
+    client.post("/api/forms", json={"form_name": "Form", "fields": []})
+    client.post(
+        "/api/submissions",
+        json={"form_id": "form-1", "submission_data": {"a": "b"}, "language": "es"},
+    )
+
+    response = client.get("/api/jobs")
+
+    # verify counts by kind and status
+    assert response.status_code == 200
+    data = response.json()
+    assert data["counts"]["back_translate_submission"] == {"queued": 1}
+    assert sum(data["counts"]["precache_form"].values()) >= 1
+    assert data["oldest_queued_at"] is not None
+
+
+def test_get_job(session: Session, client):
+    """Test retrieving one job."""
+    job_id = add_job(session, {"form_id": "form-1"})
+
+    response = client.get(f"/api/jobs/{job_id}")
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["kind"] == "test"
+    assert data["payload"] == {"form_id": "form-1"}
+    assert data["status"] == "queued"
+    assert data["attempts"] == 0
+
+
+def test_get_nonexistent_job(session: Session, client):
+    """Test retrieving a job that does not exist."""
+    response = client.get("/api/jobs/999")
+
+    assert response.status_code == 404
+    assert response.json() == {"detail": "Job not found"}
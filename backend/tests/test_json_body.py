@@ -0,0 +1,61 @@
+"""
+Tests for pre-encoded JSON response bodies.
+Focus: Stored JSON text is spliced in as is and the result is valid JSON.
+"""
+
+import json
+from datetime import datetime
+
+from sqlmodel import Session
+
+from models import Form
+from services.json_body import RawJSON, json_array, json_object
+
+
+def test_json_object_splices_raw_values():
+    """Test that RawJSON values are copied verbatim and everything else is encoded."""
+    stored = '[{"label": "Name", "options": ["Sí", "No"]}]'
+    body = json_object(
+        {
+            "form_name": 'Intake "v2"',
+            "fields": RawJSON(stored),
+            "submitted_at": datetime(2025, 1, 1, 12, 30),
+            "next_cursor": None,
+        }
+    )
+
+    # verify the stored text is in the body unchanged
+    assert stored.encode() in body
+
+    # verify the whole body parses as expected
+    assert json.loads(body) == {
+        "form_name": 'Intake "v2"',
+        "fields": [{"label": "Name", "options": ["Sí", "No"]}],
+        "submitted_at": "2025-01-01T12:30:00",
+        "next_cursor": None,
+    }
+
+
+def test_json_array_joins_encoded_items():
+    """Test joining encoded objects into an array, including an empty one."""
+    items = [json_object({"id": 1}), json_object({"id": 2})]
+
+    assert json.loads(json_object({"items": json_array(items)})) == {
+        "items": [{"id": 1}, {"id": 2}]
+    }
+    assert json.loads(json_object({"items": json_array([])})) == {"items": []}
+
+
+def test_get_form_sends_stored_fields_as_is(session: Session, client):
+    """Test that GET /api/forms/{id} sends the stored fields text without re-encoding it."""
+    stored_fields = '[{"name": "field1", "type": "text", "label": "Dolor de cabeza"}]'
+    session.add(Form(id="form-1", form_name="Intake", fields=stored_fields))
+    session.commit()
+
+    response = client.get("/api/forms/form-1")
+
+    # verify status 200 OK with the stored text spliced into the body
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/json"
+    assert stored_fields.encode() in response.content
+    assert response.json()["fields"][0]["label"] == "Dolor de cabeza"
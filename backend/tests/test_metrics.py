@@ -0,0 +1,147 @@
+"""
+Tests for Prometheus metrics.
+Focus: /metrics output, route latency, SQL query, translation and cache metrics.
+"""
+
+import asyncio
+import json
+
+import pytest
+from sqlmodel import Session
+
+from models import Form
+from services.metrics import (
+    registry,
+    Counter,
+    Histogram,
+    HTTP_REQUEST_DURATION,
+    DB_QUERY_DURATION,
+    TRANSLATION_REQUESTS,
+    TRANSLATION_TOKENS,
+    CACHE_LOOKUPS,
+)
+from services.translation_providers import (
+    StubTranslationProvider,
+    SimulatedTranslationError,
+)
+from services.translation_service import TranslationService
+from test_translation_service import FakeChatClient, openai_translator
+
+
+def _add_form(session: Session):
+    session.add(
+        Form(
+            id="form-1",
+            form_name="Intake",
+            fields=json.dumps([{"label": "Name", "type": "text"}]),
+        )
+    )
+    session.commit()
+
+
+def test_histogram_renders_cumulative_buckets():
+    """Buckets should be cumulative and end with +Inf, _sum and _count."""
+    histogram = Histogram("latency_seconds", "Latency", ("route",), buckets=(0.1, 1.0))
+    histogram.observe(0.05, route="/a")
+    histogram.observe(0.5, route="/a")
+    histogram.observe(5.0, route="/a")
+
+    assert histogram.render() == [
+        "# HELP latency_seconds Latency",
+        "# TYPE latency_seconds histogram",
+        'latency_seconds_bucket{route="/a",le="0.1"} 1',
+        'latency_seconds_bucket{route="/a",le="1.0"} 2',
+        'latency_seconds_bucket{route="/a",le="+Inf"} 3',
+        'latency_seconds_sum{route="/a"} 5.55',
+        'latency_seconds_count{route="/a"} 3',
+    ]
+
+
+def test_counter_escapes_label_values():
+    """Quotes in label values should be escaped."""
+    counter = Counter("events_total", "Events", ("name",))
+    counter.inc(name='say "hi"')
+    counter.inc(2, name='say "hi"')
+
+    assert counter.render()[-1] == 'events_total{name="say \\"hi\\""} 3'
+
+
+def test_metrics_endpoint(session: Session, client):
+    """The endpoint should serve every metric in the Prometheus text format."""
+    response = client.get("/metrics")
+
+    # verify status 200 OK
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    for name in (
+        "http_request_duration_seconds",
+        "db_query_duration_seconds",
+        "translation_requests_total",
+        "translation_cache_lookups_total",
+    ):
+        assert f"# TYPE {name} " in response.text
+
+
+def test_requests_are_timed_by_route_template(session: Session, client):
+    """Request latency should be labelled with the route template, not the raw path."""
+    registry.clear()
+    _add_form(session)
+
+    client.get("/api/forms/form-1")
+    client.get("/api/forms/missing")
+    client.get("/no-such-page")
+
+    route = "/api/forms/{form_id}"
+    assert HTTP_REQUEST_DURATION.count(method="GET", route=route, status=200) == 1
+    assert HTTP_REQUEST_DURATION.count(method="GET", route=route, status=404) == 1
+    assert HTTP_REQUEST_DURATION.count(method="GET", route="unmatched", status=404) == 1
+    assert 'route="/api/forms/form-1"' not in client.get("/metrics").text
+
+
+def test_sql_queries_are_counted(session: Session, client):
+    """Each SQL statement the app runs should be observed once."""
+    registry.clear()
+    _add_form(session)
+
+    client.get("/api/forms/form-1")
+
+    assert DB_QUERY_DURATION.count(operation="SELECT") == 1
+
+
+def test_translation_calls_are_counted():
+    """Provider calls should be counted by outcome, with the model's token usage."""
+    registry.clear()
+    translator = openai_translator(FakeChatClient())
+
+    asyncio.run(translator.translate_form_fields([{"label": "Name"}], "es"))
+
+    assert TRANSLATION_REQUESTS.value(operation="translate_items", outcome="ok") == 1
+    assert TRANSLATION_TOKENS.value(kind="prompt") > 0
+    assert TRANSLATION_TOKENS.value(kind="completion") > 0
+
+
+def test_failed_translation_calls_are_counted():
+    """A failing provider call should be counted as an error."""
+    registry.clear()
+    translator = TranslationService(
+        StubTranslationProvider(latency_seconds=0, jitter_seconds=0, failure_rate=1.0)
+    )
+
+    with pytest.raises(SimulatedTranslationError):
+        asyncio.run(translator.translate_form_name("Intake", "es"))
+
+    assert TRANSLATION_REQUESTS.value(operation="translate_text", outcome="error") == 1
+    assert TRANSLATION_REQUESTS.value(operation="translate_text", outcome="ok") == 0
+
+
+def test_cache_hits_and_misses_are_counted(session: Session, client):
+    """Form loads should count hits and misses of the in-memory and translated-form caches."""
+    registry.clear()
+    _add_form(session)
+
+    client.get("/api/forms/latest?lang=es")
+    client.get("/api/forms/latest?lang=es")
+
+    assert CACHE_LOOKUPS.value(cache="latest_form", result="miss") == 1
+    assert CACHE_LOOKUPS.value(cache="latest_form", result="hit") == 1
+    assert CACHE_LOOKUPS.value(cache="translated_form", result="miss") == 1
@@ -0,0 +1,77 @@
+"""
+Tests for the shared micro-batching helper.
+Focus: Batching per group, serial processing, and error delivery.
+"""
+
+import asyncio
+
+import pytest
+
+from services.micro_batch import MicroBatcher
+
+
+def test_items_are_batched_per_group():
+    """Items of different groups go in different batches, each caller gets its own result."""
+    batches = []
+
+    async def process(group, items):
+        batches.append((group, list(items)))
+        return [f"{group}:{item}" for item in items]
+
+    async def run():
+        batcher = MicroBatcher(process, max_items=10, max_wait_seconds=0.01)
+        return await asyncio.gather(
+            batcher.submit(1, "es"), batcher.submit(2, "fr"), batcher.submit(3, "es")
+        )
+
+    assert asyncio.run(run()) == ["es:1", "fr:2", "es:3"]
+    assert sorted(batches) == [("es", [1, 3]), ("fr", [2])]
+
+
+def test_serial_batch_keeps_filling_while_waiting():
+    """With serial=True, a batch waiting on the one before it picks up later items."""
+    batches = []
+
+    async def process(group, items):
+        batches.append(list(items))
+        await asyncio.sleep(0.05)
+        return items
+
+    async def run():
+        batcher = MicroBatcher(process, max_items=10, max_wait_seconds=0.001, serial=True)
+        first = asyncio.create_task(batcher.submit(1))
+        await asyncio.sleep(0.01)  # first batch is processing
+        second = [asyncio.create_task(batcher.submit(2))]
+        await asyncio.sleep(0.01)  # second batch's window has ended; it waits for the lock
+        second.append(asyncio.create_task(batcher.submit(3)))
+        await asyncio.gather(first, *second)
+        await batcher.aclose()
+
+    asyncio.run(run())
+
+    assert batches == [[1], [2, 3]]
+
+
+def test_batch_error_reaches_every_caller():
+    """A failed batch (or one with the wrong number of results) fails all of its callers."""
+
+    async def failing(group, items):
+        raise RuntimeError("commit failed")
+
+    async def short(group, items):
+        return items[:1]
+
+    async def run(process):
+        batcher = MicroBatcher(process, max_items=2, max_wait_seconds=10)
+        return await asyncio.gather(
+            batcher.submit(1), batcher.submit(2), return_exceptions=True
+        )
+
+    errors = asyncio.run(run(failing))
+    assert [str(e) for e in errors] == ["commit failed", "commit failed"]
+
+    errors = asyncio.run(run(short))
+    assert all(isinstance(e, ValueError) for e in errors)
+
+    with pytest.raises(RuntimeError):
+        asyncio.run(MicroBatcher(failing, 1, 0).submit(1))
@@ -0,0 +1,134 @@
+"""
+Tests for opt-in request profiling.
+Focus: Which requests are profiled, the stored collapsed stacks, and downloading them.
+"""
+
+import asyncio
+import json
+from collections import Counter
+
+import httpx
+from sqlmodel import Session
+
+import main
+from main import app
+from models import Form
+from services.profiling import ProfileStore, ProfilingMiddleware, StackSampler
+
+TOKEN = "admin-secret"
+
+
+def _add_form(session: Session):
+    session.add(
+        Form(
+            id="form-1",
+            form_name="Intake",
+            fields=json.dumps([{"label": "Name", "type": "text"}]),
+        )
+    )
+    session.commit()
+
+
+def _get(profiled_app, path, headers=None):
+    async def request():
+        async with httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=profiled_app), base_url="http://test"
+        ) as client:
+            return await client.get(path, headers=headers)
+
+    return asyncio.run(request())
+
+
+def test_request_with_token_is_profiled(session: Session, tmp_path):
+    """A request sending the admin token should be profiled and name its stored profile."""
+    _add_form(session)
+    store = ProfileStore(tmp_path)
+    profiled_app = ProfilingMiddleware(app, token=TOKEN, sample_rate=0, store=store)
+
+    response = _get(profiled_app, "/api/forms/latest", {"X-Profile": TOKEN})
+
+    assert response.status_code == 200
+    profile = store.path(response.headers["x-profile-id"]).read_text()
+
+    # collapsed stacks: "root;frame;...;frame count", rooted at the request
+    for line in profile.splitlines():
+        stack, count = line.rsplit(" ", 1)
+        assert stack.startswith("GET /api/forms/latest (")
+        assert int(count) > 0
+    assert "get_latest_form (main.py:" in profile
+
+
+def test_requests_without_token_are_not_profiled(session: Session, tmp_path):
+    """Without the token (or with a wrong one) and no sample rate, nothing is recorded."""
+    store = ProfileStore(tmp_path)
+    profiled_app = ProfilingMiddleware(app, token=TOKEN, sample_rate=0, store=store)
+
+    plain = _get(profiled_app, "/api/test")
+    wrong_token = _get(profiled_app, "/api/test", {"X-Profile": "guess"})
+
+    assert "x-profile-id" not in plain.headers
+    assert "x-profile-id" not in wrong_token.headers
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_sample_rate_profiles_requests(session: Session, tmp_path):
+    """With a sample rate of 1 every request is profiled, no token needed."""
+    store = ProfileStore(tmp_path)
+    profiled_app = ProfilingMiddleware(app, token="", sample_rate=1.0, store=store)
+
+    response = _get(profiled_app, "/api/test")
+
+    assert store.path(response.headers["x-profile-id"]) is not None
+
+
+def test_sampler_sees_suspended_coroutines():
+    """Time a request spends awaiting should be attributed to the coroutine that awaits."""
+
+    async def wait_for_database():
+        await asyncio.sleep(0.05)
+
+    async def run():
+        task = asyncio.create_task(wait_for_database())
+        await asyncio.sleep(0.01)
+        stack = StackSampler(task).sample()
+        await task
+        return stack
+
+    stack = asyncio.run(run())
+
+    assert stack[0].startswith("test_sampler_sees_suspended_coroutines.<locals>.wait_for_database")
+    assert stack[-1] == "<await Future>"
+
+
+def test_store_keeps_newest_profiles(tmp_path):
+    """Profiles beyond max_files are removed, oldest first."""
+    store = ProfileStore(tmp_path, max_files=2)
+    for profile_id in ("a1", "b2", "c3"):
+        store.save(profile_id, "GET /", Counter({("frame",): 1}))
+
+    assert store.path("a1") is None
+    assert store.path("c3").read_text() == "GET /;frame 1\n"
+    assert store.path("../c3") is None
+
+
+def test_get_profile_requires_token(session: Session, client, tmp_path, monkeypatch):
+    """Stored profiles can only be downloaded with the profiling token."""
+    store = ProfileStore(tmp_path)
+    store.save("abc123", "GET /", Counter({("frame",): 3}))
+    monkeypatch.setattr(main, "profile_store", store)
+    monkeypatch.setattr(main, "PROFILING_TOKEN", TOKEN)
+
+    assert client.get("/api/profiles/abc123").status_code == 403
+    assert client.get("/api/profiles/abc123", headers={"X-Profile": "guess"}).status_code == 403
+    assert client.get("/api/profiles/missing", headers={"X-Profile": TOKEN}).status_code == 404
+
+    response = client.get("/api/profiles/abc123", headers={"X-Profile": TOKEN})
+    assert response.status_code == 200
+    assert response.text == "GET /;frame 3\n"
+
+
+def test_get_profile_disabled_without_token(session: Session, client):
+    """With no profiling token configured, profiles can't be downloaded."""
+    response = client.get("/api/profiles/abc123", headers={"X-Profile": ""})
+
+    assert response.status_code == 403
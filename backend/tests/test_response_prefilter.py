@@ -0,0 +1,79 @@
+"""
+Tests for the back-translation pre-filter.
+Focus: Resolving option answers and non-linguistic values without the model.
+"""
+
+from services.response_prefilter import build_option_lookup, split_responses
+
+FIELDS = [
+    {"id": "name", "label": "Full Name", "type": "text"},
+    {"id": "dob", "label": "Date of Birth", "type": "date"},
+    {"id": "phone", "label": "Phone", "type": "tel"},
+    {"id": "pain", "label": "Pain", "type": "radio", "options": ["Yes", "No"]},
+    {
+        "id": "symptoms",
+        "label": "Symptoms",
+        "type": "checkbox",
+        "options": ["Cough", "Fever", "Headache"],
+    },
+    {"id": "notes", "label": "Notes", "type": "textarea"},
+]
+TRANSLATED_FIELDS = [
+    {**FIELDS[0], "label": "Nombre completo"},
+    {**FIELDS[1], "label": "Fecha de nacimiento"},
+    {**FIELDS[2], "label": "Teléfono"},
+    {**FIELDS[3], "label": "Dolor", "options": ["Sí", "No"]},
+    {**FIELDS[4], "label": "Síntomas", "options": ["Tos", "Fiebre", "Dolor de cabeza"]},
+    {**FIELDS[5], "label": "Notas"},
+]
+
+
+def test_option_lookup_maps_translated_options_to_english():
+    """Options shown in Spanish (or English) should map back to the English original."""
+    lookup = build_option_lookup(FIELDS, TRANSLATED_FIELDS)
+
+    assert lookup["pain_3"] == {"Yes": "Yes", "No": "No", "Sí": "Yes"}
+    assert lookup["symptoms_4"]["Dolor de cabeza"] == "Headache"
+    assert "name_0" not in lookup
+
+    # a translation whose options don't line up with the form is ignored
+    mismatched = [*TRANSLATED_FIELDS[:3], {**TRANSLATED_FIELDS[3], "options": ["Sí"]}]
+    assert build_option_lookup(FIELDS, mismatched)["pain_3"] == {"Yes": "Yes", "No": "No"}
+
+
+def test_split_responses_only_sends_free_text():
+    """Dates, phone numbers, emails, numbers and known options should be resolved locally."""
+    lookup = build_option_lookup(FIELDS, TRANSLATED_FIELDS)
+    response_data = {
+        "name_0": "Ana López",
+        "dob_1": "1990-03-12",
+        "phone_2": "+34 600 123 456",
+        "pain_3": "Sí",
+        "symptoms_4": ["Tos", "Dolor de cabeza"],
+        "notes_5": "Me duele desde ayer",
+        "extra": "ana@example.com",
+    }
+
+    resolved, to_translate = split_responses(response_data, FIELDS, lookup)
+
+    assert resolved == {**response_data, "pain_3": "Yes", "symptoms_4": ["Cough", "Headache"]}
+    assert to_translate == {"name_0": "Ana López", "notes_5": "Me duele desde ayer"}
+
+    # nothing left for the model
+    resolved, to_translate = split_responses(
+        {"pain_3": "No", "notes_5": "  ", "name_0": "42"}, FIELDS, lookup
+    )
+    assert to_translate == {}
+    assert resolved == {"pain_3": "No", "notes_5": "  ", "name_0": "42"}
+
+
+def test_split_responses_sends_unknown_options():
+    """An answer that isn't one of the field's options should still be translated."""
+    lookup = build_option_lookup(FIELDS, TRANSLATED_FIELDS)
+
+    resolved, to_translate = split_responses(
+        {"pain_3": "A veces", "symptoms_4": ["Tos", "mareo"]}, FIELDS, lookup
+    )
+
+    assert to_translate == {"pain_3": "A veces", "symptoms_4": ["Cough", "mareo"]}
+    assert resolved["symptoms_4"] == ["Cough", "mareo"]
@@ -3,7 +3,24 @@ Tests for submission-related endpoints.
 Focus: Form submission creation and retrieval.
 """
 
-from sqlmodel import Session
+import asyncio
+import csv
+import io
+import json
+from datetime import datetime
+
+import httpx
+import pytest
+from sqlalchemy import event
+from sqlmodel import Session, select
+
+import main
+from main import app
+from models import Form, FormSubmission, TranslatedForm, TranslationJob
+from services.back_translation import back_translate_submission, back_translate_submissions
+from services.job_queue import BACK_TRANSLATE_SUBMISSION, BACK_TRANSLATE_SUBMISSIONS
+from services.submission_writer import SubmissionWriter
+from conftest import async_engine, async_test_session
 
 
 def test_create_submission(session: Session, client):
@@ -62,9 +79,10 @@ def test_get_submissions(session: Session, client):
     # verify status 200 OK
     assert response.status_code == 200
 
-    # verify that we got both submissions
-    data = response.json()
+    # verify that we got both submissions on one page
+    data = response.json()["submissions"]
     assert len(data) == 2
+    assert response.json()["next_cursor"] is None
     assert all("id" in item for item in data)
     assert all("form_id" in item for item in data)
     assert all("submission_data" in item for item in data)
@@ -81,4 +99,576 @@ def test_get_submissions_empty(session: Session, client):
 
     # verify status 200 OK with empty list
     assert response.status_code == 200
-    assert response.json() == []
+    assert response.json() == {"submissions": [], "next_cursor": None}
+
+
+def _add_submissions(session: Session, form_id: str, submitted_at: list[datetime]):
+    """Insert one submission per timestamp, numbering the answers in order."""
+    for number, timestamp in enumerate(submitted_at):
+        session.add(
+            FormSubmission(
+                form_id=form_id,
+                submission_data=json.dumps({"n": number}),
+                submitted_at=timestamp,
+            )
+        )
+    session.commit()
+
+
+def test_get_submissions_paginates(session: Session, client):
+    """Test walking every page with next_cursor, including rows that share a timestamp."""
+    same_time = datetime(2025, 1, 1, 12, 0)
+    _add_submissions(session, "form-1", [same_time] * 3 + [datetime(2025, 1, 2)] * 2)
+
+    seen = []
+    cursor = None
+    pages = 0
+    while True:
+        params = {"limit": 2}
+        if cursor:
+            params["cursor"] = cursor
+        page = client.get("/api/submissions", params=params).json()
+        seen += [item["submission_data"]["n"] for item in page["submissions"]]
+        pages += 1
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+
+    # verify every submission came back once, newest first
+    assert pages == 3
+    assert seen == [4, 3, 2, 1, 0]
+
+
+def test_get_submissions_filters(session: Session, client):
+    """Test filtering submissions by form and by date range."""
+    _add_submissions(
+        session,
+        "form-1",
+        [datetime(2025, 1, 1), datetime(2025, 2, 1), datetime(2025, 3, 1)],
+    )
+    _add_submissions(session, "form-2", [datetime(2025, 2, 1)])
+
+    # verify the form filter
+    data = client.get("/api/submissions", params={"form_id": "form-1"}).json()
+    assert [item["submission_data"]["n"] for item in data["submissions"]] == [2, 1, 0]
+
+    # verify the date range is [submitted_after, submitted_before)
+    params = {
+        "form_id": "form-1",
+        "submitted_after": "2025-02-01T00:00:00",
+        "submitted_before": "2025-03-01T00:00:00",
+    }
+    data = client.get("/api/submissions", params=params).json()
+    assert [item["submission_data"]["n"] for item in data["submissions"]] == [1]
+
+
+def test_get_submissions_invalid_cursor(session: Session, client):
+    """Test that a malformed cursor is rejected."""
+    response = client.get("/api/submissions", params={"cursor": "not-a-cursor"})
+
+    # verify status 400 Bad Request
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Invalid cursor"
+
+
+def test_export_submissions_ndjson(session: Session, client, monkeypatch):
+    """Test exporting submissions as NDJSON, streamed across several batches."""
+    monkeypatch.setattr("services.submission_export.SUBMISSIONS_EXPORT_BATCH_SIZE", 2)
+    _add_submissions(session, "form-1", [datetime(2025, 1, day) for day in range(1, 6)])
+
+    with client.stream("GET", "/api/submissions/export") as response:
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+        body = "".join(response.iter_text())
+
+    # verify one line per submission, oldest first
+    records = [json.loads(line) for line in body.splitlines()]
+    assert [r["submission_data"] for r in records] == [{"n": n} for n in range(5)]
+    assert records[0]["submitted_at"] == "2025-01-01T00:00:00"
+    assert records[0]["translation_status"] == "complete"
+
+
+def test_export_submissions_csv(session: Session, client):
+    """Test exporting submissions as CSV, with one column per answer key."""
+    session.add(
+        FormSubmission(
+            form_id="form-1",
+            submission_data=json.dumps({"name_0": "Ana", "symptoms_1": ["fever", "cough"]}),
+            submitted_at=datetime(2025, 1, 1),
+        )
+    )
+    session.add(
+        FormSubmission(
+            form_id="form-1",
+            submission_data=json.dumps({"name_0": "Bo", "notes_2": "none"}),
+            submitted_at=datetime(2025, 1, 2),
+        )
+    )
+    _add_submissions(session, "form-2", [datetime(2025, 1, 3)])
+
+    response = client.get(
+        "/api/submissions/export", params={"format": "csv", "form_id": "form-1"}
+    )
+
+    # verify status 200 OK as a CSV download
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/csv")
+    assert "submissions.csv" in response.headers["content-disposition"]
+
+    # verify the answers were flattened into columns, blank where a row has no answer
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert [row["name_0"] for row in rows] == ["Ana", "Bo"]
+    assert rows[0]["symptoms_1"] == "fever; cough"
+    assert rows[0]["notes_2"] == ""
+    assert rows[1]["notes_2"] == "none"
+    assert all(row["form_id"] == "form-1" for row in rows)
+    assert "n" not in rows[0]
+
+
+def test_export_submissions_csv_columns_from_form(session: Session, client):
+    """CSV columns should come from the form's fields, without a pass over the answers."""
+    fields = [
+        {"id": "name", "label": "Full Name", "type": "text"},
+        {"id": "dob", "label": "Date of Birth", "type": "date"},
+    ]
+    session.add(Form(id="form-1", form_name="Intake", fields=json.dumps(fields)))
+    session.add(
+        FormSubmission(
+            form_id="form-1",
+            submission_data=json.dumps({"name_0": "Ana", "allergies": "none"}),
+            submitted_at=datetime(2025, 1, 1),
+        )
+    )
+    session.commit()
+
+    # count the statements that read the answers
+    answer_reads = []
+
+    def count_answer_read(conn, cursor, statement, parameters, context, executemany):
+        if "submission_data" in statement:
+            answer_reads.append(statement)
+
+    event.listen(async_engine.sync_engine, "before_cursor_execute", count_answer_read)
+    try:
+        response = client.get("/api/submissions/export", params={"format": "csv"})
+    finally:
+        event.remove(async_engine.sync_engine, "before_cursor_execute", count_answer_read)
+
+    # verify the header follows the form, and unknown keys land in other_answers
+    assert len(answer_reads) == 1
+    reader = csv.DictReader(io.StringIO(response.text))
+    assert reader.fieldnames[-3:] == ["name_0", "dob_1", "other_answers"]
+    row = next(reader)
+    assert row["name_0"] == "Ana"
+    assert row["dob_1"] == ""
+    assert json.loads(row["other_answers"]) == {"allergies": "none"}
+
+
+def test_create_submission_non_english_is_pending(session: Session, client):
+    """Test that a non-English submission is stored as given and left pending."""
+    submission_data = {
+        "form_id": "form-1",
+        "submission_data": {"symptoms": "dolor de cabeza"},
+        "language": "es",
+    }
+    response = client.post("/api/submissions", json=submission_data)
+
+    # verify it was saved without waiting for translation
+    assert response.status_code == 200
+    data = client.get("/api/submissions").json()["submissions"]
+    assert data[0]["submission_data"] == {"symptoms": "dolor de cabeza"}
+    assert data[0]["language"] == "es"
+    assert data[0]["translation_status"] == "pending"
+
+
+def test_submission_back_translation_job(session: Session, client, job_workers):
+    """Test that a non-English submission is translated to English by its queued job."""
+    submission_data = {
+        "form_id": "form-1",
+        "submission_data": {"symptoms": "dolor de cabeza"},
+        "language": "es",
+    }
+    client.post("/api/submissions", json=submission_data)
+
+    # verify the job was saved with the submission, then run it
+    job = session.exec(select(TranslationJob)).one()
+    assert job.kind == BACK_TRANSLATE_SUBMISSION
+    asyncio.run(job_workers.run_until_idle())
+
+    # verify the answers were translated and marked complete
+    data = client.get("/api/submissions").json()["submissions"]
+    assert data[0]["translation_status"] == "complete"
+    assert data[0]["submission_data"] == {"symptoms": "[en] dolor de cabeza"}
+
+
+def test_back_translation_failure_keeps_original(session: Session):
+    """Test that the last failed attempt keeps the patient's original answers."""
+
+    class FailingTranslator:
+        async def translate_responses_to_english(self, response_data, source_language):
+            raise RuntimeError("OpenAI is down")
+
+    session.add(
+        FormSubmission(
+            form_id="form-1",
+            submission_data='{"symptoms": "dolor de cabeza"}',
+            language="es",
+            translation_status="pending",
+        )
+    )
+    session.commit()
+    submission_id = session.exec(select(FormSubmission)).one().id
+
+    # an earlier attempt leaves it pending for the retry
+    with pytest.raises(RuntimeError):
+        asyncio.run(
+            back_translate_submission(
+                submission_id, FailingTranslator(), async_test_session, False
+            )
+        )
+    submission = session.get(FormSubmission, submission_id)
+    session.refresh(submission)
+    assert submission.translation_status == "pending"
+
+    # the last attempt gives up
+    with pytest.raises(RuntimeError):
+        asyncio.run(
+            back_translate_submission(
+                submission_id, FailingTranslator(), async_test_session, True
+            )
+        )
+    session.refresh(submission)
+    assert submission.translation_status == "failed"
+    assert json.loads(submission.submission_data) == {"symptoms": "dolor de cabeza"}
+
+
+def test_concurrent_submissions_share_one_commit(session: Session):
+    """Submissions arriving together should be inserted in one transaction."""
+    commits = []
+
+    def count_commit(conn):
+        commits.append(conn)
+
+    event.listen(async_engine.sync_engine, "commit", count_commit)
+
+    async def run_requests():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            return await asyncio.gather(
+                *(
+                    client.post(
+                        "/api/submissions",
+                        json={
+                            "form_id": "form-1",
+                            "submission_data": {"name": f"Patient {i}"},
+                            "language": "es" if i % 2 else "en",
+                        },
+                    )
+                    for i in range(20)
+                )
+            )
+
+    try:
+        responses = asyncio.run(run_requests())
+    finally:
+        event.remove(async_engine.sync_engine, "commit", count_commit)
+
+    # every caller was answered after the single commit
+    assert all(r.json() == {"status": "success"} for r in responses)
+    assert len(commits) == 1
+
+    # each submission was saved, with a job for each pending one
+    submissions = session.exec(select(FormSubmission)).all()
+    assert len(submissions) == 20
+    jobs = session.exec(select(TranslationJob)).all()
+    pending_ids = {s.id for s in submissions if s.translation_status == "pending"}
+    assert {json.loads(j.payload)["submission_id"] for j in jobs} == pending_ids
+    assert len(pending_ids) == 10
+
+
+def test_submission_writer_splits_full_batches(session: Session):
+    """A batch that reaches max_rows should commit without waiting out the window."""
+    writer = SubmissionWriter(async_test_session, max_rows=3, window_seconds=10)
+
+    async def run():
+        return await asyncio.wait_for(
+            asyncio.gather(
+                *(
+                    writer.add(FormSubmission(form_id="form-1", submission_data="{}"))
+                    for _ in range(6)
+                )
+            ),
+            timeout=5,
+        )
+
+    saved = asyncio.run(run())
+
+    # ids were assigned by the commits
+    assert sorted(s.id for s in saved) == list(range(1, 7))
+
+
+def test_submission_writer_failure_reaches_every_caller():
+    """If a batch's commit fails, every submission in it should get the error."""
+
+    class FailingSession:
+        def add_all(self, rows):
+            pass
+
+        async def commit(self):
+            raise RuntimeError("disk I/O error")
+
+        async def __aenter__(self):
+            return self
+
+        async def __aexit__(self, *exc_info):
+            return False
+
+    writer = SubmissionWriter(FailingSession)
+
+    async def run():
+        return await asyncio.gather(
+            *(
+                writer.add(FormSubmission(form_id="form-1", submission_data="{}"))
+                for _ in range(3)
+            ),
+            return_exceptions=True,
+        )
+
+    results = asyncio.run(run())
+
+    assert all(isinstance(r, RuntimeError) for r in results)
+
+
+def _add_form(session: Session, form_id="form-1"):
+    session.add(Form(id=form_id, form_name="Intake", fields="[]"))
+    session.commit()
+
+
+def test_bulk_submissions_json_array(session: Session, client, job_workers, translator):
+    """A bulk upload should save the valid items and report each item's result."""
+    _add_form(session)
+    translator.grouped_calls.clear()
+    items = [
+        {"form_id": "form-1", "submission_data": {"name": "Ana"}},
+        {"form_id": "form-1", "submission_data": {"symptoms": "tos"}, "language": "es"},
+        {"form_id": "missing", "submission_data": {"name": "Bo"}},
+        {"form_id": "form-1", "submission_data": {"symptoms": "fiebre"}, "language": "es"},
+        {"form_id": "form-1", "submission_data": "not an object"},
+        {"form_id": "form-1", "submission_data": {}, "language": "xx"},
+        {
+            "form_id": "form-1",
+            "submission_data": {"name": "Cy"},
+            "submitted_at": "2025-01-02T09:30:00+01:00",
+        },
+    ]
+
+    response = client.post("/api/submissions/bulk", json=items)
+
+    # verify status 200 OK and one result per item, in order
+    assert response.status_code == 200
+    body = response.json()
+    assert body["created"] == 4
+    assert body["rejected"] == 3
+    assert [r["status"] for r in body["results"]] == [
+        "created", "created", "rejected", "created", "rejected", "rejected", "created",
+    ]
+    assert body["results"][2]["detail"] == "Form not found"
+    assert body["results"][4]["detail"] == "submission_data must be an object"
+    assert body["results"][5]["detail"] == "Unsupported language: xx"
+
+    # the offline submission keeps its own time (stored as UTC)
+    saved = session.get(FormSubmission, body["results"][6]["id"])
+    assert saved.submitted_at == datetime(2025, 1, 2, 8, 30)
+
+    # both Spanish submissions share one job, translated in one grouped request
+    job = session.exec(select(TranslationJob)).one()
+    assert job.kind == BACK_TRANSLATE_SUBMISSIONS
+    spanish_ids = [body["results"][1]["id"], body["results"][3]["id"]]
+    assert json.loads(job.payload) == {"submission_ids": spanish_ids}
+    asyncio.run(job_workers.run_until_idle())
+    assert translator.grouped_calls == [sorted(str(i) for i in spanish_ids)]
+
+    translated = session.get(FormSubmission, spanish_ids[1])
+    session.refresh(translated)
+    assert translated.translation_status == "complete"
+    assert json.loads(translated.submission_data) == {"symptoms": "[en] fiebre"}
+
+
+def test_bulk_submissions_ndjson(session: Session, client):
+    """NDJSON uploads should be read line by line, with bad lines rejected on their own."""
+    _add_form(session)
+    body = "\n".join(
+        [
+            json.dumps({"form_id": "form-1", "submission_data": {"name": "Ana"}}),
+            "{not json",
+            "",
+            json.dumps({"form_id": "form-1", "submission_data": {"name": "Bo"}}),
+        ]
+    )
+
+    response = client.post(
+        "/api/submissions/bulk",
+        content=body,
+        headers={"Content-Type": "application/x-ndjson"},
+    )
+
+    assert response.status_code == 200
+    results = response.json()["results"]
+    assert [r["status"] for r in results] == ["created", "rejected", "created"]
+    assert results[1] == {"index": 1, "status": "rejected", "detail": "Invalid JSON"}
+    assert len(session.exec(select(FormSubmission)).all()) == 2
+
+
+def test_bulk_submissions_use_one_insert(session: Session, client):
+    """The rows of a bulk upload should be inserted by a single multi-row statement."""
+    _add_form(session)
+    inserts = []
+
+    def count_insert(conn, cursor, statement, parameters, context, executemany):
+        if statement.startswith("INSERT INTO formsubmission"):
+            inserts.append(statement)
+
+    event.listen(async_engine.sync_engine, "before_cursor_execute", count_insert)
+    try:
+        response = client.post(
+            "/api/submissions/bulk",
+            json=[{"form_id": "form-1", "submission_data": {"n": i}} for i in range(50)],
+        )
+    finally:
+        event.remove(async_engine.sync_engine, "before_cursor_execute", count_insert)
+
+    assert response.json()["created"] == 50
+    assert len(inserts) == 1
+
+    # ids come back in upload order
+    ids = [r["id"] for r in response.json()["results"]]
+    saved = {s.id: json.loads(s.submission_data)["n"] for s in session.exec(select(FormSubmission))}
+    assert [saved[i] for i in ids] == list(range(50))
+
+
+def test_bulk_submissions_rejects_bad_bodies(session: Session, client, monkeypatch):
+    """Test that bodies that aren't a list, or are too long, are refused outright."""
+    not_a_list = client.post("/api/submissions/bulk", json={"form_id": "form-1"})
+    assert not_a_list.status_code == 400
+
+    monkeypatch.setattr(main, "SUBMISSIONS_BULK_MAX_ITEMS", 2)
+    too_many = client.post("/api/submissions/bulk", json=[{}, {}, {}])
+    assert too_many.status_code == 413
+
+
+def test_grouped_back_translation_retries_missing_submissions(session: Session):
+    """Submissions the reply leaves out stay pending for the retry, then fail on the last attempt."""
+
+    class PartialTranslator:
+        """Only ever translates the first submission."""
+
+        requests = []
+
+        async def translate_submissions_to_english(self, responses, source_language):
+            self.requests.append(sorted(responses))
+            return {key: {"symptoms": "cough"} for key in responses if key == str(first_id)}
+
+    for text in ("tos", "fiebre"):
+        session.add(
+            FormSubmission(
+                form_id="form-1",
+                submission_data=json.dumps({"symptoms": text}),
+                language="es",
+                translation_status="pending",
+            )
+        )
+    session.commit()
+    first_id, second_id = [s.id for s in session.exec(select(FormSubmission))]
+
+    def statuses():
+        session.expire_all()
+        return [session.get(FormSubmission, i).translation_status for i in (first_id, second_id)]
+
+    # the translated one is saved even though the job will be retried
+    with pytest.raises(ValueError):
+        asyncio.run(
+            back_translate_submissions(
+                [first_id, second_id], PartialTranslator(), async_test_session, False
+            )
+        )
+    assert statuses() == ["complete", "pending"]
+
+    # the retry only sends the one still pending; after the last attempt it fails
+    with pytest.raises(ValueError):
+        asyncio.run(
+            back_translate_submissions(
+                [first_id, second_id], PartialTranslator(), async_test_session, True
+            )
+        )
+    assert statuses() == ["complete", "failed"]
+    assert PartialTranslator.requests == [
+        sorted([str(first_id), str(second_id)]),
+        [str(second_id)],
+    ]
+
+
+def test_back_translation_only_sends_free_text(session: Session):
+    """Option answers should be mapped back to English locally, and only free text translated."""
+
+    class RecordingTranslator:
+        requests = []
+
+        async def translate_responses_to_english(self, response_data, source_language):
+            self.requests.append(response_data)
+            return {key: f"[en] {value}" for key, value in response_data.items()}
+
+    fields = [
+        {"id": "dob", "label": "Date of Birth", "type": "date"},
+        {"id": "pain", "label": "Pain", "type": "select", "options": ["Yes", "No"]},
+        {"id": "notes", "label": "Notes", "type": "textarea"},
+    ]
+    translated_fields = [
+        {**fields[0], "label": "Fecha de nacimiento"},
+        {**fields[1], "label": "Dolor", "options": ["Sí", "No"]},
+        {**fields[2], "label": "Notas"},
+    ]
+    session.add(Form(id="form-1", form_name="Intake", fields=json.dumps(fields)))
+    session.add(
+        TranslatedForm(
+            form_id="form-1",
+            language_code="es",
+            translated_form_name="Admisión",
+            translated_fields=json.dumps(translated_fields),
+        )
+    )
+    answers = [
+        {"dob_0": "1990-03-12", "pain_1": "Sí", "notes_2": "desde ayer"},
+        {"dob_0": "1985-07-01", "pain_1": "No", "notes_2": ""},
+    ]
+    for submission_data in answers:
+        session.add(
+            FormSubmission(
+                form_id="form-1",
+                submission_data=json.dumps(submission_data),
+                language="es",
+                translation_status="pending",
+            )
+        )
+    session.commit()
+    first_id, second_id = [s.id for s in session.exec(select(FormSubmission))]
+
+    for submission_id in (first_id, second_id):
+        asyncio.run(
+            back_translate_submission(
+                submission_id, RecordingTranslator(), async_test_session, False
+            )
+        )
+
+    # only the free text reached the translator; the second submission needed nothing
+    assert RecordingTranslator.requests == [{"notes_2": "desde ayer"}]
+    session.expire_all()
+    first = session.get(FormSubmission, first_id)
+    assert first.translation_status == "complete"
+    assert json.loads(first.submission_data) == {
+        "dob_0": "1990-03-12",
+        "pain_1": "Yes",
+        "notes_2": "[en] desde ayer",
+    }
+    second = session.get(FormSubmission, second_id)
+    assert second.translation_status == "complete"
+    assert json.loads(second.submission_data) == answers[1]
@@ -0,0 +1,99 @@
+"""
+Tests for the translation backends.
+Focus: The local stub backend and selecting a backend by name (no OpenAI calls).
+"""
+
+import asyncio
+import time
+
+import pytest
+
+import services.translation_service
+from services.translation_service import TranslationService
+from services.translation_providers import (
+    MissingAPIKeyError,
+    OpenAITranslationProvider,
+    StubTranslationProvider,
+    SimulatedTranslationError,
+    create_translation_provider,
+)
+from config.constants import TRANSLATION_CHUNK_ATTEMPTS
+
+
+def test_stub_translations_are_deterministic():
+    """Test that the stub backend translates every string the same way each time."""
+    provider = StubTranslationProvider(latency_seconds=0, jitter_seconds=0)
+    translator = TranslationService(provider)
+    fields = [
+        {"id": "name", "label": "Full Name", "placeholder": "Jane Doe", "type": "text"},
+        {"id": "smoker", "label": "Smoker?", "type": "radio", "options": ["Yes", "No"]},
+    ]
+
+    first = asyncio.run(translator.translate_form_fields(fields, "es"))
+    second = asyncio.run(translator.translate_form_fields(fields, "es"))
+
+    assert first == second == [
+        {"id": "name", "label": "[es] Full Name", "placeholder": "[es] Jane Doe", "type": "text"},
+        {"id": "smoker", "label": "[es] Smoker?", "type": "radio", "options": ["[es] Yes", "[es] No"]},
+    ]
+    assert asyncio.run(translator.translate_form_name("Intake", "es")) == "[es] Intake"
+    assert asyncio.run(
+        translator.translate_responses_to_english({"name_0": "Ana", "age_1": ""}, "es")
+    ) == {"name_0": "[en] Ana", "age_1": ""}
+
+
+def test_stub_latency_overlaps_across_chunks(monkeypatch):
+    """Test that simulated latency is awaited, so concurrent chunks overlap."""
+    monkeypatch.setattr(services.translation_service, "TRANSLATION_CHUNK_MAX_FIELDS", 5)
+    provider = StubTranslationProvider(latency_seconds=0.1, jitter_seconds=0)
+    translator = TranslationService(provider)
+    fields = [{"label": f"Question {i}"} for i in range(20)]
+
+    start = time.perf_counter()
+    asyncio.run(translator.translate_form_fields(fields, "es"))
+    elapsed = time.perf_counter() - start
+
+    # 4 chunks of 5, translated at the same time
+    assert provider.calls == 4
+    assert elapsed < 2 * provider.latency_seconds
+
+
+def test_stub_failures_are_retried():
+    """Test that injected failures go through the service's chunk retries."""
+    provider = StubTranslationProvider(latency_seconds=0, jitter_seconds=0, failure_rate=1.0)
+    translator = TranslationService(provider)
+
+    with pytest.raises(SimulatedTranslationError):
+        asyncio.run(translator.translate_form_fields([{"label": "Name"}], "es"))
+
+    assert provider.calls == TRANSLATION_CHUNK_ATTEMPTS
+
+
+def test_stub_stream_yields_every_field():
+    """Test streaming translation through the stub backend."""
+    translator = TranslationService(StubTranslationProvider(latency_seconds=0.01))
+    fields = [{"label": f"Question {i}"} for i in range(5)]
+
+    async def collect():
+        return [item async for item in translator.stream_form_fields(fields, "es")]
+
+    assert dict(asyncio.run(collect())) == {
+        i: {"label": f"[es] Question {i}"} for i in range(5)
+    }
+
+
+def test_create_translation_provider_by_name():
+    """Test choosing the backend by its configured name."""
+    assert isinstance(create_translation_provider("stub"), StubTranslationProvider)
+
+    with pytest.raises(ValueError):
+        create_translation_provider("unknown")
+
+
+def test_missing_api_key_is_its_own_error(monkeypatch):
+    """A missing key (translation off) should not look like a misconfigured provider name."""
+    monkeypatch.setattr(OpenAITranslationProvider, "_load_api_key", lambda self: "")
+
+    with pytest.raises(MissingAPIKeyError):
+        create_translation_provider("openai")
+    assert not issubclass(MissingAPIKeyError, ValueError)
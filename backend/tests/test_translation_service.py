@@ -0,0 +1,399 @@
+"""
+Tests for the translation service.
+Focus: Client setup and internal translation helpers (no OpenAI calls).
+"""
+
+import asyncio
+import json
+import time
+from types import SimpleNamespace
+
+import httpx
+import pytest
+from sqlmodel import Session
+
+import services.translation_service
+from services.translation_service import TranslationService
+from services.translation_providers import (
+    OpenAITranslationProvider,
+    StubTranslationProvider,
+    TranslationProvider,
+)
+from services.translation_memory import TranslationMemoryStore
+from services.response_batcher import ResponseBatcher
+from conftest import async_test_session
+from config.constants import (
+    TRANSLATION_CONNECT_TIMEOUT_SECONDS,
+    TRANSLATION_TIMEOUT_SECONDS,
+)
+
+
+class FakeChatClient:
+    """
+    Stand-in for AsyncOpenAI's chat completions.
+    Replies to field-translation prompts by prefixing every string value with "ES:".
+    If fail_once_on is set, the first prompt containing that text gets a malformed reply.
+    """
+
+    def __init__(self, fail_once_on=None):
+        self.chat = SimpleNamespace(completions=self)
+        self.prompts = []
+        self.fail_once_on = fail_once_on
+
+    async def create(self, model, messages, temperature, stream=False, stream_options=None):
+        prompt = messages[-1]["content"]
+        self.prompts.append(prompt)
+        content = json.loads(prompt[prompt.index("[") :])
+        translated = [self._translate(item) for item in content]
+        should_fail = self.fail_once_on and self.fail_once_on in prompt
+        if should_fail:
+            self.fail_once_on = None
+
+        if stream:
+            # JSON Lines reply, cut off after the first line when failing
+            lines = [json.dumps(item) for item in translated]
+            reply = "\n".join(lines[:1] + ["{not json"] if should_fail else lines)
+            return self._stream(reply)
+
+        reply = json.dumps(translated)
+        if should_fail:
+            reply = reply[: len(reply) // 2]  # truncated JSON
+        return SimpleNamespace(
+            choices=[SimpleNamespace(message=SimpleNamespace(content=reply))],
+            usage=self._usage(prompt, reply),
+        )
+
+    async def _stream(self, reply, piece_size=7):
+        """Yield the reply in small pieces, like streamed completion chunks."""
+        for start in range(0, len(reply), piece_size):
+            delta = SimpleNamespace(content=reply[start : start + piece_size])
+            yield SimpleNamespace(choices=[SimpleNamespace(delta=delta)], usage=None)
+        # usage comes in a last event with no choices (stream_options include_usage)
+        yield SimpleNamespace(choices=[], usage=self._usage(self.prompts[-1], reply))
+
+    def _usage(self, prompt, reply):
+        """Token counts, roughly 4 characters per token."""
+        return SimpleNamespace(
+            prompt_tokens=len(prompt) // 4, completion_tokens=len(reply) // 4
+        )
+
+    def _translate(self, value):
+        if isinstance(value, str):
+            return f"ES:{value}"
+        if isinstance(value, list):
+            return [self._translate(v) for v in value]
+        if isinstance(value, dict):
+            return {k: v if k == "index" else self._translate(v) for k, v in value.items()}
+        return value
+
+    def sent_segments(self):
+        """Every string sent for translation, across all prompts."""
+        segments = []
+        for prompt in self.prompts:
+            for item in json.loads(prompt[prompt.index("[") :]):
+                segments.extend(v for k, v in item.items() if isinstance(v, str))
+                segments.extend(item.get("options", []))
+        return segments
+
+
+def openai_translator(chat_client, memory=None):
+    """A TranslationService using the OpenAI backend with a fake chat client."""
+    return TranslationService(OpenAITranslationProvider(client=chat_client), memory)
+
+
+def test_create_client_uses_configured_timeouts():
+    """Test that the shared client is built with the configured timeouts."""
+    client = OpenAITranslationProvider._create_client("test-key")
+
+    assert client.timeout == httpx.Timeout(
+        TRANSLATION_TIMEOUT_SECONDS, connect=TRANSLATION_CONNECT_TIMEOUT_SECONDS
+    )
+    asyncio.run(client.close())
+
+
+def test_aclose_closes_client():
+    """Test that aclose() releases the client's pooled connections."""
+    client = OpenAITranslationProvider._create_client("test-key")
+    translator = openai_translator(client)
+
+    asyncio.run(translator.aclose())
+
+    assert client.is_closed()
+
+
+def test_translation_memory_skips_known_segments(session: Session):
+    """Test that segments translated for one form aren't sent again for another."""
+    chat_client = FakeChatClient()
+    translator = openai_translator(chat_client, TranslationMemoryStore(async_test_session))
+    first_form = [
+        {"id": "dob", "label": "Date of Birth", "type": "date"},
+        {"id": "smoker", "label": "Smoker?", "type": "radio", "options": ["Yes", "No"]},
+    ]
+    second_form = [
+        {"id": "dob", "label": "Date of Birth", "type": "date"},
+        {"id": "meds", "label": "Current medications", "placeholder": "List them"},
+        {"id": "allergy", "label": "Allergies?", "type": "radio", "options": ["Yes", "No"]},
+    ]
+
+    asyncio.run(translator.translate_form_fields(first_form, "es"))
+    chat_client.prompts.clear()
+    translated = asyncio.run(translator.translate_form_fields(second_form, "es"))
+
+    # only unseen text went to the model
+    assert sorted(chat_client.sent_segments()) == [
+        "Allergies?",
+        "Current medications",
+        "List them",
+    ]
+
+    # known and new segments are merged back in field order
+    assert translated == [
+        {"id": "dob", "label": "ES:Date of Birth", "type": "date"},
+        {
+            "id": "meds",
+            "label": "ES:Current medications",
+            "placeholder": "ES:List them",
+        },
+        {
+            "id": "allergy",
+            "label": "ES:Allergies?",
+            "type": "radio",
+            "options": ["ES:Yes", "ES:No"],
+        },
+    ]
+
+
+def test_translation_memory_fully_known_form_makes_no_request(session: Session):
+    """Test that a form made only of remembered segments is translated locally."""
+    chat_client = FakeChatClient()
+    translator = openai_translator(chat_client, TranslationMemoryStore(async_test_session))
+    fields = [{"id": "name", "label": "Full Name", "placeholder": "Jane Doe"}]
+
+    asyncio.run(translator.translate_form_fields(fields, "es"))
+    chat_client.prompts.clear()
+    translated = asyncio.run(translator.translate_form_fields(fields, "es"))
+
+    assert chat_client.prompts == []
+    assert translated == [
+        {"id": "name", "label": "ES:Full Name", "placeholder": "ES:Jane Doe"}
+    ]
+
+
+def test_apply_translations_handles_identical_fields():
+    """Test that identical fields each get their own translation."""
+    translator = openai_translator(FakeChatClient())
+    fields = [
+        {"label": "Notes", "type": "text"},
+        {"label": "Notes", "type": "text"},
+    ]
+    translations = [
+        {"index": 1, "label": "Notas (2)"},
+        {"index": 0, "label": "Notas (1)"},
+    ]
+
+    translated = translator._apply_translations(fields, translations)
+
+    assert translated == [
+        {"label": "Notas (1)", "type": "text"},
+        {"label": "Notas (2)", "type": "text"},
+    ]
+    # originals are left untouched
+    assert fields[0]["label"] == "Notes"
+
+
+def test_large_form_is_translated_in_chunks(monkeypatch):
+    """Test that a large form is split into chunks and reassembled in order."""
+    monkeypatch.setattr(services.translation_service, "TRANSLATION_CHUNK_MAX_FIELDS", 10)
+    chat_client = FakeChatClient()
+    translator = openai_translator(chat_client)
+    fields = [{"id": f"q{i}", "label": f"Question {i}"} for i in range(25)]
+
+    translated = asyncio.run(translator.translate_form_fields(fields, "es"))
+
+    # 25 fields in chunks of at most 10
+    assert len(chat_client.prompts) == 3
+    assert translated == [
+        {"id": f"q{i}", "label": f"ES:Question {i}"} for i in range(25)
+    ]
+
+
+def test_failed_chunk_is_retried_alone(monkeypatch):
+    """Test that only the chunk with a malformed reply is sent again."""
+    monkeypatch.setattr(services.translation_service, "TRANSLATION_CHUNK_MAX_FIELDS", 10)
+    chat_client = FakeChatClient(fail_once_on="Question 15")
+    translator = openai_translator(chat_client)
+    fields = [{"id": f"q{i}", "label": f"Question {i}"} for i in range(25)]
+
+    translated = asyncio.run(translator.translate_form_fields(fields, "es"))
+
+    # 3 chunks + 1 retry of the chunk holding Question 15
+    assert len(chat_client.prompts) == 4
+    retried = [p for p in chat_client.prompts if "Question 15" in p]
+    assert len(retried) == 2
+    assert translated[15] == {"id": "q15", "label": "ES:Question 15"}
+
+
+def test_stream_form_fields_yields_every_field():
+    """Test that streaming translation yields each field with its index."""
+    translator = openai_translator(FakeChatClient())
+    fields = [{"id": f"q{i}", "label": f"Question {i}", "type": "text"} for i in range(5)]
+
+    async def collect():
+        return [item async for item in translator.stream_form_fields(fields, "es")]
+
+    streamed = dict(asyncio.run(collect()))
+
+    assert streamed == {
+        i: {"id": f"q{i}", "label": f"ES:Question {i}", "type": "text"} for i in range(5)
+    }
+
+
+def test_stream_retries_only_missing_items():
+    """Test that a broken stream is resumed for the items that didn't arrive."""
+    chat_client = FakeChatClient(fail_once_on="Question 0")
+    translator = openai_translator(chat_client)
+    fields = [{"label": f"Question {i}"} for i in range(3)]
+
+    async def collect():
+        return [item async for item in translator.stream_form_fields(fields, "es")]
+
+    streamed = dict(asyncio.run(collect()))
+
+    # the first item arrived before the break, so the retry asks only for the others
+    assert len(chat_client.prompts) == 2
+    assert "Question 0" not in chat_client.prompts[1]
+    assert streamed == {i: {"label": f"ES:Question {i}"} for i in range(3)}
+
+
+def test_submissions_are_translated_in_one_request():
+    """Several submissions should go to the backend as one request keyed by submission id."""
+    provider = StubTranslationProvider(latency_seconds=0, jitter_seconds=0)
+    translator = TranslationService(provider)
+    responses = {
+        "1": {"symptoms": "tos", "age": "", "allergies": ["polen"]},
+        "2": {"symptoms": "fiebre"},
+        "3": {"notes": ""},
+    }
+
+    translated = asyncio.run(translator.translate_submissions_to_english(responses, "es"))
+
+    assert provider.calls == 1
+    assert translated == {
+        "1": {"symptoms": "[en] tos", "age": "", "allergies": ["[en] polen"]},
+        "2": {"symptoms": "[en] fiebre"},
+        "3": {"notes": ""},
+    }
+
+
+def test_submission_missing_from_reply_is_left_out():
+    """A submission the model's reply drops should be missing from the result, not untranslated."""
+
+    class DroppingProvider(StubTranslationProvider):
+        async def translate_responses(self, responses, source_language):
+            return {"1": {"symptoms": "cough"}}
+
+    translator = TranslationService(DroppingProvider(latency_seconds=0, jitter_seconds=0))
+
+    translated = asyncio.run(
+        translator.translate_submissions_to_english(
+            {"1": {"symptoms": "tos"}, "2": {"symptoms": "fiebre"}}, "es"
+        )
+    )
+
+    assert translated == {"1": {"symptoms": "cough"}}
+
+
+def test_concurrent_back_translations_share_one_request():
+    """Submissions back-translated at the same time should go to the backend as one request."""
+    provider = StubTranslationProvider(latency_seconds=0, jitter_seconds=0)
+    translator = TranslationService(provider)
+
+    async def run():
+        return await asyncio.gather(
+            *(
+                translator.translate_responses_to_english({"symptoms": f"tos {i}"}, "es")
+                for i in range(10)
+            ),
+            translator.translate_responses_to_english({"notes": ""}, "es"),
+        )
+
+    results = asyncio.run(run())
+
+    # each caller gets its own answers back; the empty one never waits for the batch
+    assert results[:10] == [{"symptoms": f"[en] tos {i}"} for i in range(10)]
+    assert results[10] == {"notes": ""}
+    assert provider.calls == 1
+
+
+def test_response_batcher_bounds_size_and_wait():
+    """A full batch is sent at once; a partial one after max_wait_seconds."""
+    requests = []
+
+    async def translate_many(responses, source_language):
+        requests.append((source_language, len(responses)))
+        return {key: {"text": f"[en] {data['text']}"} for key, data in responses.items()}
+
+    batcher = ResponseBatcher(translate_many, max_submissions=3, max_wait_seconds=0.1)
+
+    async def run():
+        start = time.perf_counter()
+        full = await asyncio.gather(
+            *(batcher.translate({"text": str(i)}, "es") for i in range(3))
+        )
+        full_elapsed = time.perf_counter() - start
+        partial = await asyncio.gather(
+            batcher.translate({"text": "a"}, "es"),
+            batcher.translate({"text": "b"}, "fr"),
+        )
+        return full, full_elapsed, partial, time.perf_counter() - start
+
+    full, full_elapsed, partial, elapsed = asyncio.run(run())
+
+    assert full == [{"text": "[en] 0"}, {"text": "[en] 1"}, {"text": "[en] 2"}]
+    assert full_elapsed < 0.1
+    # languages are batched separately, each sent after the wait
+    assert partial == [{"text": "[en] a"}, {"text": "[en] b"}]
+    assert 0.1 <= elapsed < 0.3
+    assert requests == [("es", 3), ("es", 1), ("fr", 1)]
+
+
+def test_response_batcher_reports_failures_per_caller():
+    """A failed request fails every caller; a response left out of the reply fails only its caller."""
+
+    async def drop_second(responses, source_language):
+        return {key: data for key, data in responses.items() if data["text"] != "b"}
+
+    async def fail(responses, source_language):
+        raise RuntimeError("OpenAI is down")
+
+    async def run(translate_many):
+        batcher = ResponseBatcher(translate_many, max_submissions=10, max_wait_seconds=0.01)
+        return await asyncio.gather(
+            batcher.translate({"text": "a"}, "es"),
+            batcher.translate({"text": "b"}, "es"),
+            return_exceptions=True,
+        )
+
+    dropped = asyncio.run(run(drop_second))
+    assert dropped[0] == {"text": "a"}
+    assert isinstance(dropped[1], ValueError)
+
+    failed = asyncio.run(run(fail))
+    assert all(isinstance(r, RuntimeError) for r in failed)
+
+
+def test_incomplete_provider_fails_at_construction():
+    """A backend that leaves out part of the interface should fail when created, not mid-call."""
+
+    class NoStreamingProvider(TranslationProvider):
+        async def translate_text(self, text, target_language):
+            return text
+
+        async def translate_items(self, content, target_language):
+            return content
+
+        async def translate_responses(self, responses, source_language):
+            return responses
+
+    with pytest.raises(TypeError, match="stream_items"):
+        NoStreamingProvider()
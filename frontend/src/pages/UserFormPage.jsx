@@ -44,47 +44,126 @@ function UserFormPage() {
   // Use ref for immediate double-click prevention (doesn't wait for React re-render)
   const isSubmittingRef = useRef(false);
 
-  // fetch the latest form on page load or when language changes
+  // the latest form in every cached language, fetched once on page load
+  // switching to one of these languages is instant and needs no request
+  const bundleRef = useRef(null);
+
+  // show the form in the selected language on page load or when language changes
+  // languages that aren't in the bundle yet are streamed, field by field
   useEffect(() => {
-    const fetchLatestForm = async () => {
-      try {
-        setLoading(true);
+    const controller = new AbortController();
 
-        // get the latest form with language parameter
-        const response = await fetch(`http://localhost:8000/api/forms/latest?lang=${language}`);
-        
-        if (!response.ok) {
-          if (response.status === 404) {
+    const loadBundle = async () => {
+      const response = await fetch('http://localhost:8000/api/forms/latest/bundle', {
+        signal: controller.signal,
+      });
+      if (response.status === 404) return null; // no forms yet
+      if (!response.ok) throw new Error('Failed to fetch form');
+      return response.json();
+    };
+
+    const streamLatestForm = async () => {
+      // get the latest form with language parameter as Server-Sent Events
+      const response = await fetch(
+        `http://localhost:8000/api/forms/latest/stream?lang=${language}`,
+        { signal: controller.signal }
+      );
+
+      if (!response.ok) {
+        if (response.status === 404) {
+          // No forms available - this is expected behavior, not an error
+          setForm(null);
+          setLoading(false);
+          return;
+        }
+        throw new Error('Failed to fetch form');
+      }
+
+      await readEvents(response, (event, data) => {
+        if (event === 'form') {
+          // empty slots are filled in as "field" events arrive
+          setForm({
+            id: data.id,
+            form_name: data.form_name,
+            fields: new Array(data.field_count).fill(null),
+          });
+          setFormData({});
+          setLoading(false);
+        } else if (event === 'field') {
+          const { index, field } = data;
+          setForm(prev => {
+            const fields = [...prev.fields];
+            fields[index] = field;
+            return { ...prev, fields };
+          });
+          setFormData(prev => ({
+            ...prev,
+            [`${field.id}_${index}`]: field.type === 'checkbox' ? [] : '',
+          }));
+        }
+      });
+    };
+
+    const showLatestForm = async () => {
+      try {
+        setError(null);
+        if (!bundleRef.current) {
+          setLoading(true);
+          const bundle = await loadBundle();
+          if (!bundle) {
             // No forms available - this is expected behavior, not an error
             setForm(null);
-            setError(null);
+            setLoading(false);
             return;
           }
-          throw new Error('Failed to fetch form');
+          bundleRef.current = bundle;
         }
-        
-        // convert JSON to JS object and set the form state
-        const formData = await response.json();
-        setForm(formData);
-        
-        // initialize form data with empty values using our helper function
-        const initialData = initializeFormData(formData.fields);
-        setFormData(initialData);
-        
+
+        const translation = bundleRef.current.translations[language];
+        if (translation) {
+          setForm({ id: bundleRef.current.id, ...translation });
+          setFormData(initializeFormData(translation.fields));
+          setLoading(false);
+          return;
+        }
+
+        setLoading(true);
+        await streamLatestForm();
       } catch (err) {
+        if (err.name === 'AbortError') return; // language changed mid-request
         setError(err.message);
-      } finally {
         setLoading(false);
       }
     };
 
-    fetchLatestForm();
-  }, [language]); // Re-fetch when language changes
+    showLatestForm();
+    return () => controller.abort(); // stop the old request when language changes
+  }, [language]); // Re-run when language changes
+
+  // reads a Server-Sent Events response, calling onEvent(event, data) for each event
+  const readEvents = async (response, onEvent) => {
+    const reader = response.body.pipeThrough(new TextDecoderStream()).getReader();
+    let buffer = '';
+    while (true) {
+      const { value, done } = await reader.read();
+      if (done) return;
+      buffer += value;
+      const blocks = buffer.split('\n\n');
+      buffer = blocks.pop(); // keep the incomplete event for the next read
+      blocks.forEach(block => {
+        const lines = Object.fromEntries(
+          block.split('\n').map(line => [line.slice(0, line.indexOf(':')), line.slice(line.indexOf(':') + 2)])
+        );
+        onEvent(lines.event, JSON.parse(lines.data));
+      });
+    }
+  };
 
   // replaces the form data with the new value while keeping the existing data
   const initializeFormData = (fields) => {
     const initialData = {};
     fields.forEach((field, index) => {
+      if (!field) return; // not streamed in yet
       const fieldKey = `${field.id}_${index}`;
       if (field.type === 'checkbox') {
         initialData[fieldKey] = []; // Checkboxes need arrays for multiple selections
@@ -241,7 +320,7 @@ function UserFormPage() {
           <h1 className="user-form-title">{form.form_name}</h1>
         
         <form onSubmit={handleSubmit} className="user-form">
-          {form.fields.map((field, index) => (
+          {form.fields.map((field, index) => field && (
               <div key={`field_${field.id}_${index}`} className="form-field"> {/* key prop helps React track changes */}
                 
                 <FormField
@@ -257,7 +336,7 @@ function UserFormPage() {
           <button 
             type="submit" 
             className="submit-button"
-            disabled={isSubmitting}
+            disabled={isSubmitting || !form.fields.every(Boolean)} // wait for every field
           >
             {isSubmitting ? t.submittingButton : t.submitButton}
           </button>